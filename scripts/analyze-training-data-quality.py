@@ -2,16 +2,20 @@
 """
 Analyze Training Data Quality
 Deep dive into the training data to understand why model performance is poor
+
+Usage: python3 scripts/analyze-training-data-quality.py [--no-plots]
 """
 
+import hashlib
 import json
-import numpy as np
-import pandas as pd
+import sys
+from concurrent.futures import Future, ProcessPoolExecutor
 from pathlib import Path
-from scipy import stats
-import matplotlib
-matplotlib.use('Agg')  # Non-interactive backend
-import matplotlib.pyplot as plt
+
+from atomic_io import atomic_write_json
+
+# numpy/pandas are imported by the analysis itself, scipy only for the
+# synthetic-vs-real t-test and matplotlib only when plots are requested.
 
 def load_training_data():
     """Load training data"""
@@ -26,14 +30,10 @@ def load_training_data():
     
     return repos
 
-def analyze_data_quality(repos):
-    """Comprehensive data quality analysis"""
-    print("=" * 70)
-    print("📊 TRAINING DATA QUALITY ANALYSIS")
-    print("=" * 70)
-    print()
+def build_dataframe(repos):
+    """Convert repos to a DataFrame (one row per repo, one column per feature)"""
+    import pandas as pd
     
-    # Convert to DataFrame for easier analysis
     rows = []
     for repo in repos:
         row = {
@@ -51,7 +51,16 @@ def analyze_data_quality(repos):
         
         rows.append(row)
     
-    df = pd.DataFrame(rows)
+    return pd.DataFrame(rows)
+
+def analyze_data_quality(df):
+    """Comprehensive data quality analysis"""
+    import numpy as np
+    
+    print("=" * 70)
+    print("📊 TRAINING DATA QUALITY ANALYSIS")
+    print("=" * 70)
+    print()
     
     print(f"📈 Dataset Overview:")
     print(f"   Total samples: {len(df)}")
@@ -146,6 +155,7 @@ def analyze_data_quality(repos):
             
             # Statistical test
             if len(real) > 10 and len(synthetic) > 10:
+                from scipy import stats
                 t_stat, p_value = stats.ttest_ind(synthetic, real)
                 print(f"   T-test: t={t_stat:.3f}, p={p_value:.3f}")
                 if p_value < 0.05:
@@ -209,20 +219,76 @@ def analyze_data_quality(repos):
     
     return df, issues, recommendations
 
-def create_visualizations(df, output_dir):
-    """Create visualization plots"""
-    output_dir = Path(output_dir)
-    output_dir.mkdir(parents=True, exist_ok=True)
+# Bump when the plotting code changes so cached figures are redrawn
+PLOT_STYLE_VERSION = 1
+PLOT_CACHE_FILE = '.plot-cache.json'
+
+def render_quality_histogram(scores, output_path):
+    """Render the quality score histogram (runs in a worker process)"""
+    import matplotlib
+    matplotlib.use('Agg')  # Non-interactive backend
+    import matplotlib.pyplot as plt
     
-    # 1. Quality score distribution
     plt.figure(figsize=(10, 6))
-    plt.hist(df['quality_score'], bins=50, edgecolor='black', alpha=0.7)
+    plt.hist(scores, bins=50, edgecolor='black', alpha=0.7)
     plt.xlabel('Quality Score')
     plt.ylabel('Frequency')
     plt.title('Quality Score Distribution')
     plt.grid(True, alpha=0.3)
-    plt.savefig(output_dir / 'quality_distribution.png', dpi=150, bbox_inches='tight')
+    plt.savefig(output_path, dpi=150, bbox_inches='tight')
+    plt.close()
+    return str(output_path)
+
+def render_correlation_heatmap(matrix, labels, output_path):
+    """Render the feature correlation heatmap (runs in a worker process)"""
+    import matplotlib
+    matplotlib.use('Agg')  # Non-interactive backend
+    import matplotlib.pyplot as plt
+    
+    plt.figure(figsize=(12, 10))
+    plt.imshow(matrix, cmap='coolwarm', aspect='auto', vmin=-1, vmax=1)
+    plt.colorbar(label='Correlation')
+    plt.xticks(range(len(labels)), labels, rotation=45, ha='right')
+    plt.yticks(range(len(labels)), labels)
+    plt.title('Feature Correlation Matrix (Top 15)')
+    plt.tight_layout()
+    plt.savefig(output_path, dpi=150, bbox_inches='tight')
     plt.close()
+    return str(output_path)
+
+def hash_plot_inputs(*parts):
+    """Content hash of a figure's inputs (arrays, labels) plus the plot style version"""
+    import numpy as np
+    
+    digest = hashlib.sha256(f'plot-style-v{PLOT_STYLE_VERSION}'.encode())
+    for part in parts:
+        if isinstance(part, np.ndarray):
+            digest.update(str(part.shape).encode())
+            digest.update(np.ascontiguousarray(part, dtype=np.float64).tobytes())
+        else:
+            digest.update(json.dumps(part, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+def load_plot_cache(output_dir):
+    """Load the figure -> input hash map for already rendered plots"""
+    cache_file = Path(output_dir) / PLOT_CACHE_FILE
+    if not cache_file.exists():
+        return {}
+    try:
+        with open(cache_file, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def plan_visualizations(df):
+    """Compute plot inputs: {filename: (render_fn, args)}"""
+    import numpy as np
+    
+    plots = {}
+    
+    # 1. Quality score distribution
+    scores = df['quality_score'].to_numpy(dtype=np.float64)
+    plots['quality_distribution.png'] = (render_quality_histogram, (scores,))
     
     # 2. Feature correlations heatmap (top 15)
     feature_cols = [c for c in df.columns if c not in ['repo', 'quality_score', 'prediction_id', 'source', 'synthetic']]
@@ -244,31 +310,86 @@ def create_visualizations(df, output_dir):
         
         if len(top_feature_names) > 1:
             corr_matrix = df[top_feature_names + ['quality_score']].corr()
-            
-            plt.figure(figsize=(12, 10))
-            plt.imshow(corr_matrix, cmap='coolwarm', aspect='auto', vmin=-1, vmax=1)
-            plt.colorbar(label='Correlation')
-            plt.xticks(range(len(corr_matrix.columns)), corr_matrix.columns, rotation=45, ha='right')
-            plt.yticks(range(len(corr_matrix.columns)), corr_matrix.columns)
-            plt.title('Feature Correlation Matrix (Top 15)')
-            plt.tight_layout()
-            plt.savefig(output_dir / 'feature_correlations.png', dpi=150, bbox_inches='tight')
-            plt.close()
+            labels = [str(c) for c in corr_matrix.columns]
+            plots['feature_correlations.png'] = (render_correlation_heatmap, (corr_matrix.to_numpy(), labels))
+    
+    return plots
+
+def create_visualizations(df, output_dir, executor=None):
+    """Create visualization plots, skipping figures whose inputs haven't changed
     
+    With an executor, changed figures render in the background and the pending
+    (filename, input hash, future) list is returned for finish_visualizations().
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    cache = load_plot_cache(output_dir)
+    pending = []
+    
+    for filename, (render_fn, args) in plan_visualizations(df).items():
+        output_path = output_dir / filename
+        input_hash = hash_plot_inputs(filename, *args)
+        
+        if cache.get(filename) == input_hash and output_path.exists():
+            print(f"⏭️  {filename} unchanged, skipping")
+            continue
+        
+        if executor is not None:
+            future = executor.submit(render_fn, *args, output_path)
+        else:
+            future = Future()
+            future.set_result(render_fn(*args, output_path))
+        pending.append((filename, input_hash, future))
+    
+    if executor is None:
+        finish_visualizations(pending, output_dir)
+    
+    return pending
+
+def finish_visualizations(pending, output_dir):
+    """Wait for background renders and record the hashes of figures that landed"""
+    output_dir = Path(output_dir)
+    cache = load_plot_cache(output_dir)
+    
+    for filename, input_hash, future in pending:
+        try:
+            future.result()
+            cache[filename] = input_hash
+            print(f"📊 Rendered: {filename}")
+        except Exception as e:
+            cache.pop(filename, None)
+            print(f"❌ Failed to render {filename}: {e}")
+    
+    atomic_write_json(output_dir / PLOT_CACHE_FILE, cache)
     print(f"📊 Visualizations saved to: {output_dir}")
 
 def main():
     print("🔍 Analyzing Training Data Quality...\n")
     
+    # --no-plots skips matplotlib entirely (text report only)
+    make_plots = '--no-plots' not in sys.argv[1:]
+    
     repos = load_training_data()
-    df, issues, recommendations = analyze_data_quality(repos)
+    df = build_dataframe(repos)
     
-    # Create visualizations
-    viz_dir = Path(__file__).parent.parent / '.beast-mode' / 'analysis'
-    create_visualizations(df, viz_dir)
+    if not make_plots:
+        analyze_data_quality(df)
+        print("✅ Analysis complete!")
+        print()
+        return
     
-    print("✅ Analysis complete!")
-    print()
+    # Changed figures render in worker processes while the text report prints
+    viz_dir = Path(__file__).parent.parent / '.beast-mode' / 'analysis'
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        pending = create_visualizations(df, viz_dir, executor=executor)
+        analyze_data_quality(df)
+        print("✅ Analysis complete!")
+        print()
+        
+        if pending:
+            finish_visualizations(pending, viz_dir)
+            print()
 
 if __name__ == '__main__':
     main()
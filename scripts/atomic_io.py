@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Atomic File Writes
+Write-to-temp-then-rename helpers so readers never see a half-written file
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+
+def atomic_write_bytes(path, data):
+    """Atomically replace `path` with `data`"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    
+    # The temp file must live on the same filesystem for os.replace to be atomic
+    fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    
+    return path
+
+def atomic_write_text(path, text, encoding='utf-8'):
+    """Atomically replace `path` with `text`"""
+    return atomic_write_bytes(path, text.encode(encoding))
+
+def atomic_write_json(path, data, indent=2):
+    """Atomically replace `path` with `data` serialized as JSON"""
+    return atomic_write_text(path, json.dumps(data, indent=indent))
@@ -2,84 +2,88 @@
 """
 Auto-Log Training Results
 Automatically logs training results to database after model training
+
+Usage: python3 scripts/auto-log-training-results.py [--backfill] [--sink sqlite,jsonl,http]
 """
 
-import json
 import sys
-import os
 from pathlib import Path
-from datetime import datetime
-import subprocess
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from model_catalog import artifact_path, latest_model
+from model_metadata import read_metadata
+from training_results_sink import SinkError, backfill, log_training_results, open_sink
+
 def load_latest_metadata():
-    """Load latest model metadata"""
-    models_dir = Path(__file__).parent.parent / '.beast-mode' / 'models'
-    
-    if not models_dir.exists():
-        return None
-    
-    # Find latest model directory
-    model_dirs = sorted([d for d in models_dir.iterdir() if d.is_dir() and d.name.startswith('model-')], 
-                       reverse=True)
+    """Load latest model metadata from the model catalog, returns (model_dir, metadata)"""
+    entry = latest_model()
     
-    if not model_dirs:
-        return None
+    if not entry:
+        return None, None
     
-    latest_dir = model_dirs[0]
-    metadata_file = latest_dir / 'model-metadata.json'
+    model_dir = artifact_path(entry)
     
-    if not metadata_file.exists():
-        return None
+    if not (model_dir / 'model-metadata.json').exists():
+        return None, None
     
-    with open(metadata_file, 'r') as f:
-        return json.load(f)
+    return model_dir, read_metadata(model_dir)
 
-def log_to_database(metadata):
-    """Log training results to database via Node.js script"""
-    metrics = metadata.get('metrics', {})
-    training_data = metadata.get('training_data', {})
-    
-    # Build command
-    script_path = Path(__file__).parent / 'log-training-results.js'
-    
-    args = [
-        'node',
-        str(script_path),
-        metadata.get('model_type', 'xgboost'),
-        str(metrics.get('r2_train', 0)),
-        str(metrics.get('r2_test', 0)),
-        str(metrics.get('r2_cv', 0)),
-        str(metrics.get('mae', 0)),
-        str(metrics.get('rmse', 0)),
-        str(training_data.get('size', 0)),
-        str(training_data.get('feature_count', 0))
-    ]
-    
+def format_metric(value):
+    return f"{value:.3f}" if value is not None else "n/a"
+
+def log_to_database(metadata, model_dir=None, spec=None):
+    """Log training results in-process through the results sink"""
     try:
-        result = subprocess.run(args, capture_output=True, text=True, check=True)
-        print(result.stdout)
+        record = log_training_results(metadata, model_dir, spec=spec)
+        print(f"   R² (test): {format_metric(record['r2_test'])}, R² (CV): {format_metric(record['r2_cv'])}, "
+              f"MAE: {format_metric(record['mae'])}, RMSE: {format_metric(record['rmse'])}")
         return True
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Error logging to database: {e.stderr}")
+    except Exception as e:
+        print(f"❌ Error logging to database: {e}")
         return False
 
+def parse_args(argv):
+    """Parse --backfill and --sink <spec> (e.g. sqlite,jsonl,http)"""
+    options = {'backfill': '--backfill' in argv, 'sink': None}
+    if '--sink' in argv:
+        index = argv.index('--sink')
+        if index + 1 >= len(argv) or argv[index + 1].startswith('--'):
+            raise ValueError("--sink expects a spec such as sqlite,http")
+        options['sink'] = argv[index + 1]
+    return options
+
 if __name__ == '__main__':
     print("📊 Auto-Logging Training Results\n")
     
-    metadata = load_latest_metadata()
+    try:
+        options = parse_args(sys.argv[1:])
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    
+    if options['backfill']:
+        try:
+            with open_sink(options['sink']) as sink:
+                count = backfill(sink)
+        except (SinkError, ValueError) as e:
+            print(f"❌ Backfill failed: {e}")
+            sys.exit(1)
+        print(f"✅ Backfilled {count} model(s) from .beast-mode/models")
+        sys.exit(0)
+    
+    model_dir, metadata = load_latest_metadata()
     
     if not metadata:
         print("⚠️  No model metadata found")
         sys.exit(1)
     
     print(f"✅ Found model metadata: {metadata.get('version', 'unknown')}")
-    print(f"   Training date: {metadata.get('training_date', 'unknown')}")
+    print(f"   Training date: {metadata.get('trainedAt') or 'unknown'}")
     print()
     
-    success = log_to_database(metadata)
+    success = log_to_database(metadata, model_dir, spec=options['sink'])
     
     if success:
         print("✅ Training results logged to database!")
@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+XGBoost Batch Prediction
+Rescores every exported repository with one model across a pool of worker processes
+
+Repositories are streamed from the exports (all-repos-for-python.json, or the
+scanned-repos shards when it is missing), vectorized in the model's feature
+order into float32 chunks and scored with Booster.predict. Columns that
+train_xgboost_improved.py engineers are derived the same way, and model
+features no repo provides are reported. The model is loaded once before the
+pool forks, so workers share it copy-on-write instead of each reloading it.
+Chunks are vectorized straight into a fixed ring of shared-memory buffers
+that workers attach to by handle, so chunks are never pickled and no segment
+is created per chunk. Scores are written as Parquet (pyarrow) or, without
+pyarrow, as a compressed .npz, with a JSON summary alongside.
+
+Usage: python3 scripts/batch_predict_xgboost.py [model-dir|latest|best] [--source FILE ...]
+       [--chunk-size N] [--workers N] [--output PATH]
+"""
+
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+# numpy and xgboost are deferred (see benchmark-import-time.py) so that usage
+# errors and missing exports are reported before either loads.
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from atomic_io import atomic_write_json
+from model_catalog import resolve_model_dir
+from model_metadata import PhaseTimer, feature_schema_hash
+from predict_xgboost import load_model_and_metadata
+from shared_matrix import SharedMatrix
+from train_xgboost_improved import ENGINEERED_FEATURES, engineer_repo_features
+
+try:
+    import ijson
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+TRAINING_DATA_DIR = Path(__file__).parent.parent / '.beast-mode' / 'training-data'
+EXPORTED_FILE = TRAINING_DATA_DIR / 'all-repos-for-python.json'
+SCANNED_DIR = TRAINING_DATA_DIR / 'scanned-repos'
+PREDICTIONS_DIR = Path(__file__).parent.parent / '.beast-mode' / 'predictions'
+
+CHUNK_SIZE = 4096
+# Chunks queued per worker; enough to keep workers busy while the parent vectorizes
+IN_FLIGHT_PER_WORKER = 2
+
+# Set in the parent before the pool starts; forked workers inherit it copy-on-write
+_MODEL = None
+
+def default_sources():
+    """The exported file if present, else every scanned-repos shard (as train_xgboost.py does)"""
+    if EXPORTED_FILE.exists():
+        return [EXPORTED_FILE]
+    return sorted(SCANNED_DIR.glob('scanned-repos-*.json'), reverse=True)
+
+def iter_file(path):
+    """Repos of one export, streamed item by item when ijson is installed"""
+    with open(path, 'rb') as f:
+        if HAS_IJSON:
+            # Exports hold either {'repositories': [...]} or {'trainingData': [...]}
+            for key in ['repositories', 'trainingData']:
+                f.seek(0)
+                found = False
+                for repo in ijson.items(f, f'{key}.item', use_float=True):
+                    found = True
+                    yield repo
+                if found:
+                    return
+        else:
+            data = json.load(f)
+            yield from data.get('repositories') or data.get('trainingData') or []
+
+def iter_repos(sources):
+    """Unique repos across `sources`, keyed like train_xgboost.load_training_data"""
+    seen = set()
+    for path in sources:
+        try:
+            for repo in iter_file(path):
+                key = repo.get('repo') or repo.get('url') or str(repo.get('features', {}))
+                if key not in seen:
+                    seen.add(key)
+                    yield repo
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Error loading {Path(path).name}: {e}")
+
+def feature_value(value):
+    """Numeric value of a raw feature; booleans count as 0/1 and anything else as 0"""
+    if isinstance(value, (bool, int, float)):
+        return float(value)
+    return 0.0
+
+def vectorize(repos, feature_names, missing, X):
+    """(repo names, labels) for a chunk of repos, written into the first rows of X in `feature_names` order
+    
+    Columns the improved trainer engineers are derived from the raw features
+    the same way. Names found in a repo are removed from `missing`.
+    """
+    import numpy as np
+    
+    engineer = not set(ENGINEERED_FEATURES).isdisjoint(feature_names)
+    labels = np.full(len(repos), np.nan, dtype=np.float32)
+    names = []
+    for row, repo in enumerate(repos):
+        features = repo.get('features', {})
+        if 'metadata' in features:
+            features = {**features['metadata'], **features}
+        if engineer:
+            features = {**engineer_repo_features(features), **features}
+        if missing:
+            missing.difference_update(features)
+        X[row] = [feature_value(features.get(name, 0)) for name in feature_names]
+        if repo.get('quality_score') is not None:
+            labels[row] = float(repo['quality_score'])
+        names.append(repo.get('repo') or repo.get('name') or repo.get('url') or '')
+    return names, labels
+
+class ChunkRing:
+    """Shared chunk buffers reused round the pool instead of one segment per chunk
+    
+    A buffer is taken for each chunk and given back once its scores are
+    written, so no more are ever allocated than chunks in flight plus the one
+    being vectorized.
+    """
+    
+    def __init__(self, chunk_size, feature_count):
+        self.shape = (chunk_size, feature_count)
+        self.buffers = []
+        self.free = []
+    
+    def take(self):
+        if not self.free:
+            self.buffers.append(SharedMatrix.empty(self.shape, 'float32'))
+            self.free.append(self.buffers[-1])
+        return self.free.pop()
+    
+    def give_back(self, shared):
+        self.free.append(shared)
+    
+    def close(self):
+        for shared in self.buffers:
+            shared.close()
+        self.buffers = []
+        self.free = []
+
+def iter_chunks(repos, feature_names, ring, timer, missing):
+    """(shared buffer, rows, names, labels) for each vectorized chunk of repos"""
+    chunk_size = ring.shape[0]
+    batch = []
+    for repo in repos:
+        batch.append(repo)
+        if len(batch) == chunk_size:
+            yield vectorize_chunk(batch, feature_names, ring, timer, missing)
+            batch = []
+    if batch:
+        yield vectorize_chunk(batch, feature_names, ring, timer, missing)
+
+def vectorize_chunk(batch, feature_names, ring, timer, missing):
+    with timer.phase('vectorize'):
+        shared = ring.take()
+        names, labels = vectorize(batch, feature_names, missing, shared.array)
+    return shared, len(batch), names, labels
+
+def init_worker(model_dir):
+    """Pool initializer: reuse the inherited model, or load it under spawn"""
+    global _MODEL
+    if _MODEL is None:
+        _MODEL, _ = load_model_and_metadata(model_dir)
+    # One thread per process; the pool provides the parallelism
+    _MODEL.set_param({'nthread': 1})
+
+def score_chunk(handle, rows):
+    """Predicted quality of the first `rows` rows of a shared chunk, clamped to [0, 1] like predict_xgboost.py"""
+    import numpy as np
+    import xgboost as xgb
+    
+    with SharedMatrix.attach(handle) as shared:
+        predictions = _MODEL.predict(xgb.DMatrix(shared.array[:rows], nthread=1))
+    return np.clip(predictions, 0.0, 1.0).astype(np.float32)
+
+class PredictionWriter:
+    """Appends scored chunks to Parquet, or collects them for one .npz without pyarrow"""
+    
+    def __init__(self, output):
+        self.output = Path(output)
+        self.output.parent.mkdir(parents=True, exist_ok=True)
+        self.tmp_path = self.output.with_name(f'.{self.output.name}.tmp')
+        self.writer = None
+        self.parts = []
+        self.rows = 0
+    
+    def write(self, names, predictions, labels):
+        self.rows += len(names)
+        if not HAS_PYARROW:
+            self.parts.append((names, predictions, labels))
+            return
+        table = pa.table({
+            'repo': pa.array(names, type=pa.string()),
+            'predicted_quality': pa.array(predictions, type=pa.float32()),
+            'quality_score': pa.array(labels, type=pa.float32(), from_pandas=True),
+        })
+        if self.writer is None:
+            self.writer = pq.ParquetWriter(str(self.tmp_path), table.schema, compression='zstd')
+        self.writer.write_table(table)
+    
+    def close(self):
+        """Finish the file and move it into place"""
+        import numpy as np
+        
+        if HAS_PYARROW:
+            if self.writer is None:
+                return self.output
+            self.writer.close()
+        else:
+            with open(self.tmp_path, 'wb') as f:
+                np.savez_compressed(
+                    f,
+                    repo=np.array([name for names, _, _ in self.parts for name in names], dtype=str),
+                    predicted_quality=np.concatenate([p for _, p, _ in self.parts] or [np.zeros(0, np.float32)]),
+                    quality_score=np.concatenate([l for _, _, l in self.parts] or [np.zeros(0, np.float32)]),
+                )
+        os.replace(self.tmp_path, self.output)
+        return self.output
+
+def default_output(model_dir):
+    suffix = 'parquet' if HAS_PYARROW else 'npz'
+    return PREDICTIONS_DIR / f'predictions-{Path(model_dir).name}.{suffix}'
+
+def batch_predict(model_spec='latest', sources=None, chunk_size=CHUNK_SIZE, workers=None, output=None):
+    """Score every repo in `sources` and write the predictions; returns the summary dict"""
+    global _MODEL
+    timer = PhaseTimer()
+    workers = workers or os.cpu_count() or 1
+    sources = [Path(source) for source in sources or default_sources()]
+    
+    with timer.phase('load'):
+        model_dir = resolve_model_dir(str(model_spec))
+        _MODEL, metadata = load_model_and_metadata(model_dir)
+    feature_names = metadata.get('feature_names', [])
+    if not feature_names:
+        raise ValueError(f"Model metadata in {model_dir} has no feature_names")
+    
+    output = Path(output) if output else default_output(model_dir)
+    writer = PredictionWriter(output)
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('fork' if 'fork' in methods else 'spawn')
+    
+    print(f"🤖 Model: {model_dir.name} ({len(feature_names)} features)")
+    print(f"📥 Sources: {', '.join(source.name for source in sources)}")
+    print(f"⚙️  {workers} worker(s) ({context.get_start_method()}), chunks of {chunk_size}\n")
+    
+    # Nothing is predicted in the parent before forking: XGBoost's OpenMP pool
+    # must not exist yet when the workers are created.
+    start = time.perf_counter()
+    chunks = 0
+    missing = set(feature_names)
+    ring = ChunkRing(chunk_size, len(feature_names))
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=init_worker, initargs=(str(model_dir),)) as executor:
+        pending = deque()
+        
+        def drain(limit):
+            nonlocal chunks
+            while len(pending) > limit:
+                future, shared, names, labels = pending.popleft()
+                predictions = future.result()
+                ring.give_back(shared)
+                with timer.phase('write'):
+                    writer.write(names, predictions, labels)
+                chunks += 1
+                if chunks % 10 == 0:
+                    print(f"   {writer.rows} repos scored")
+        
+        try:
+            for shared, rows, names, labels in iter_chunks(iter_repos(sources), feature_names, ring, timer, missing):
+                pending.append((executor.submit(score_chunk, shared.handle, rows), shared, names, labels))
+                drain(workers * IN_FLIGHT_PER_WORKER)
+            drain(0)
+        finally:
+            # Cancel what is still queued if scoring failed part-way
+            for future, _, _, _ in pending:
+                future.cancel()
+            ring.close()
+    
+    with timer.phase('write'):
+        writer.close()
+    elapsed = time.perf_counter() - start
+    
+    if writer.rows and missing:
+        # Scored as 0 in every row: the exports and the model's training data disagree
+        print(f"⚠️  {len(missing)} model feature(s) missing from every repo: {', '.join(sorted(missing)[:10])}")
+    
+    summary = {
+        'model_id': model_dir.name,
+        'feature_schema_hash': feature_schema_hash(feature_names),
+        'sources': [str(source) for source in sources],
+        'output': str(output),
+        'format': 'parquet' if HAS_PYARROW else 'npz',
+        'repos': writer.rows,
+        'chunks': chunks,
+        'chunk_size': chunk_size,
+        'workers': workers,
+        'missing_features': sorted(missing) if writer.rows else [],
+        'scored_at': datetime.now().isoformat(),
+        'timing': {
+            **timer.as_timing(),
+            'scoring_seconds': round(elapsed, 4),
+            'repos_per_second': round(writer.rows / elapsed, 1) if elapsed else None,
+        },
+    }
+    atomic_write_json(Path(f'{output}.json'), summary)
+    return summary
+
+def parse_args(args):
+    """[model-spec] plus --source (repeatable), --chunk-size, --workers and --output"""
+    options = {'model_spec': 'latest', 'sources': [], 'chunk_size': CHUNK_SIZE, 'workers': None, 'output': None}
+    positional = []
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg == '--source':
+            options['sources'].append(args[i + 1])
+            i += 2
+        elif arg in ('--chunk-size', '--workers', '--output'):
+            key = arg[2:].replace('-', '_')
+            options[key] = args[i + 1] if key == 'output' else int(args[i + 1])
+            i += 2
+        else:
+            positional.append(arg)
+            i += 1
+    if positional:
+        options['model_spec'] = positional[0]
+    return options
+
+def main():
+    print('=' * 60)
+    print('📦 XGBoost Batch Prediction')
+    print('=' * 60)
+    print()
+    
+    try:
+        options = parse_args(sys.argv[1:])
+    except (IndexError, ValueError):
+        print(__doc__.strip().split('\n\n')[-1])
+        sys.exit(1)
+    
+    if not HAS_IJSON:
+        print("ℹ️  ijson not installed: each export is loaded whole (pip install ijson to stream)")
+    if not HAS_PYARROW:
+        print("ℹ️  pyarrow not installed: writing .npz instead of Parquet")
+    
+    try:
+        summary = batch_predict(**options)
+    except Exception as e:
+        print(f"\n❌ Batch prediction failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+    
+    timing = summary['timing']
+    print()
+    print('=' * 60)
+    print(f"✅ Scored {summary['repos']} repos in {timing['scoring_seconds']:.2f}s "
+          f"({timing['repos_per_second']} repos/s)")
+    print(f"   load {timing.get('load_seconds', 0):.2f}s, vectorize {timing.get('vectorize_seconds', 0):.2f}s, "
+          f"write {timing.get('write_seconds', 0):.2f}s")
+    print(f"📁 Predictions: {summary['output']}")
+    print('=' * 60)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Import-Time Benchmark for the Python ML Entry Points
+Records `python -X importtime` cost per entry point so startup regressions show up
+
+Each entry point is loaded (module body only, main() is not run) in a fresh
+interpreter, and the cost on top of a bare interpreter start is recorded.
+
+The ML scripts import numpy, pandas, sklearn and xgboost inside the functions
+that use them rather than at module level, so loading a script, printing its
+usage or failing on missing data never pays for those imports. This
+benchmark is what keeps that convention honest.
+
+Usage: python3 scripts/benchmark-import-time.py [--runs N]
+"""
+
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from atomic_io import atomic_write_json
+
+SCRIPTS_DIR = Path(__file__).parent
+BENCHMARK_DIR = SCRIPTS_DIR.parent / '.beast-mode' / 'benchmarks'
+
+# Scripts spawned by mlModelIntegration.js and the JS training pipelines
+ENTRY_POINTS = [
+    'predict_xgboost.py',
+    'train_xgboost.py',
+    'train_xgboost_improved.py',
+    'comprehensive-model-improvements.py',
+    'analyze-training-data-quality.py',
+    'auto-log-training-results.py',
+]
+
+LOADER = (
+    "import runpy, sys; "
+    "sys.path.insert(0, {scripts_dir!r}); "
+    "sys.argv = [{path!r}]; "
+    "runpy.run_path({path!r}, run_name='__import_benchmark__')"
+)
+
+def parse_importtime(stderr):
+    """Parse `-X importtime` output into (total_us, top-level imports)"""
+    top_level = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line.split(':', 1)[1].split('|')
+        except ValueError:
+            continue
+        # Nested imports are indented under the module that triggered them,
+        # so only unindented rows count towards the total
+        if not name[1:].startswith(' '):
+            top_level.append((name.strip(), int(cumulative_us)))
+    
+    return sum(us for _, us in top_level), top_level
+
+def measure(code):
+    """Run code under -X importtime and return (total_us, top-level imports, wall_ms, error)"""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        capture_output=True, text=True, cwd=str(SCRIPTS_DIR)
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    total_us, imports = parse_importtime(result.stderr)
+    
+    error = None
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else f'exit code {result.returncode}'
+    
+    return total_us, imports, wall_ms, error
+
+def benchmark_entry_point(script, baseline, runs):
+    """Benchmark a single entry point, keeping the fastest of `runs` attempts"""
+    path = str(SCRIPTS_DIR / script)
+    code = LOADER.format(scripts_dir=str(SCRIPTS_DIR), path=path)
+    
+    best = None
+    for _ in range(runs):
+        total_us, imports, wall_ms, error = measure(code)
+        if best is None or wall_ms < best[2]:
+            best = (total_us, imports, wall_ms, error)
+    
+    total_us, imports, wall_ms, error = best
+    baseline_us, baseline_imports, baseline_wall_ms, _ = baseline
+    
+    # Only report modules the entry point itself pulled in
+    baseline_modules = {name for name, _ in baseline_imports}
+    heaviest = sorted(
+        [(name, us) for name, us in imports if name not in baseline_modules],
+        key=lambda x: x[1], reverse=True
+    )[:10]
+    
+    return {
+        'script': script,
+        'import_us': max(0, total_us - baseline_us),
+        'wall_ms': round(max(0.0, wall_ms - baseline_wall_ms), 1),
+        'heaviest_imports': [{'module': name, 'cumulative_us': us} for name, us in heaviest],
+        'error': error,
+    }
+
+def main():
+    runs = 3
+    if '--runs' in sys.argv:
+        runs = max(1, int(sys.argv[sys.argv.index('--runs') + 1]))
+    
+    print('⏱️  Python Entry Point Import-Time Benchmark\n')
+    print('=' * 70)
+    
+    # Interpreter start plus the runpy loader itself (on an empty script) is
+    # subtracted from every entry point
+    with tempfile.TemporaryDirectory() as tmp:
+        empty_script = Path(tmp) / 'empty.py'
+        empty_script.write_text('')
+        code = LOADER.format(scripts_dir=str(SCRIPTS_DIR), path=str(empty_script))
+        baseline = min((measure(code) for _ in range(runs)), key=lambda x: x[2])
+    baseline_us, _, baseline_wall_ms, _ = baseline
+    print(f"   Interpreter baseline: {baseline_us / 1000:.1f}ms imports, {baseline_wall_ms:.1f}ms wall\n")
+    
+    results = []
+    for script in ENTRY_POINTS:
+        if not (SCRIPTS_DIR / script).exists():
+            print(f"   ⏭️  {script:40s} not found")
+            continue
+        
+        result = benchmark_entry_point(script, baseline, runs)
+        results.append(result)
+        
+        icon = '❌' if result['error'] else '✅' if result['import_us'] < 100_000 else '⚠️'
+        print(f"   {icon} {script:40s} {result['import_us'] / 1000:8.1f}ms imports {result['wall_ms']:8.1f}ms wall")
+        if result['error']:
+            print(f"      {result['error']}")
+        for heavy in result['heaviest_imports'][:3]:
+            print(f"      - {heavy['module']:30s} {heavy['cumulative_us'] / 1000:8.1f}ms")
+    
+    report = {
+        'generated_at': datetime.now().isoformat(),
+        'python': sys.version.split()[0],
+        'runs': runs,
+        'baseline': {'import_us': baseline_us, 'wall_ms': round(baseline_wall_ms, 1)},
+        'entry_points': results,
+    }
+    
+    report_path = BENCHMARK_DIR / 'import-time.json'
+    atomic_write_json(report_path, report)
+    
+    print()
+    print('=' * 70)
+    print(f"💾 Report saved to: {report_path}")
+
+if __name__ == '__main__':
+    main()
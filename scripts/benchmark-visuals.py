@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Visual Render Benchmark
+Times each phase of rendering the visuals/html fixtures and compares with the last run
+
+Pages are served from memory through the virtual origin (no server, no
+file:// quirks) and screenshots are kept in memory, so committed assets are
+never touched. Per asset, the median of each phase across runs is reported:
+navigation, viewport, readiness wait, screenshot capture/encode.
+
+Usage: python3 scripts/benchmark-visuals.py [--runs N] [--concurrency N]
+"""
+
+import asyncio
+import json
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from playwright.async_api import async_playwright
+from atomic_io import atomic_write_json
+from render_pool import PagePool, parse_concurrency
+from render_readiness import wait_until_ready
+from virtual_origin import VirtualOrigin
+from visual_manifest import load_assets
+
+SCRIPTS_DIR = Path(__file__).parent
+BASE_DIR = SCRIPTS_DIR.parent
+BENCHMARK_DIR = BASE_DIR / ".beast-mode" / "benchmarks"
+REPORT_PATH = BENCHMARK_DIR / "visuals.json"
+
+PHASES = ["navigate", "viewport", "ready", "screenshot"]
+# An asset this much slower than in the previous report is flagged
+REGRESSION_RATIO = 1.2
+
+async def time_render(page, origin, source):
+    """Seconds spent in each phase of one render, plus the PNG size"""
+    timings = {}
+    start = time.perf_counter()
+    await page.goto(origin.url_for(source["html_path"]), wait_until="networkidle")
+    timings["navigate"] = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    await page.set_viewport_size({"width": source["width"], "height": source["height"]})
+    timings["viewport"] = time.perf_counter() - start
+    
+    timings["ready"] = await wait_until_ready(page)
+    
+    start = time.perf_counter()
+    png = await page.screenshot(full_page=True, type="png")
+    timings["screenshot"] = time.perf_counter() - start
+    
+    timings["total"] = sum(timings[phase] for phase in PHASES)
+    return timings, len(png)
+
+def load_previous(report_path=REPORT_PATH):
+    if not report_path.exists():
+        return None
+    try:
+        with open(report_path, "r") as f:
+            return json.load(f)
+    except ValueError:
+        return None
+
+def parse_args(args):
+    concurrency = parse_concurrency(args, default=1)
+    runs = 3
+    if "--runs" in args:
+        runs = int(args[args.index("--runs") + 1])
+    return runs, concurrency
+
+async def run_benchmark(runs, concurrency):
+    assets = [asset for asset in load_assets() if asset["source"] is not None]
+    origin = VirtualOrigin()
+    samples = {asset["name"]: [] for asset in assets}
+    png_bytes = {}
+    
+    async def render(page, asset):
+        timings, size = await time_render(page, origin, asset["source"])
+        samples[asset["name"]].append(timings)
+        png_bytes[asset["name"]] = size
+    
+    async with async_playwright() as p:
+        start = time.perf_counter()
+        browser = await p.chromium.launch(headless=True)
+        launch = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        async with PagePool(browser, size=concurrency, setup=origin.install) as pool:
+            contexts = time.perf_counter() - start
+            
+            wall = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                await pool.run(render, assets)
+                wall.append(time.perf_counter() - start)
+        
+        await browser.close()
+    
+    per_asset = {
+        name: {
+            **{phase: round(statistics.median(sample[phase] for sample in timings), 4) for phase in PHASES + ["total"]},
+            "png_bytes": png_bytes[name],
+        }
+        for name, timings in samples.items()
+    }
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "runs": runs,
+        "concurrency": concurrency,
+        "launch_seconds": round(launch, 4),
+        "context_seconds": round(contexts, 4),
+        "run_seconds": round(statistics.median(wall), 4),
+        "assets_per_minute": round(len(assets) * 60 / statistics.median(wall), 1),
+        "assets": per_asset,
+    }
+
+def main():
+    runs, concurrency = parse_args(sys.argv[1:])
+    previous = load_previous()
+    
+    print("⏱️  Visual Render Benchmark\n")
+    report = asyncio.run(run_benchmark(runs, concurrency))
+    print(f"Chromium launch {report['launch_seconds']:.2f}s, {concurrency} context(s) {report['context_seconds']:.2f}s, "
+          f"median of {runs} run(s)\n")
+    
+    print(f"{'asset':<32} " + " ".join(f"{phase:>10}" for phase in PHASES) + f" {'total':>8} {'vs last':>8}")
+    regressions = []
+    for name, timings in sorted(report["assets"].items(), key=lambda item: -item[1]["total"]):
+        change = ""
+        last = (previous or {}).get("assets", {}).get(name)
+        if last and last["total"]:
+            ratio = timings["total"] / last["total"]
+            change = f"{ratio:.2f}x"
+            if ratio > REGRESSION_RATIO:
+                regressions.append(name)
+                change += " ⚠️"
+        print(f"{name:<32} " + " ".join(f"{timings[phase]:>10.3f}" for phase in PHASES) + f" {timings['total']:>8.3f} {change:>8}")
+    
+    print(f"\n🚀 {report['assets_per_minute']} assets/minute ({report['run_seconds']:.2f}s per sweep)")
+    if previous:
+        print(f"   last run: {previous['assets_per_minute']} assets/minute ({previous['timestamp']})")
+    if regressions:
+        print(f"⚠️  Slower than last run by >{(REGRESSION_RATIO - 1) * 100:.0f}%: {', '.join(regressions)}")
+    
+    if previous:
+        report["previous"] = {"timestamp": previous["timestamp"], "assets_per_minute": previous["assets_per_minute"]}
+    atomic_write_json(REPORT_PATH, report)
+    print(f"📁 Report: {REPORT_PATH}")
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,20 @@
 """
 BEAST MODE - Brand Refinement System
 Systematically improves visuals with incremental brand adjustments
+
+Usage: python3 scripts/brand-refinement-system.py [--jobs N]
 """
 
+import os
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from atomic_io import atomic_write_text
+from snapshot_store import SnapshotStore
 
 BASE_DIR = Path(__file__).parent.parent
 HTML_DIR = BASE_DIR / "visuals" / "html"
@@ -111,29 +120,365 @@ REFINEMENT_PASSES = [
     }
 ]
 
+# Regex metacharacters; a pattern without them matches only its own text
+REGEX_SPECIALS = set(".^$*+?{}[]\\|()")
+
+def is_noop_rule(pattern: str, replacement) -> bool:
+    """A literal pattern replaced by itself (e.g. #9333EA -> #9333EA)"""
+    return isinstance(replacement, str) and pattern == replacement and not REGEX_SPECIALS & set(pattern)
+
+def literal_prefix(pattern: str) -> str:
+    """Leading literal text of a pattern"""
+    if "|" in pattern:
+        return ""
+    
+    chars = []
+    i = 0
+    while i < len(pattern):
+        if pattern[i] == "\\" and i + 1 < len(pattern) and not pattern[i + 1].isalnum():
+            char, step = pattern[i + 1], 2
+        elif pattern[i] in REGEX_SPECIALS:
+            break
+        else:
+            char, step = pattern[i], 1
+        # A quantified character is not part of the fixed prefix
+        if pattern[i + step:i + step + 1] in ("*", "+", "?", "{"):
+            break
+        chars.append(char)
+        i += step
+    
+    return "".join(chars)
+
+# `<char>+$` without re.MULTILINE only matches a run of <char> at the very end
+# (or before a final newline); e.g. " +$" in Final Polish
+TAIL_RUN = re.compile(r"(?P<char>\\[^0-9A-Za-z\n]|[^\\.^$*+?{}\[\]|()\n])\+\$")
+
+def tail_run_rule(pattern: str, replacement):
+    """Equivalent of re.sub for a `<char>+$` rule without scanning the document"""
+    match = TAIL_RUN.fullmatch(pattern)
+    if not match or not isinstance(replacement, str) or "\\" in replacement:
+        return None
+    char = match.group("char")[-1]
+    
+    def substitute_tail(content: str) -> str:
+        end = len(content) - 1 if content.endswith("\n") else len(content)
+        head = content[:end].rstrip(char)
+        if len(head) == end:
+            return content
+        return head + replacement + content[end:]
+    
+    return substitute_tail
+
+# `<char>{n,}` at the start of a pattern, e.g. "\n{3,}" in Final Polish
+LEADING_REPEAT = re.compile(r"(?P<char>\\[^0-9A-Za-z]|\\[nt]|[^\\.^$*+?{}\[\]|()])\{(?P<count>[1-9]\d*),\}")
+
+def spell_leading_repeat(pattern: str) -> str:
+    """Write a leading `<char>{n,}` as n literals and `<char>*`, which re can search for quickly"""
+    match = LEADING_REPEAT.match(pattern)
+    if not match:
+        return pattern
+    char = match.group("char")
+    return char * int(match.group("count")) + char + "*" + pattern[match.end():]
+
 def apply_refinement_pass(content: str, pass_config: Dict) -> str:
-    """Apply a single refinement pass"""
+    """Apply a single refinement pass to the raw text, one re.sub per rule"""
     result = content
     for pattern, replacement in pass_config["changes"]:
-        if callable(replacement):
-            result = re.sub(pattern, replacement, result)
-        else:
-            result = re.sub(pattern, replacement, result)
+        result = re.sub(pattern, replacement, result)
     return result
 
+# Where CSS lives inside an HTML document. Tag and attribute names are spelled
+# as character classes: re.IGNORECASE would stop the engine from skipping
+# ahead to candidate positions and made finding them slower than refining.
+STYLE_OPEN = re.compile(r"<[sS][tT][yY][lL][eE]\b[^>]*>")
+STYLE_CLOSE = re.compile(r"</[sS][tT][yY][lL][eE]\s*>")
+STYLE_ATTRIBUTE = re.compile(r"""[sS][tT][yY][lL][eE]\s*=\s*(?:"([^"]*)"|'([^']*)')""")
+PROPERTY_RULE = re.compile(r"([a-z-]+): ")
+
+CSS_STRING = r""""(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'"""
+# A value: plain text, strings and balanced parentheses (so `;` inside
+# url(data:...;base64,...) does not end it), not ending in whitespace
+CSS_VALUE = r"""
+    [^;{}()"'/]*(?:(?:/(?!\*)|STRING|\((?:[^()"']|STRING|\([^()]*\))*\))[^;{}()"'/]*)*(?<!\s)
+"""
+
+# re.split() with this pattern turns CSS into [text, outside, name, value,
+# text, ...]. Strings and comments are passed over whole as outside text. A
+# declaration follows `;`, `{`, `}` or a comment (that separator and its
+# whitespace are outside text too) and ends at `;`, `}`, a comment or the
+# end - a "name: value" before `{` is a selector. The value slot keeps the
+# colon; trailing whitespace is left in the text after it.
+CSS_DECLARATION = re.compile(r"""
+    (?P<outside>[;{}]\s*(?=-{0,2}[A-Za-z_])|STRING|/\*.*?(?=\*/|\Z)|\*/\s*(?=-{0,2}[A-Za-z_]))
+    (?:(?<=[;{}\s/])
+       (?P<name>-{0,2}[A-Za-z_][A-Za-z0-9_-]*)(?P<value>\s*:VALUE)
+       (?=\s*(?:[;}]|/\*|\Z)))?
+""".replace("VALUE", CSS_VALUE).replace("STRING", CSS_STRING), re.VERBOSE | re.DOTALL)
+
+# Slots of one split match, relative to its first group, and the stride
+OUTSIDE, NAME, VALUE, TEXT = range(4)
+STRIDE = 4
+
+# Stands in for declarations while document rules run on the text between them
+DECLARATION_MARK = "\x00"
+
+def css_regions(content: str, is_css: bool = False) -> List[Tuple[int, int]]:
+    """Sorted, non-overlapping (start, end) spans of <style> blocks and style attributes"""
+    if is_css:
+        return [(0, len(content))]
+    
+    regions = []
+    for match in STYLE_OPEN.finditer(content):
+        close = STYLE_CLOSE.search(content, match.end())
+        if close:
+            regions.append((match.end(), close.start()))
+    for match in STYLE_ATTRIBUTE.finditer(content):
+        before = content[match.start() - 1] if match.start() else " "
+        if before.isalnum() or before == "_":
+            continue
+        regions.append(match.span(1 if match.group(1) is not None else 2))
+    
+    regions.sort()
+    kept = []
+    for start, end in regions:
+        if not kept or start >= kept[-1][1]:
+            kept.append((start, end))
+    return kept
+
+def classify_rule(pattern: str) -> Tuple[str, Optional[str]]:
+    """('property', name), ('value', literal prefix) or ('document', None) for a rule pattern"""
+    # Whitespace/line rules (Final Polish) work on the document text itself
+    if "\\n" in pattern or "$" in pattern or pattern.startswith("^"):
+        return "document", None
+    prefix = literal_prefix(pattern)
+    match = PROPERTY_RULE.match(pattern)
+    if match and prefix.startswith(match.group(0)):
+        return "property", match.group(1)
+    return "value", prefix
+
+class CSSPass:
+    """A refinement pass compiled for the declaration index
+    
+    No-op rules are dropped and the rest are precompiled and keyed once:
+    property rules by property name, value rules by the literal text their
+    matches start with, document rules as a function of the text (a
+    `<char>+$` rule only looks at the end of it).
+    """
+    
+    def __init__(self, pass_config: Dict):
+        self.name = pass_config["name"]
+        self.rules = []
+        self.document_rules = []
+        self.dropped = 0
+        for pattern, replacement in pass_config["changes"]:
+            if is_noop_rule(pattern, replacement):
+                self.dropped += 1
+                continue
+            kind, key = classify_rule(pattern)
+            if kind == "document":
+                self.document_rules.append(tail_run_rule(pattern, replacement)
+                                           or partial(re.compile(spell_leading_repeat(pattern)).sub, replacement))
+            else:
+                self.rules.append((kind, key, re.compile(pattern), replacement))
+
+# id(pass_config) -> (pass_config, CSSPass); the config is kept so ids are not reused
+_css_passes = {}
+
+def compile_css_pass(pass_config: Dict) -> CSSPass:
+    cached = _css_passes.get(id(pass_config))
+    if cached is None or cached[0] is not pass_config:
+        cached = (pass_config, CSSPass(pass_config))
+        _css_passes[id(pass_config)] = cached
+    return cached[1]
+
+class DeclarationIndex:
+    """CSS declarations of a document, looked up by property name
+    
+    The document is split once into text and declaration slots (see
+    CSS_DECLARATION), and every rule is applied by lookup: property rules to
+    that property's declarations, value rules to the values containing
+    their literal prefix, document rules to the text between declarations.
+    Inline scripts and page text are never rewritten, the work per rule is
+    proportional to the declarations it can match, and serialize() is a
+    single join, reused until a rule changes something.
+    """
+    
+    def __init__(self, content: str, is_css: bool = False):
+        self.is_css = is_css
+        parts = [""]
+        position = 0
+        for start, end in css_regions(content, is_css):
+            # The ";" lets a declaration start the region; it is dropped again
+            css_parts = CSS_DECLARATION.split(";" + content[start:end])
+            first = 0 if css_parts[0] else 1
+            css_parts[first] = css_parts[first][1:]
+            parts[-1] += content[position:start] + css_parts[0]
+            parts.extend(css_parts[1:])
+            position = end
+        parts[-1] += content[position:]
+        self.parts = parts
+        
+        # Slot index of each declaration's first group, in document order
+        self.declarations = []
+        self.by_property = {}
+        for base, name in zip(range(1, len(parts), STRIDE), parts[1 + NAME::STRIDE]):
+            if name is not None:
+                self.declarations.append(base)
+                self.by_property.setdefault(name.lower(), []).append(base)
+        # literal text -> {base: None} of the values containing it, built on first use
+        self.by_text = {}
+        self.markable = DECLARATION_MARK not in content
+        # The document as of the last serialize(), None once a slot changes
+        self.text = content
+    
+    def containing(self, text: str) -> Dict[int, None]:
+        found = self.by_text.get(text)
+        if found is None:
+            values = self.parts[1 + VALUE::STRIDE]
+            found = self.by_text[text] = {
+                1 + number * STRIDE: None for number, value in enumerate(values) if value and text in value
+            }
+        return found
+    
+    def changed(self, base: int):
+        """Keep the value lookups current after a declaration was rewritten"""
+        self.text = None
+        value = self.parts[base + VALUE]
+        for text, found in self.by_text.items():
+            if text in value:
+                found.setdefault(base)
+    
+    def apply_rule(self, kind: str, key: Optional[str], compiled: re.Pattern, replacement) -> int:
+        """Apply one compiled property or value rule; returns how many declarations changed"""
+        parts = self.parts
+        changed = 0
+        if kind == "property":
+            # A property rule matches from the start of "property: value"
+            for base in self.by_property.get(key, ()):
+                text = parts[base + NAME] + parts[base + VALUE]
+                refined = compiled.sub(replacement, text)
+                if refined != text:
+                    name, colon, value = refined.partition(":")
+                    parts[base + NAME], parts[base + VALUE] = name, colon + value
+                    self.changed(base)
+                    changed += 1
+            return changed
+        
+        for base in list(self.containing(key)):
+            value = parts[base + VALUE]
+            refined = compiled.sub(replacement, value)
+            if refined != value:
+                parts[base + VALUE] = refined
+                self.changed(base)
+                changed += 1
+        return changed
+    
+    def apply_document_rules(self, rules: List):
+        """Run document rules on the text between declarations, joined with a mark"""
+        parts = self.parts
+        if self.markable:
+            outside = parts[:]
+            outside[1 + NAME::STRIDE] = [DECLARATION_MARK if name is not None else None
+                                         for name in parts[1 + NAME::STRIDE]]
+            outside[1 + VALUE::STRIDE] = [None] * len(parts[1 + VALUE::STRIDE])
+            text = "".join(filter(None, outside))
+            refined = text
+            for rule in rules:
+                refined = rule(refined)
+            if refined == text:
+                return
+            chunks = refined.split(DECLARATION_MARK)
+            if len(chunks) == len(self.declarations) + 1:
+                # Each chunk becomes the text before its declaration
+                for slot in (0, 1 + OUTSIDE):
+                    parts[slot::STRIDE] = [None] * len(parts[slot::STRIDE])
+                for base, chunk in zip(self.declarations, chunks):
+                    parts[base + OUTSIDE] = chunk
+                parts[-1] = chunks[-1]
+                self.text = None
+                return
+        
+        # A rule matched across a declaration (or the text holds the mark):
+        # run the rules on the whole document and index the result again
+        text = original = self.serialize()
+        for rule in rules:
+            text = rule(text)
+        if text != original:
+            self.__init__(text, self.is_css)
+    
+    def apply_pass(self, css_pass: CSSPass):
+        for rule in css_pass.rules:
+            self.apply_rule(*rule)
+        if css_pass.document_rules:
+            self.apply_document_rules(css_pass.document_rules)
+    
+    def serialize(self) -> str:
+        if self.text is None:
+            self.text = "".join(filter(None, self.parts))
+        return self.text
+
+def iter_document_passes(content: str, passes: List[Dict], is_css: bool = False,
+                         snapshots: bool = True) -> Iterator[Tuple[Dict, Optional[str]]]:
+    """CSS-aware refinement: yield (pass_config, document) after each pass
+    
+    The document is indexed once. Without `snapshots` it is only serialized
+    after the last pass, and None is yielded for the others.
+    """
+    index = DeclarationIndex(content, is_css)
+    for i, pass_config in enumerate(passes, 1):
+        index.apply_pass(compile_css_pass(pass_config))
+        yield pass_config, index.serialize() if snapshots or i == len(passes) else None
+
+def refine_document(content: str, passes: List[Dict], is_css: bool = False) -> str:
+    """Apply every pass CSS-aware, serializing the document once at the end"""
+    for _, refined in iter_document_passes(content, passes, is_css, snapshots=False):
+        content = refined if refined is not None else content
+    return content
+
+def iter_refinement_passes(content: str, passes: List[Dict], num_passes: Optional[int] = None,
+                           is_css: bool = False) -> Iterator[Tuple[Dict, str]]:
+    """Yield (pass_config, document) after each pass, each derived from the previous document
+
+    With `num_passes` beyond len(passes), the passes repeat in order.
+    """
+    num_passes = len(passes) if num_passes is None else num_passes
+    return iter_document_passes(content, [passes[i % len(passes)] for i in range(num_passes)], is_css)
+
 def refine_file(file_path: Path, passes: List[Dict]) -> str:
     """Apply all refinement passes to a file"""
     content = file_path.read_text()
     
     print(f"  Refining: {file_path.name}")
-    for i, pass_config in enumerate(passes, 1):
+    passes_applied = iter_refinement_passes(content, passes, is_css=file_path.suffix == ".css")
+    for i, (pass_config, content) in enumerate(passes_applied, 1):
         print(f"    Pass {i:02d}: {pass_config['name']}")
-        content = apply_refinement_pass(content, pass_config)
     
     return content
 
-def refine_all_visuals():
-    """Refine all HTML infographic files"""
+def refine_and_save(html_file: Path) -> Dict:
+    """Refine one file in place, snapshotting before and after; safe to run in a worker process
+    
+    Both versions go to the content-addressed snapshot store (each file has its
+    own history index, so workers never contend), and the refined file is
+    written through a temp file and rename.
+    """
+    start = time.perf_counter()
+    original_content = html_file.read_text()
+    refined_content = refine_document(original_content, REFINEMENT_PASSES, is_css=html_file.suffix == ".css")
+    
+    snapshots = SnapshotStore()
+    snapshots.record(html_file, original_content, "before refinement")
+    
+    # Write refined content
+    changed = refined_content != original_content
+    if changed:
+        atomic_write_text(html_file, refined_content)
+        snapshots.record(html_file, refined_content, f"refined ({len(REFINEMENT_PASSES)} passes)")
+    
+    return {"file": html_file.name, "changed": changed, "seconds": time.perf_counter() - start}
+
+def refine_all_visuals(jobs: Optional[int] = None):
+    """Refine all HTML infographic files, fanning files out to `jobs` worker processes"""
     print("🎨 BEAST MODE Brand Refinement System\n")
     print(f"Applying {len(REFINEMENT_PASSES)} refinement passes...\n")
     
@@ -143,35 +488,51 @@ def refine_all_visuals():
         print("⚠️  No infographic HTML files found")
         return
     
-    for html_file in html_files:
-        print(f"\n{'='*60}")
-        print(f"Refining: {html_file.name}")
-        print(f"{'='*60}")
-        
-        try:
-            refined_content = refine_file(html_file, REFINEMENT_PASSES)
-            
-            # Create backup
-            backup_path = html_file.with_suffix('.html.backup')
-            if not backup_path.exists():
-                backup_path.write_text(html_file.read_text())
-            
-            # Write refined content
-            html_file.write_text(refined_content)
-            print(f"  ✅ Refined and saved")
-            
-        except Exception as e:
-            print(f"  ❌ Error: {e}")
+    jobs = min(jobs or os.cpu_count() or 1, len(html_files))
+    print(f"Refining {len(html_files)} file(s) with {jobs} worker(s)...\n")
+    
+    start = time.perf_counter()
+    results = []
+    if jobs == 1:
+        outcomes = []
+        for html_file in html_files:
+            try:
+                outcomes.append((html_file, refine_and_save(html_file), None))
+            except Exception as e:
+                outcomes.append((html_file, None, e))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = {executor.submit(refine_and_save, html_file): html_file for html_file in html_files}
+            outcomes = []
+            for future in as_completed(futures):
+                try:
+                    outcomes.append((futures[future], future.result(), None))
+                except Exception as e:
+                    outcomes.append((futures[future], None, e))
+    
+    for html_file, result, error in outcomes:
+        if error is not None:
+            print(f"  ❌ {html_file.name}: {error}")
+            continue
+        results.append(result)
+        status = "Refined and saved" if result["changed"] else "Already refined"
+        print(f"  ✅ {html_file.name}: {status} ({result['seconds'] * 1000:.1f} ms)")
+    
+    elapsed = time.perf_counter() - start
+    busy = sum(result["seconds"] for result in results)
     
     print("\n" + "="*60)
     print("✅ Brand Refinement Complete")
     print("="*60)
+    print(f"⏱️  {len(results)}/{len(html_files)} file(s) in {elapsed:.2f}s wall ({busy:.2f}s of refinement work)")
     print("\n💡 Next steps:")
     print("   1. Review refined HTML files")
-    print("   2. Regenerate visuals: python3 scripts/generate-visuals.py")
-    print("   3. Compare before/after")
+    print("   2. Regenerate and compare visuals: python3 scripts/render-orchestrator.py")
+    print("   3. Compare before/after: python3 scripts/snapshot_store.py diff visuals/html/<file>")
     print("   4. Iterate if needed")
 
 if __name__ == "__main__":
-    refine_all_visuals()
-
+    import sys
+    args = sys.argv[1:]
+    jobs = int(args[args.index("--jobs") + 1]) if "--jobs" in args else None
+    refine_all_visuals(jobs)
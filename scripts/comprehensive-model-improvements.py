@@ -6,28 +6,28 @@ Comprehensive Model Improvements
 3. Try Different Models (XGBoost, Random Forest, Neural Network)
 """
 
+import importlib.util
 import json
+import multiprocessing
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
-import numpy as np
-import pandas as pd
-from sklearn.model_selection import train_test_split, cross_val_score, KFold
-from sklearn.metrics import r2_score, mean_absolute_error, mean_squared_error
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.preprocessing import StandardScaler
-import xgboost as xgb
 
-# Try to import neural network libraries (optional)
-try:
-    from sklearn.neural_network import MLPRegressor
-    HAS_MLP = True
-except ImportError:
-    HAS_MLP = False
+# ML imports are deferred (see benchmark-import-time.py): spawned CV workers re-import
+# this module and should only load xgboost and sklearn, not pandas.
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from shared_matrix import SharedMatrix
+
+def has_mlp():
+    """Check whether the optional neural network regressor is available"""
+    # find_spec of a submodule imports its parent, so check sklearn itself first
+    return (importlib.util.find_spec('sklearn') is not None
+            and importlib.util.find_spec('sklearn.neural_network') is not None)
+
 def load_training_data():
     """Load real-only training data"""
     real_only_file = Path(__file__).parent.parent / '.beast-mode' / 'training-data' / 'all-repos-real-only.json'
@@ -45,6 +45,9 @@ def load_training_data():
 
 def engineer_features(df):
     """Advanced feature engineering"""
+    import numpy as np
+    import pandas as pd
+    
     print("🔧 Engineering features...")
     
     # Convert boolean/object columns to numeric
@@ -102,6 +105,9 @@ def engineer_features(df):
 
 def prepare_data(repos):
     """Prepare training data with feature engineering"""
+    import numpy as np
+    import pandas as pd
+    
     # Convert to DataFrame
     df = pd.DataFrame(repos)
     
@@ -142,8 +148,59 @@ def prepare_data(repos):
     
     return X, y, feature_cols
 
+# Built once per CV worker by load_cv_matrix; folds slice it rather than copying rows
+_CV_MATRIX = None
+
+def load_cv_matrix(X_handle, y_handle, nthread):
+    """Pool initializer: one DMatrix per worker from the shared training matrix"""
+    global _CV_MATRIX
+    import xgboost as xgb
+    
+    # DMatrix copies the rows into its own storage, so the mapping can be dropped
+    with SharedMatrix.attach(X_handle) as X, SharedMatrix.attach(y_handle) as y:
+        _CV_MATRIX = xgb.DMatrix(X.array, label=y.array, nthread=nthread)
+
+def score_cv_fold(params, train_idx, val_idx, nthread):
+    """R² of one CV fold, trained on rows sliced from the worker's DMatrix (runs in a worker)"""
+    import xgboost as xgb
+    from sklearn.metrics import r2_score
+    
+    dtrain_cv = _CV_MATRIX.slice(train_idx)
+    dval_cv = _CV_MATRIX.slice(val_idx)
+    
+    model_cv = xgb.train({**params, 'nthread': nthread}, dtrain_cv, num_boost_round=params['n_estimators'],
+                         early_stopping_rounds=20, evals=[(dval_cv, 'val')], verbose_eval=False)
+    
+    y_pred_cv = model_cv.predict(dval_cv)
+    return r2_score(dval_cv.get_label(), y_pred_cv)
+
+def cross_validate_xgboost(X_train, y_train, params, folds):
+    """R² per fold, with folds trained in parallel from one shared copy of the training data"""
+    import numpy as np
+    
+    workers = min(len(folds), os.cpu_count() or 1)
+    nthread = max(1, (os.cpu_count() or 1) // workers)
+    # spawn, not fork: XGBoost's OpenMP threads already exist in this process
+    context = multiprocessing.get_context('spawn')
+    
+    with SharedMatrix.create(np.asarray(X_train, dtype=np.float32)) as X, \
+         SharedMatrix.create(np.asarray(y_train, dtype=np.float64)) as y:
+        print(f"   CV: {len(folds)} folds on {workers} worker(s), {X.nbytes / 1024:.0f} KB shared once")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=load_cv_matrix,
+                                 initargs=(X.handle, y.handle, nthread)) as executor:
+            futures = [
+                executor.submit(score_cv_fold, params, train_idx, val_idx, nthread)
+                for train_idx, val_idx in folds
+            ]
+            return [future.result() for future in futures]
+
 def train_xgboost_tuned(X_train, y_train, X_test, y_test):
     """Train XGBoost with tuned hyperparameters"""
+    import numpy as np
+    import xgboost as xgb
+    from sklearn.model_selection import KFold
+    from sklearn.metrics import r2_score, mean_absolute_error, mean_squared_error
+    
     print("🚀 Training XGBoost (Tuned Hyperparameters)\n")
     
     # Tuned hyperparameters (more regularization)
@@ -184,19 +241,7 @@ def train_xgboost_tuned(X_train, y_train, X_test, y_test):
     
     # Cross-validation
     kfold = KFold(n_splits=5, shuffle=True, random_state=42)
-    cv_scores = []
-    for train_idx, val_idx in kfold.split(X_train):
-        X_cv_train, X_cv_val = X_train.iloc[train_idx], X_train.iloc[val_idx]
-        y_cv_train, y_cv_val = y_train.iloc[train_idx], y_train.iloc[val_idx]
-        
-        dtrain_cv = xgb.DMatrix(X_cv_train, label=y_cv_train)
-        dval_cv = xgb.DMatrix(X_cv_val, label=y_cv_val)
-        
-        model_cv = xgb.train(params, dtrain_cv, num_boost_round=params['n_estimators'],
-                            early_stopping_rounds=20, evals=[(dval_cv, 'val')], verbose_eval=False)
-        
-        y_pred_cv = model_cv.predict(dval_cv)
-        cv_scores.append(r2_score(y_cv_val, y_pred_cv))
+    cv_scores = cross_validate_xgboost(X_train, y_train, params, list(kfold.split(X_train)))
     
     cv_mean = np.mean(cv_scores)
     cv_std = np.std(cv_scores)
@@ -214,6 +259,11 @@ def train_xgboost_tuned(X_train, y_train, X_test, y_test):
 
 def train_random_forest(X_train, y_train, X_test, y_test):
     """Train Random Forest"""
+    import numpy as np
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.model_selection import cross_val_score
+    from sklearn.metrics import r2_score, mean_absolute_error, mean_squared_error
+    
     print("🚀 Training Random Forest\n")
     
     model = RandomForestRegressor(
@@ -253,9 +303,15 @@ def train_random_forest(X_train, y_train, X_test, y_test):
 
 def train_neural_network(X_train, y_train, X_test, y_test):
     """Train Neural Network (if available)"""
-    if not HAS_MLP:
+    if not has_mlp():
         return None
     
+    import numpy as np
+    from sklearn.neural_network import MLPRegressor
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.model_selection import cross_val_score
+    from sklearn.metrics import r2_score, mean_absolute_error, mean_squared_error
+    
     print("🚀 Training Neural Network\n")
     
     # Scale features (handle any inf/nan values)
@@ -327,6 +383,7 @@ def main():
     print(f"📊 Dataset: {len(X)} examples, {len(feature_names)} features\n")
     
     # Split data
+    from sklearn.model_selection import train_test_split
     X_train, X_test, y_train, y_test = train_test_split(
         X, y, test_size=0.2, random_state=42
     )
@@ -354,7 +411,7 @@ def main():
         print(f"❌ Random Forest failed: {e}\n")
     
     # 3. Neural Network
-    if HAS_MLP:
+    if has_mlp():
         try:
             result = train_neural_network(X_train, y_train, X_test, y_test)
             if result:
@@ -398,32 +455,27 @@ def main():
     
     print()
     
-    # Log best model results to database
+    # Log best model results to database (in-process, no node subprocess)
     try:
-        import subprocess
-        from pathlib import Path
+        from training_results_sink import log_training_results
         
-        log_script = Path(__file__).parent / 'log-training-results.js'
-        if log_script.exists():
-            print('📊 Logging best model results to database...')
-            args = [
-                'node',
-                str(log_script),
-                best_model['name'].lower().replace(' ', '-'),
-                str(best_model['r2_train']),
-                str(best_model['r2_test']),
-                str(best_model['r2_cv']),
-                str(best_model['mae']),
-                str(best_model['rmse']),
-                str(len(repos)),
-                str(len(feature_names))
-            ]
-            result = subprocess.run(args, capture_output=True, text=True, check=False)
-            if result.returncode == 0:
-                print(result.stdout)
-            else:
-                print(f'⚠️  Could not log results: {result.stderr}')
-            print()
+        print('📊 Logging best model results to database...')
+        log_training_results({
+            'model_type': best_model['name'].lower().replace(' ', '-'),
+            'metrics': {
+                'r2_train': best_model['r2_train'],
+                'r2_test': best_model['r2_test'],
+                'r2_cv': best_model['r2_cv'],
+                'mae': best_model['mae'],
+                'rmse': best_model['rmse'],
+            },
+            'training_data': {
+                'size': len(repos),
+                'feature_count': len(feature_names),
+            },
+        })
+        print('✅ Results logged')
+        print()
     except Exception as e:
         print(f'⚠️  Could not log results: {e}')
         print()
@@ -270,7 +270,8 @@ class ContinuousTrainingPipeline {
       await fs.access(targetPath);
       
       const model = JSON.parse(await fs.readFile(targetPath, 'utf8'));
-      if (model.metadata && model.metadata.training_date) {
+      // Schema v2 metadata records trainedAt; older files used training_date
+      if (model.metadata && (model.metadata.trainedAt || model.metadata.training_date)) {
         await this.log('✅ Deployment verified - model is accessible', 'SUCCESS');
         return true;
       }
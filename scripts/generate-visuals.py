@@ -2,6 +2,8 @@
 """
 BEAST MODE - Visual Assets Generator (Python + Playwright)
 Automatically generates high-fidelity visual assets from HTML files
+
+Usage: python3 scripts/generate-visuals.py [--concurrency N] [--force] [--mermaid] [--variants [--avif] [--pdf]]
 """
 
 import asyncio
@@ -9,8 +11,13 @@ import os
 import sys
 from pathlib import Path
 from playwright.async_api import async_playwright
-from http.server import HTTPServer, SimpleHTTPRequestHandler
-import threading
+from mermaid_renderer import MERMAID_DIR, plan_diagrams, render_diagrams
+from render_pool import DEFAULT_CONCURRENCY, parse_concurrency, pool_or_launch
+from render_cache import RenderCache, render_key
+from render_outputs import DEFAULT_OUTPUTS, VariantEncoder, capture_variants, planned_variants
+from render_readiness import REPORT as READINESS, wait_until_ready
+from virtual_origin import SHARED_ORIGIN as ORIGIN
+from visual_manifest import load_assets
 import time
 
 # Paths
@@ -23,43 +30,21 @@ CSS_DIR = VISUALS_DIR / "css"
 # Ensure assets directory exists
 ASSETS_DIR.mkdir(exist_ok=True)
 
-# Server configuration
-SERVER_PORT = 8000
-SERVER_URL = f"http://localhost:{SERVER_PORT}"
-
-class CustomHTTPRequestHandler(SimpleHTTPRequestHandler):
-    """Custom handler to serve files from visuals directory"""
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, directory=str(BASE_DIR), **kwargs)
-    
-    def end_headers(self):
-        self.send_header('Cache-Control', 'no-cache, no-store, must-revalidate')
-        self.send_header('Pragma', 'no-cache')
-        self.send_header('Expires', '0')
-        super().end_headers()
-
-def start_server():
-    """Start local HTTP server"""
-    server = HTTPServer(("localhost", SERVER_PORT), CustomHTTPRequestHandler)
-    thread = threading.Thread(target=server.serve_forever, daemon=True)
-    thread.start()
-    time.sleep(1)  # Give server time to start
-    return server
-
-async def generate_html_visual(page, html_file, output_file, width=1200, height=800):
-    """Generate screenshot from HTML file"""
+async def generate_html_visual(page, html_file, output_file, width=1200, height=800, outputs=None, encoder=None):
+    """Generate screenshot from HTML file, plus the `outputs` variants if given"""
     try:
-        # Use file:// URL directly
-        file_url = html_file.as_uri()
+        # Served over the virtual origin (BASE_DIR, cached in memory) rather than file://
+        url = ORIGIN.url_for(html_file)
         
         print(f"📸 Generating: {output_file.name}")
         print(f"   File: {html_file}")
         
-        await page.goto(file_url, wait_until="networkidle")
+        await page.goto(url, wait_until="networkidle")
         await page.set_viewport_size({"width": width, "height": height})
         
-        # Wait for any animations/transitions
-        await asyncio.sleep(1)
+        # Wait for fonts, animations and layout instead of a fixed 1s sleep
+        waited = await wait_until_ready(page)
+        print(f"   {READINESS.record(output_file.name, waited, fixed_delay=1.0)}")
         
         await page.screenshot(
             path=str(output_file),
@@ -67,66 +52,82 @@ async def generate_html_visual(page, html_file, output_file, width=1200, height=
             type="png"
         )
         
+        if outputs:
+            variants = await capture_variants(page, output_file, width, height, outputs, encoder)
+            print(f"   🖼️  {len(variants)} browser variant(s): {', '.join(path.name for path in variants)}")
+        
         print(f"✅ Generated: {output_file.name}")
         return True
     except Exception as e:
         print(f"❌ Failed to generate {output_file.name}: {e}")
         return False
 
-async def generate_mermaid_diagram(page, mermaid_file, output_file):
-    """Generate Mermaid diagram using mermaid.live API or local rendering"""
+def display_name(output_name):
+    return output_name.replace(".png", "").replace("-", " ").title()
+
+def plan_html_visuals(results, assets=None):
+    """Render jobs from the visual asset manifest; assets with no source HTML are skipped"""
+    jobs = []
+    for asset in assets or load_assets():
+        source = asset["source"]
+        if source is None:
+            results["skipped"].append(f"{asset['html']} (file not found)")
+            continue
+        jobs.append((display_name(asset["output"]), source, asset["output_path"]))
+    
+    return jobs
+
+def render_params(width, height, outputs=None):
+    params = {"width": width, "height": height, "full_page": True, "type": "png"}
+    if outputs:
+        params["outputs"] = outputs
+    return params
+
+def parse_outputs(args):
+    """Variant spec from `--variants [--avif] [--pdf]`, or None for the single PNG"""
+    if "--variants" not in args:
+        return None
+    outputs = dict(DEFAULT_OUTPUTS)
+    if "--avif" in args:
+        outputs["formats"] = outputs["formats"] + ["avif"]
+    outputs["pdf"] = "--pdf" in args
+    return outputs
+
+async def render_html_job(page, pending, outputs=None, encoder=None):
+    """Render one planned job; returns render seconds, or None on failure"""
+    (name, source, output_path), key, inputs = pending
+    start = time.perf_counter()
+    if not await generate_html_visual(page, source["html_path"], output_path, width=source["width"], height=source["height"],
+                                      outputs=outputs, encoder=encoder):
+        return None
+    return time.perf_counter() - start
+
+async def generate_mermaid_diagrams(results, cache, force=False, browser=None):
+    """Render visuals/mermaid/*.mmd with the offline Mermaid renderer"""
+    mermaid_files = sorted(MERMAID_DIR.glob("*.mmd"))
+    print(f"\n📊 Rendering {len(mermaid_files)} Mermaid diagram(s) offline...\n")
+    
     try:
-        # Read Mermaid content
-        mermaid_content = mermaid_file.read_text()
-        
-        # Use Mermaid Live Editor approach
-        # Create a simple HTML page with Mermaid
-        html_content = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <script type="module">
-        import mermaid from 'https://cdn.jsdelivr.net/npm/mermaid@10/dist/mermaid.esm.min.mjs';
-        mermaid.initialize({{ startOnLoad: true, theme: 'default' }});
-    </script>
-</head>
-<body style="margin: 0; padding: 20px; background: white;">
-    <div class="mermaid">
-{mermaid_content}
-    </div>
-</body>
-</html>
-"""
-        
-        # Create temp HTML file
-        temp_html = HTML_DIR / f"temp_{mermaid_file.stem}.html"
-        temp_html.write_text(html_content)
-        
-        # Generate screenshot using file:// URL
-        file_url = temp_html.as_uri()
-        
-        print(f"📸 Generating: {output_file.name}")
-        await page.goto(file_url, wait_until="networkidle")
-        await page.set_viewport_size({"width": 1200, "height": 800})
-        await asyncio.sleep(3)  # Wait for Mermaid to render
-        
-        await page.screenshot(
-            path=str(output_file),
-            full_page=True,
-            type="png"
-        )
-        
-        # Clean up temp file
-        temp_html.unlink()
-        
-        print(f"✅ Generated: {output_file.name}")
-        return True
-    except Exception as e:
-        print(f"❌ Failed to generate {output_file.name}: {e}")
-        return False
+        # Freshness is checked first so Chromium is only launched for stale diagrams
+        plan = plan_diagrams(mermaid_files, force=force, cache=cache)
+        _, _, stale, _ = plan
+        if browser is not None or not stale:
+            outcomes = await render_diagrams(browser, mermaid_files, cache=cache, plan=plan)
+        else:
+            async with async_playwright() as p:
+                browser = await p.chromium.launch(headless=True)
+                outcomes = await render_diagrams(browser, mermaid_files, cache=cache, plan=plan)
+                await browser.close()
+    except FileNotFoundError as e:
+        print(f"⚠️  {e}")
+        results["skipped"].append("Mermaid diagrams (bundle not vendored)")
+        outcomes = {}
+    
+    for name, ok in outcomes.items():
+        results["success" if ok else "failed"].append(name)
 
-async def generate_all_visuals():
-    """Generate all visual assets"""
+async def generate_all_visuals(concurrency=DEFAULT_CONCURRENCY, force=False, mermaid=False, outputs=None, pool=None, assets=None):
+    """Generate all visual assets (on `pool` if one is shared, else a fresh Chromium)"""
     print("🎨 BEAST MODE Visual Assets Generator (Python + Playwright)\n")
     
     results = {
@@ -135,61 +136,56 @@ async def generate_all_visuals():
         "skipped": []
     }
     
-    async with async_playwright() as p:
-        print("Launching browser...")
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
-        
-        # 1. HTML-based visuals (Infographic versions)
-        print("\n📄 Generating HTML-based infographics...\n")
-        
-        # Try infographic versions first, fallback to originals
-        infographic_files = {
-            "governance-layer-infographic.html": ("governance-layer-architecture.png", 1600, 1000),
-            "mullet-strategy-infographic.html": ("mullet-strategy-dual-brand.png", 1600, 1200),
-            "before-after-infographic.html": ("before-after-transformation.png", 1800, 1000),
-            "overnight-cycle-infographic.html": ("overnight-refactoring-cycle.png", 1400, 1200),
-            "tech-stack-infographic.html": ("market-positioning-map.png", 1600, 1000),
-            "three-walls-infographic.html": ("three-walls-solution-map.png", 1800, 1200),
-            "english-source-code-infographic.html": ("english-as-source-code-workflow.png", 1800, 1000),
-        }
-        
-        # Fallback to original files if infographic versions don't exist
-        fallback_files = {
-            "mullet-strategy.html": ("mullet-strategy-dual-brand.png", 1400, 1200),
-            "before-after.html": ("before-after-transformation.png", 1600, 900),
-        }
-        
-        for html_file, (output_name, width, height) in infographic_files.items():
-            html_path = HTML_DIR / html_file
-            output_path = ASSETS_DIR / output_name
-            
-            if html_path.exists():
-                if await generate_html_visual(page, html_path, output_path, width=width, height=height):
-                    results["success"].append(output_name.replace(".png", "").replace("-", " ").title())
-                else:
-                    results["failed"].append(output_name.replace(".png", "").replace("-", " ").title())
-            else:
-                # Try fallback
-                fallback_name = html_file.replace("-infographic", "")
-                if fallback_name in fallback_files:
-                    fallback_path = HTML_DIR / fallback_name
-                    if fallback_path.exists():
-                        fallback_output, fallback_w, fallback_h = fallback_files[fallback_name]
-                        if await generate_html_visual(page, fallback_path, ASSETS_DIR / fallback_output, width=fallback_w, height=fallback_h):
-                            results["success"].append(output_name.replace(".png", "").replace("-", " ").title())
-                        else:
-                            results["failed"].append(output_name.replace(".png", "").replace("-", " ").title())
-                    else:
-                        results["skipped"].append(f"{html_file} (file not found)")
-                else:
-                    results["skipped"].append(f"{html_file} (file not found)")
-        
-        # 2. Mermaid diagrams (only if infographic versions don't exist)
-        # Skip Mermaid generation - using infographic HTML versions instead
-        print("\n📊 Mermaid diagrams skipped - using infographic HTML versions\n")
-        
-        await browser.close()
+    # 1. HTML-based visuals (Infographic versions)
+    cache = RenderCache()
+    pending = []
+    for job in plan_html_visuals(results, assets):
+        name, source, output_path = job
+        params = render_params(source["width"], source["height"], outputs)
+        key, inputs = render_key(source["html_path"], params, depends=source["depends"])
+        variants_present = not outputs or all(path.exists() for path in planned_variants(output_path, outputs))
+        if not force and cache.is_fresh(output_path, key) and variants_present:
+            print(f"♻️  Unchanged: {output_path.name}")
+            results["success"].append(name)
+        else:
+            pending.append((job, key, inputs))
+    
+    if pending:
+        if pool is None:
+            print("Launching browser...")
+        print(f"\n📄 Generating {len(pending)} HTML-based infographics ({concurrency} at a time)...\n")
+        
+        # Renders overlap, so total time tracks the slowest asset rather than the sum;
+        # variant encoding runs in worker processes while later assets render
+        encoder = VariantEncoder(outputs) if outputs else None
+        async with pool_or_launch(pool, size=min(concurrency, len(pending)), setup=ORIGIN.install) as pages:
+            outcomes = await pages.run(lambda page, job: render_html_job(page, job, outputs, encoder), pending)
+        
+        if encoder is not None:
+            encoded, encode_failures = await encoder.wait()
+            encoder.close()
+            print(f"\n🖼️  Encoded {len(encoded)} variant(s)")
+            for path, error in encode_failures.items():
+                print(f"   ❌ {path.name}: {error}")
+        
+        for (job, key, inputs), seconds in zip(pending, outcomes):
+            name, source, output_path = job
+            if seconds is None:
+                results["failed"].append(name)
+                continue
+            results["success"].append(name)
+            params = render_params(source["width"], source["height"], outputs)
+            cache.record(output_path, key, source["html_path"], inputs, params, seconds)
+    else:
+        print("\n♻️  All infographics up to date - Chromium not launched")
+    
+    # 2. Mermaid diagrams (opt-in - the infographic HTML versions are the defaults)
+    if mermaid:
+        await generate_mermaid_diagrams(results, cache, force, browser=pool.browser if pool else None)
+    else:
+        print("\n📊 Mermaid diagrams skipped - using infographic HTML versions (--mermaid to render)\n")
+    
+    cache.save()
     
     # Summary
     print("\n" + "="*60)
@@ -214,12 +210,18 @@ async def generate_all_visuals():
         for item in results["skipped"]:
             print(f"   - {item}")
     
+    READINESS.print_summary()
+    print(cache.summary())
+    print(ORIGIN.summary())
     print(f"\n📁 Assets saved to: {ASSETS_DIR}")
     print("="*60)
 
 if __name__ == "__main__":
     try:
-        asyncio.run(generate_all_visuals())
+        args = sys.argv[1:]
+        concurrency = parse_concurrency(args)
+        asyncio.run(generate_all_visuals(concurrency, force="--force" in args, mermaid="--mermaid" in args,
+                                         outputs=parse_outputs(args)))
     except KeyboardInterrupt:
         print("\n\n⚠️  Interrupted by user")
         sys.exit(1)
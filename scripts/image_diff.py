@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+BEAST MODE - Image Diff
+Perceptual hashes and pixel diffs between refinement pass screenshots
+
+Compares each pass with the one before it and with the committed asset,
+writes diff heatmaps, and hardlinks byte-identical passes together. The
+summary (assets/refinements/diff-summary.json) records, per asset, the pass
+after which the pixels stopped changing.
+
+Usage: python3 scripts/image_diff.py [--heatmaps] [--dedupe] [asset-name ...]
+"""
+
+import hashlib
+import io
+import re
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from atomic_io import atomic_write_json
+from render_cache import link_output, relative_name
+from visual_manifest import load_assets
+
+try:
+    import numpy as np
+    from PIL import Image
+    HAS_IMAGING = True
+except ImportError:
+    HAS_IMAGING = False
+
+BASE_DIR = Path(__file__).parent.parent
+REFINEMENT_DIR = BASE_DIR / "assets" / "refinements"
+DIFF_DIR = REFINEMENT_DIR / "diffs"
+SUMMARY_PATH = REFINEMENT_DIR / "diff-summary.json"
+
+PASS_FILE = re.compile(r"^(?P<name>.+)-pass-(?P<num>\d{2})\.png$")
+HASH_SIZE = 8
+PHASH_SIZE = 32
+# Per-channel differences at or below this are treated as encoder noise
+PIXEL_TOLERANCE = 0
+
+def file_sha256(path):
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+def load_pixels(path):
+    """RGB pixels of an image as a (height, width, 3) uint8 array"""
+    with Image.open(path) as image:
+        return np.asarray(image.convert("RGB"))
+
+def grayscale(pixels, size):
+    """Luma of `pixels` resampled to `size` (width, height), as float32"""
+    image = Image.fromarray(pixels).convert("L").resize(size, Image.LANCZOS)
+    return np.asarray(image, dtype=np.float32)
+
+def bits_to_int(bits):
+    return int.from_bytes(np.packbits(bits.ravel()).tobytes(), "big")
+
+def dhash(pixels, size=HASH_SIZE):
+    """Difference hash: whether each pixel is brighter than its right neighbour"""
+    gray = grayscale(pixels, (size + 1, size))
+    return bits_to_int(gray[:, 1:] > gray[:, :-1])
+
+def dct_matrix(n):
+    k = np.arange(n)[:, None]
+    x = np.arange(n)[None, :]
+    matrix = np.cos(np.pi * (2 * x + 1) * k / (2 * n)) * np.sqrt(2 / n)
+    matrix[0] /= np.sqrt(2)
+    return matrix
+
+def phash(pixels, size=HASH_SIZE, sample=PHASH_SIZE):
+    """DCT hash: low-frequency coefficients compared with their median"""
+    gray = grayscale(pixels, (sample, sample))
+    dct = dct_matrix(sample)
+    low = (dct @ gray @ dct.T)[:size, :size]
+    return bits_to_int(low > np.median(low.ravel()[1:]))
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+def pad_to(pixels, height, width):
+    if pixels.shape[:2] == (height, width):
+        return pixels
+    padded = np.zeros((height, width, 3), dtype=pixels.dtype)
+    padded[:pixels.shape[0], :pixels.shape[1]] = pixels
+    return padded
+
+def pixel_delta(a, b):
+    """Per-pixel max channel difference; images of different size are compared top-left aligned"""
+    height = max(a.shape[0], b.shape[0])
+    width = max(a.shape[1], b.shape[1])
+    a, b = pad_to(a, height, width), pad_to(b, height, width)
+    return np.abs(a.astype(np.int16) - b.astype(np.int16)).max(axis=2)
+
+def write_heatmap(base, delta, path):
+    """Dimmed grayscale of `base` with changed pixels in red, brighter for larger changes"""
+    height, width = delta.shape
+    gray = pad_to(base, height, width).mean(axis=2) * 0.35
+    heat = np.stack([gray, gray, gray], axis=2)
+    changed = delta > PIXEL_TOLERANCE
+    heat[changed, 0] = 128 + delta[changed] / 2
+    heat[changed, 1:] = 0
+    path.parent.mkdir(parents=True, exist_ok=True)
+    Image.fromarray(heat.clip(0, 255).astype(np.uint8)).save(path)
+    return path
+
+def compare(a_path, b_path, heatmap_path=None):
+    """Hash distances and pixel change statistics between two screenshots"""
+    if file_sha256(a_path) == file_sha256(b_path):
+        return {"identical": True, "dhash_distance": 0, "phash_distance": 0, "changed_pixels": 0, "changed_ratio": 0.0}
+    
+    a, b = load_pixels(a_path), load_pixels(b_path)
+    delta = pixel_delta(a, b)
+    changed = int((delta > PIXEL_TOLERANCE).sum())
+    result = {
+        "identical": False,
+        "size_changed": a.shape != b.shape,
+        "dhash_distance": hamming(dhash(a), dhash(b)),
+        "phash_distance": hamming(phash(a), phash(b)),
+        "changed_pixels": changed,
+        "changed_ratio": round(changed / delta.size, 6),
+        "mean_delta": round(float(delta.mean()), 4),
+        "max_delta": int(delta.max()),
+    }
+    if heatmap_path is not None and changed:
+        result["heatmap"] = relative_name(write_heatmap(a, delta, heatmap_path))
+    return result
+
+def pixels_changed(a, b):
+    """Whether two screenshots (paths or PNG bytes) differ by any pixel (byte comparison without NumPy/Pillow)"""
+    a = a if isinstance(a, bytes) else Path(a).read_bytes()
+    b = b if isinstance(b, bytes) else Path(b).read_bytes()
+    if a == b:
+        return False
+    if not HAS_IMAGING:
+        return True
+    a, b = load_pixels(io.BytesIO(a)), load_pixels(io.BytesIO(b))
+    return a.shape != b.shape or bool((pixel_delta(a, b) > PIXEL_TOLERANCE).any())
+
+def pass_files(refinement_dir=REFINEMENT_DIR):
+    """{asset name: [pass paths in pass order]} for `<name>-pass-NN.png` files"""
+    groups = {}
+    for path in sorted(Path(refinement_dir).glob("*-pass-*.png")):
+        match = PASS_FILE.match(path.name)
+        if match:
+            groups.setdefault(match["name"], []).append(path)
+    return groups
+
+def committed_assets(assets=None):
+    """{pass file prefix: committed asset path}; passes are named by asset name or HTML stem"""
+    references = {}
+    for asset in assets or load_assets():
+        if asset["output_path"].exists():
+            references[asset["name"]] = asset["output_path"]
+            if asset["source"] is not None:
+                references[asset["source"]["html_path"].stem] = asset["output_path"]
+    return references
+
+def dedupe(paths):
+    """Hardlink byte-identical files to the first copy; returns bytes reclaimed"""
+    seen = {}
+    reclaimed = 0
+    for path in paths:
+        digest = file_sha256(path)
+        first = seen.setdefault(digest, path)
+        if first != path and not path.samefile(first):
+            reclaimed += path.stat().st_size
+            link_output(first, path)
+    return reclaimed
+
+def summarize_asset(name, paths, reference=None, heatmaps=False):
+    """Consecutive-pass and against-committed comparisons for one asset"""
+    passes = []
+    stable_after = None
+    for index, path in enumerate(paths):
+        entry = {"pass": path.name}
+        if index:
+            heatmap = DIFF_DIR / f"{name}-pass-{index:02d}-{index + 1:02d}.png" if heatmaps else None
+            entry["vs_previous"] = compare(paths[index - 1], path, heatmap)
+            if entry["vs_previous"]["changed_pixels"] == 0:
+                stable_after = index if stable_after is None else stable_after
+            else:
+                stable_after = None
+        if reference is not None:
+            heatmap = DIFF_DIR / f"{name}-pass-{index + 1:02d}-committed.png" if heatmaps else None
+            entry["vs_committed"] = compare(reference, path, heatmap)
+        passes.append(entry)
+    
+    return {
+        "passes": passes,
+        "committed": relative_name(reference) if reference is not None else None,
+        "unique_images": len({file_sha256(path) for path in paths}),
+        "stable_after_pass": stable_after,
+    }
+
+def diff_refinements(names=None, heatmaps=False, dedupe_passes=False, assets=None):
+    """Compare the pass screenshots of `names` (default all) and write the JSON summary"""
+    groups = pass_files()
+    if names:
+        groups = {name: paths for name, paths in groups.items() if name in names}
+    
+    references = committed_assets(assets)
+    summary = {"timestamp": datetime.now().isoformat(), "assets": {}}
+    for name, paths in groups.items():
+        result = summarize_asset(name, paths, references.get(name), heatmaps)
+        summary["assets"][name] = result
+        stable = result["stable_after_pass"]
+        print(f"{name}: {len(paths)} pass(es), {result['unique_images']} unique"
+              + (f", stable after pass {stable}" if stable else ", still changing"))
+    
+    if dedupe_passes:
+        reclaimed = sum(dedupe(paths) for paths in groups.values())
+        summary["reclaimed_bytes"] = reclaimed
+        print(f"\n🔗 Linked identical passes, reclaimed {reclaimed / 1024:.0f} KB")
+    
+    atomic_write_json(SUMMARY_PATH, summary)
+    print(f"\n📁 Summary: {SUMMARY_PATH}")
+    if heatmaps:
+        print(f"🌡️  Heatmaps: {DIFF_DIR}")
+    return summary
+
+def main(args):
+    if not HAS_IMAGING:
+        print("❌ image_diff needs numpy and Pillow (pip install numpy pillow)")
+        sys.exit(1)
+    
+    print("🔍 BEAST MODE Refinement Pass Diff\n")
+    diff_refinements(
+        names=[arg for arg in args if not arg.startswith("--")],
+        heatmaps="--heatmaps" in args,
+        dedupe_passes="--dedupe" in args,
+    )
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -6,9 +6,19 @@ Generate 10 passes with incremental improvements
 
 import asyncio
 import json
+import time
+from functools import partial
 from pathlib import Path
-from playwright.async_api import async_playwright
-from brand_refinement_system import refine_file, REFINEMENT_PASSES
+from atomic_io import atomic_write_bytes
+from image_diff import pixels_changed
+from render_cache import RenderCache, group_by_key, link_output, render_key
+from render_pool import DEFAULT_CONCURRENCY, parse_concurrency, pool_or_launch
+from render_readiness import REPORT as READINESS, wait_until_ready
+from virtual_origin import SHARED_ORIGIN as ORIGIN
+from visual_manifest import load_assets
+from script_loader import load_script
+
+brand_refinement = load_script("brand-refinement-system.py")
 
 BASE_DIR = Path(__file__).parent.parent
 HTML_DIR = BASE_DIR / "visuals" / "html"
@@ -17,79 +27,133 @@ REFINEMENT_DIR = ASSETS_DIR / "refinements"
 
 REFINEMENT_DIR.mkdir(exist_ok=True)
 
-async def generate_refined_visual(page, html_file, pass_num, total_passes):
-    """Generate a visual with specific refinement pass applied"""
-    # Apply refinement passes incrementally
-    passes_to_apply = REFINEMENT_PASSES[:pass_num]
-    
-    # Read original
+def refined_pass_contents(html_file, num_passes):
+    """In-memory document after each pass; pass N is derived from pass N-1"""
+    print(f"  Refining: {html_file.name}")
     original_content = html_file.read_text()
-    
-    # Apply passes incrementally
-    refined_content = original_content
-    for pass_config in passes_to_apply:
-        refined_content = refine_file(html_file, [pass_config])
-    
-    # Write temporary file
-    temp_file = html_file.parent / f".temp-{html_file.stem}-pass{pass_num}.html"
-    temp_file.write_text(refined_content)
-    
-    # Generate screenshot
-    output_file = REFINEMENT_DIR / f"{html_file.stem}-pass-{pass_num:02d}.png"
+    return [
+        content
+        for pass_config, content in brand_refinement.iter_refinement_passes(
+            original_content, brand_refinement.REFINEMENT_PASSES, num_passes
+        )
+    ]
+
+def pass_output_path(html_file, pass_num):
+    return REFINEMENT_DIR / f"{html_file.stem}-pass-{pass_num:02d}.png"
+
+def render_params(source):
+    return {"width": source["width"], "height": source["height"], "full_page": True, "type": "png"}
+
+async def generate_refined_visual(page, source, refined_content, pass_num):
+    """Generate a visual with specific refinement pass applied; returns the PNG bytes, or None"""
+    html_file = source["html_path"]
+    output_file = pass_output_path(html_file, pass_num)
     
     try:
-        file_url = temp_file.as_uri()
-        await page.goto(file_url, wait_until="networkidle")
-        await page.set_viewport_size({"width": 1600, "height": 1000})
-        await asyncio.sleep(2)  # Wait for animations
+        with ORIGIN.document(html_file, refined_content) as url:
+            await page.goto(url, wait_until="networkidle")
+        await page.set_viewport_size({"width": source["width"], "height": source["height"]})
+        waited = await wait_until_ready(page)  # was a 2s sleep + 0.5s between passes
+        savings = READINESS.record(output_file.name, waited, fixed_delay=2.5)
         
-        await page.screenshot(
-            path=str(output_file),
-            full_page=True,
-            type="png"
-        )
-        
-        # Cleanup temp file
-        temp_file.unlink()
+        # Replaced by rename: identical passes may be hardlinked to this file
+        png = await page.screenshot(full_page=True, type="png")
+        atomic_write_bytes(output_file, png)
         
-        return True
+        print(f"  ✅ {output_file.name} {savings}")
+        return png
     except Exception as e:
-        print(f"    ❌ Error: {e}")
-        if temp_file.exists():
-            temp_file.unlink()
-        return False
+        print(f"  ❌ {output_file.name}: {e}")
+        return None
+
+async def render_pass_job(page, job, captured=None):
+    """Render one refined pass; returns render seconds, or None on failure
+    
+    With `captured`, the screenshot is also kept there under the pass's render key.
+    """
+    source, pass_num, refined_content, key, inputs = job
+    start = time.perf_counter()
+    png = await generate_refined_visual(page, source, refined_content, pass_num)
+    if png is None:
+        return None
+    if captured is not None:
+        captured[key] = png
+    return time.perf_counter() - start
 
-async def iterative_refinement(num_passes=10):
-    """Generate iterative refinement passes"""
+async def render_until_stable(pool, captures, pass_keys, fresh):
+    """Render every capture, reporting the passes that leave their file's pixels unchanged
+    
+    Each pass is compared with the capture of the previous pass's render key:
+    the screenshot taken in this run, or the cached file when that pass was
+    fresh (`fresh` maps its key to the path). The passes are heterogeneous, so
+    one that changes nothing visible says nothing about the next and every
+    pass is still rendered. Passes whose refined HTML is unchanged share a
+    render key and are linked to one capture by the caller, which is the only
+    safe early stop.
+    """
+    captured = dict(fresh)
+    outcomes = await pool.run(partial(render_pass_job, captured=captured), captures)
+    for job, seconds in sorted(zip(captures, outcomes), key=lambda item: item[0][1]):
+        html_file, pass_num = job[0]["html_path"], job[1]
+        previous = captured.get(pass_keys.get((html_file, pass_num - 1)))
+        if seconds is not None and previous is not None and not pixels_changed(previous, captured[job[3]]):
+            print(f"  🟰 {html_file.stem}: pass {pass_num:02d} renders like pass {pass_num - 1:02d}")
+    return outcomes
+
+async def iterative_refinement(num_passes=10, force=False, concurrency=DEFAULT_CONCURRENCY, until_stable=False, pool=None, assets=None):
+    """Generate iterative refinement passes (on `pool` if one is shared, else a fresh Chromium)"""
     print("🎨 BEAST MODE Iterative Refinement System\n")
     print(f"Generating {num_passes} incremental passes...\n")
     
-    html_files = list(HTML_DIR.glob("*-infographic.html"))
+    sources = [asset["source"] for asset in assets or load_assets() if asset["source"] is not None]
     
-    if not html_files:
+    if not sources:
         print("⚠️  No infographic HTML files found")
         return
     
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
+    # Refining is cheap; only passes whose refined HTML/CSS changed are re-rendered
+    cache = RenderCache()
+    stale = []
+    pass_keys = {}
+    fresh = {}
+    for source in sources:
+        html_file = source["html_path"]
+        for pass_num, refined_content in enumerate(refined_pass_contents(html_file, num_passes), 1):
+            key, inputs = render_key(html_file, render_params(source), html_text=refined_content, depends=source["depends"])
+            pass_keys[html_file, pass_num] = key
+            if force or not cache.is_fresh(pass_output_path(html_file, pass_num), key):
+                stale.append((source, pass_num, refined_content, key, inputs))
+            else:
+                fresh[key] = pass_output_path(html_file, pass_num)
+    
+    if stale:
+        # Later passes often leave the document unchanged; those share a key
+        # with an earlier pass and are linked to its capture
+        groups = list(group_by_key(stale, lambda job: job[3]).values())
+        captures = [group[0] for group in groups]
+        print(f"\nRendering {len(captures)} unique pass(es) of {len(stale)} ({concurrency} at a time)...\n")
         
-        for html_file in html_files:
-            print(f"\n{'='*60}")
-            print(f"Refining: {html_file.name}")
-            print(f"{'='*60}\n")
-            
-            for pass_num in range(1, num_passes + 1):
-                print(f"  Pass {pass_num:02d}/{num_passes:02d}...", end=" ")
-                success = await generate_refined_visual(page, html_file, pass_num, num_passes)
-                if success:
-                    print("✅")
-                else:
-                    print("❌")
-                await asyncio.sleep(0.5)
+        async with pool_or_launch(pool, size=min(concurrency, len(captures)), setup=ORIGIN.install) as pages:
+            if until_stable:
+                outcomes = await render_until_stable(pages, captures, pass_keys, fresh)
+            else:
+                outcomes = await pages.run(render_pass_job, captures)
         
-        await browser.close()
+        for group, seconds in zip(groups, outcomes):
+            if seconds is None:
+                continue
+            captured = pass_output_path(group[0][0]["html_path"], group[0][1])
+            for source, pass_num, _, key, inputs in group:
+                output_file = pass_output_path(source["html_path"], pass_num)
+                if output_file != captured:
+                    link_output(captured, output_file)
+                cache.record(output_file, key, source["html_path"], inputs, render_params(source), seconds)
+    else:
+        print("♻️  All refinement passes up to date - Chromium not launched")
     
+    cache.save()
+    print(cache.summary())
+    READINESS.print_summary()
     print("\n" + "="*60)
     print("✅ Iterative Refinement Complete")
     print("="*60)
@@ -98,6 +162,13 @@ async def iterative_refinement(num_passes=10):
 
 if __name__ == "__main__":
     import sys
-    num_passes = int(sys.argv[1]) if len(sys.argv) > 1 else 10
-    asyncio.run(iterative_refinement(num_passes))
+    args = [arg for arg in sys.argv[1:] if arg not in ("--force", "--until-stable")]
+    try:
+        concurrency = parse_concurrency(args)
+        num_passes = int(args[0]) if args else 10
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    asyncio.run(iterative_refinement(num_passes, force="--force" in sys.argv, concurrency=concurrency,
+                                     until_stable="--until-stable" in sys.argv))
 
@@ -173,7 +173,7 @@ async function logFromMetadataFile() {
     const metadata = JSON.parse(await fs.readFile(metadataPath, 'utf8'));
 
     const results = {
-      model_type: metadata.model_type || 'xgboost',
+      model_type: metadata.algorithm || metadata.model_type || 'xgboost',
       r2_train: metadata.metrics?.r2_train,
       r2_test: metadata.metrics?.r2_test,
       r2_cv: metadata.metrics?.r2_cv,
@@ -184,7 +184,7 @@ async function logFromMetadataFile() {
       feature_count: metadata.training_data?.feature_count,
       metadata: {
         model_version: metadata.version,
-        training_date: metadata.training_date,
+        training_date: metadata.trainedAt || metadata.training_date,
         hyperparameters: metadata.hyperparameters
       }
     };
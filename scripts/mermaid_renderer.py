@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+BEAST MODE - Mermaid Renderer
+Renders visuals/mermaid/*.mmd offline in one warm page with a vendored Mermaid bundle
+
+The bundle is loaded once; each diagram is then a single `mermaid.render()`
+call that returns SVG, optionally screenshotted as just the diagram element.
+No CDN is contacted, so diagrams render without network access.
+
+Usage: python3 scripts/mermaid_renderer.py [--svg] [--force] [diagram.mmd ...]
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+from playwright.async_api import async_playwright
+from atomic_io import atomic_write_bytes, atomic_write_text
+from render_cache import RenderCache, relative_name, render_key
+from render_readiness import wait_until_ready
+
+BASE_DIR = Path(__file__).parent.parent
+VISUALS_DIR = BASE_DIR / "visuals"
+MERMAID_DIR = VISUALS_DIR / "mermaid"
+DIAGRAMS_DIR = BASE_DIR / "assets" / "diagrams"
+
+# First existing bundle wins: a copy vendored into the repo, then npm installs
+BUNDLE_CANDIDATES = [
+    VISUALS_DIR / "vendor" / "mermaid" / "mermaid.min.js",
+    BASE_DIR / "node_modules" / "mermaid" / "dist" / "mermaid.min.js",
+    BASE_DIR / "node_modules" / "@mermaid-js" / "mermaid-cli" / "node_modules" / "mermaid" / "dist" / "mermaid.min.js",
+]
+
+VIEWPORT = {"width": 1200, "height": 800}
+
+RENDERER_HTML = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"></head>
+<body style="margin: 0; padding: 20px; background: white;">
+    <div id="diagram" style="display: inline-block;"></div>
+</body>
+</html>
+"""
+
+RENDER_SCRIPT = """
+async ({ id, source }) => {
+    try {
+        const { svg } = await mermaid.render(id, source);
+        return svg;
+    } finally {
+        // A failed render leaves its scratch element behind
+        document.getElementById("d" + id)?.remove();
+    }
+}
+"""
+
+SHOW_SCRIPT = "svg => { document.getElementById('diagram').innerHTML = svg; }"
+
+def find_bundle():
+    """Path of the vendored Mermaid bundle, or None"""
+    for candidate in BUNDLE_CANDIDATES:
+        if candidate.is_file():
+            return candidate
+    return None
+
+def require_bundle():
+    bundle = find_bundle()
+    if bundle is None:
+        searched = "\n".join(f"   - {relative_name(path)}" for path in BUNDLE_CANDIDATES)
+        raise FileNotFoundError(
+            f"Mermaid bundle not found. Searched:\n{searched}\n"
+            f"Run `npm install mermaid` or copy dist/mermaid.min.js to {relative_name(BUNDLE_CANDIDATES[0])}"
+        )
+    return bundle
+
+def output_path(mermaid_file, fmt, output_dir=DIAGRAMS_DIR):
+    return Path(output_dir) / f"{Path(mermaid_file).stem}.{fmt}"
+
+def render_params(fmt, theme):
+    return {"renderer": "mermaid", "format": fmt, "theme": theme, **VIEWPORT}
+
+class MermaidRenderer:
+    """A long-lived page with Mermaid initialized; diagrams render one at a time"""
+    
+    def __init__(self, browser, bundle=None, theme="default"):
+        self.browser = browser
+        self.bundle = Path(bundle) if bundle else require_bundle()
+        self.theme = theme
+        self.context = None
+        self.page = None
+        self.counter = 0
+        # mermaid.render() uses global state, so calls must not interleave
+        self.lock = asyncio.Lock()
+    
+    async def start(self):
+        self.context = await self.browser.new_context(viewport=VIEWPORT)
+        self.page = await self.context.new_page()
+        await self.page.set_content(RENDERER_HTML)
+        await self.page.add_script_tag(path=str(self.bundle))
+        await self.page.evaluate(
+            "theme => mermaid.initialize({ startOnLoad: false, theme, securityLevel: 'strict' })",
+            self.theme,
+        )
+        return self
+    
+    async def close(self):
+        if self.context is not None:
+            await self.context.close()
+            self.context = None
+    
+    async def __aenter__(self):
+        return await self.start()
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    async def _render(self, source):
+        self.counter += 1
+        return await self.page.evaluate(RENDER_SCRIPT, {"id": f"mermaid-{self.counter}", "source": source})
+    
+    async def render_svg(self, source):
+        """SVG markup for a Mermaid definition"""
+        async with self.lock:
+            return await self._render(source)
+    
+    async def render_png(self, source):
+        """PNG bytes of just the rendered diagram element"""
+        async with self.lock:
+            svg = await self._render(source)
+            await self.page.evaluate(SHOW_SCRIPT, svg)
+            await wait_until_ready(self.page)
+            return await self.page.locator("#diagram > svg").screenshot(type="png")
+    
+    async def render_file(self, mermaid_file, output_file, fmt="png"):
+        """Render `mermaid_file` to `output_file`; returns render seconds"""
+        start = time.perf_counter()
+        source = Path(mermaid_file).read_text()
+        if fmt == "svg":
+            atomic_write_text(output_file, await self.render_svg(source))
+        else:
+            atomic_write_bytes(output_file, await self.render_png(source))
+        return time.perf_counter() - start
+
+def plan_diagrams(mermaid_files, fmt="png", force=False, output_dir=DIAGRAMS_DIR, cache=None):
+    """(bundle, params, stale diagrams, {file name: True} for the fresh ones) - needs no browser"""
+    bundle = require_bundle()
+    cache = cache or RenderCache()
+    params = render_params(fmt, "default")
+    
+    pending = []
+    results = {}
+    for mermaid_file in mermaid_files:
+        output_file = output_path(mermaid_file, fmt, output_dir)
+        key, inputs = render_key(mermaid_file, params, depends=[bundle])
+        if not force and cache.is_fresh(output_file, key):
+            print(f"♻️  Unchanged: {output_file.name}")
+            results[mermaid_file.name] = True
+        else:
+            pending.append((mermaid_file, output_file, key, inputs))
+    return bundle, params, pending, results
+
+async def render_diagrams(browser, mermaid_files, fmt="png", force=False, output_dir=DIAGRAMS_DIR, cache=None, plan=None):
+    """Render each diagram that changed since its last render; returns {file name: True/False}
+    
+    `browser` is only used when a diagram is stale, so it may be None for a
+    `plan` (from plan_diagrams) with nothing pending.
+    """
+    cache = cache or RenderCache()
+    bundle, params, pending, results = plan or plan_diagrams(mermaid_files, fmt, force, output_dir, cache)
+    if not pending:
+        return results
+    
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    async with MermaidRenderer(browser, bundle=bundle) as renderer:
+        for mermaid_file, output_file, key, inputs in pending:
+            try:
+                seconds = await renderer.render_file(mermaid_file, output_file, fmt)
+            except Exception as e:
+                print(f"❌ {mermaid_file.name}: {e}")
+                results[mermaid_file.name] = False
+                continue
+            cache.record(output_file, key, mermaid_file, inputs, params, seconds)
+            print(f"✅ {output_file.name} ({seconds * 1000:.0f}ms)")
+            results[mermaid_file.name] = True
+    
+    return results
+
+async def main(args):
+    fmt = "svg" if "--svg" in args else "png"
+    files = [Path(arg) for arg in args if not arg.startswith("--")] or sorted(MERMAID_DIR.glob("*.mmd"))
+    
+    print("📊 BEAST MODE Mermaid Renderer\n")
+    print(f"Bundle: {relative_name(require_bundle())}\n")
+    
+    cache = RenderCache()
+    start = time.perf_counter()
+    plan = plan_diagrams(files, fmt, force="--force" in args, cache=cache)
+    _, _, stale, _ = plan
+    if stale:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            results = await render_diagrams(browser, files, fmt, cache=cache, plan=plan)
+            await browser.close()
+    else:
+        results = await render_diagrams(None, files, fmt, cache=cache, plan=plan)
+    cache.save()
+    
+    rendered = sum(results.values())
+    print(f"\n✅ {rendered}/{len(results)} diagram(s) in {time.perf_counter() - start:.1f}s")
+    print(cache.summary())
+    print(f"📁 Diagrams: {DIAGRAMS_DIR}")
+    if rendered < len(results):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main(sys.argv[1:]))
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Model Catalog
+Indexed catalog of trained models in .beast-mode/models/catalog.json
+
+Trainers register each model as it is saved; serving and logging look up
+"latest", "best by metric" or "by feature schema" with a single dict lookup
+instead of listing and sorting model directories (whose names do not sort
+consistently across model-xgboost-* and model-xgboost-improved-*).
+
+Usage: python3 scripts/model_catalog.py [--rebuild] [latest|best <metric>|schema <hash>]
+"""
+
+import json
+import sys
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from atomic_io import atomic_write_json
+from model_metadata import METADATA_FILE, feature_schema_hash, read_metadata, upgrade_metadata
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+MODELS_DIR = Path(__file__).parent.parent / '.beast-mode' / 'models'
+CATALOG_FILE = 'catalog.json'
+CATALOG_VERSION = 1
+
+# Metrics with a precomputed "best" pointer, and whether higher is better
+RANKED_METRICS = {
+    'r2_cv': True,
+    'r2_test': True,
+    'mae': False,
+    'rmse': False,
+}
+
+def build_entry(model_dir, metadata, feature_names=None):
+    """Catalog entry for a saved model directory"""
+    model_dir = Path(model_dir)
+    metadata = upgrade_metadata(metadata, model_dir)
+    feature_names = feature_names or metadata['feature_names']
+    
+    entry_metrics = {}
+    for name in ['r2_train', 'r2_test', 'r2_cv', 'r2_cv_std', 'mae', 'rmse']:
+        if metadata['metrics'].get(name) is not None:
+            entry_metrics[name] = float(metadata['metrics'][name])
+    
+    return {
+        'id': model_dir.name,
+        'algorithm': metadata['algorithm'],
+        'version': metadata['version'],
+        'trained_at': metadata['trainedAt'],
+        'metrics': entry_metrics,
+        'feature_count': len(feature_names) or metadata['training_data']['feature_count'],
+        'feature_schema_hash': feature_schema_hash(feature_names),
+        # Relative to the models directory so the catalog survives moves/checkouts
+        'artifacts': {
+            'model_dir': model_dir.name,
+            'model': f'{model_dir.name}/model.json',
+            'metadata': f'{model_dir.name}/{METADATA_FILE}',
+        },
+    }
+
+def empty_catalog():
+    return {
+        'version': CATALOG_VERSION,
+        'updated_at': None,
+        'models': {},
+        'latest': None,
+        'best': {},
+        'by_schema': {},
+    }
+
+def is_better(candidate, current, metric):
+    """Whether `candidate` beats `current` on `metric` (entries lacking it never win)"""
+    value = candidate['metrics'].get(metric)
+    if value is None:
+        return False
+    if current is None or current['metrics'].get(metric) is None:
+        return True
+    return value > current['metrics'][metric] if RANKED_METRICS[metric] else value < current['metrics'][metric]
+
+def is_newer(candidate, current):
+    if current is None:
+        return True
+    return (candidate['trained_at'] or '') >= (current['trained_at'] or '')
+
+def index_entry(catalog, entry):
+    """Add an entry and update the latest/best/by_schema pointers incrementally"""
+    models = catalog['models']
+    models[entry['id']] = entry
+    
+    if is_newer(entry, models.get(catalog['latest'])):
+        catalog['latest'] = entry['id']
+    
+    for metric in RANKED_METRICS:
+        if is_better(entry, models.get(catalog['best'].get(metric)), metric):
+            catalog['best'][metric] = entry['id']
+    
+    schema = entry['feature_schema_hash']
+    if schema and is_newer(entry, models.get(catalog['by_schema'].get(schema))):
+        catalog['by_schema'][schema] = entry['id']
+
+@contextmanager
+def catalog_lock(models_dir):
+    """Serialize read-modify-write of the catalog across concurrent trainers"""
+    models_dir = Path(models_dir)
+    models_dir.mkdir(parents=True, exist_ok=True)
+    if not HAS_FCNTL:
+        yield
+        return
+    
+    with open(models_dir / f'{CATALOG_FILE}.lock', 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def read_catalog(models_dir=MODELS_DIR):
+    catalog_path = Path(models_dir) / CATALOG_FILE
+    if not catalog_path.exists():
+        return None
+    with open(catalog_path, 'r') as f:
+        catalog = json.load(f)
+    if catalog.get('version') != CATALOG_VERSION:
+        return None
+    return catalog
+
+def scan_model_dirs(models_dir=MODELS_DIR):
+    """Yield (model_dir, metadata) for every model directory (rebuild only)"""
+    models_dir = Path(models_dir)
+    if not models_dir.exists():
+        return
+    
+    for model_dir in sorted(models_dir.iterdir()):
+        if not model_dir.is_dir() or not (model_dir / METADATA_FILE).exists():
+            continue
+        try:
+            yield model_dir, read_metadata(model_dir)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Skipping {model_dir.name}: {e}")
+
+def rebuild_catalog(models_dir=MODELS_DIR):
+    """Rebuild the catalog from a one-off scan of the model directories"""
+    with catalog_lock(models_dir):
+        catalog = empty_catalog()
+        for model_dir, metadata in scan_model_dirs(models_dir):
+            index_entry(catalog, build_entry(model_dir, metadata))
+        catalog['updated_at'] = datetime.now().isoformat()
+        atomic_write_json(Path(models_dir) / CATALOG_FILE, catalog)
+    return catalog
+
+def load_catalog(models_dir=MODELS_DIR, rebuild_if_missing=True):
+    """Load the catalog, building it once from the model directories if absent"""
+    catalog = read_catalog(models_dir)
+    if catalog is None:
+        catalog = rebuild_catalog(models_dir) if rebuild_if_missing else empty_catalog()
+    return catalog
+
+def register_model(model_dir, metadata, feature_names=None, models_dir=None):
+    """Atomically add a freshly saved model to the catalog"""
+    model_dir = Path(model_dir)
+    models_dir = Path(models_dir) if models_dir else model_dir.parent
+    
+    with catalog_lock(models_dir):
+        catalog = read_catalog(models_dir)
+        if catalog is None:
+            catalog = empty_catalog()
+            for existing_dir, existing_metadata in scan_model_dirs(models_dir):
+                if existing_dir.name != model_dir.name:
+                    index_entry(catalog, build_entry(existing_dir, existing_metadata))
+        
+        entry = build_entry(model_dir, metadata, feature_names)
+        index_entry(catalog, entry)
+        catalog['updated_at'] = datetime.now().isoformat()
+        atomic_write_json(models_dir / CATALOG_FILE, catalog)
+    
+    return entry
+
+def artifact_path(entry, artifact='model_dir', models_dir=MODELS_DIR):
+    """Absolute path of a cataloged artifact ('model_dir', 'model' or 'metadata')"""
+    return Path(models_dir) / entry['artifacts'][artifact]
+
+def latest_model(catalog=None):
+    catalog = catalog or load_catalog()
+    return catalog['models'].get(catalog['latest'])
+
+def best_model(metric='r2_cv', catalog=None):
+    if metric not in RANKED_METRICS:
+        raise ValueError(f"Unknown metric '{metric}' (expected one of {', '.join(RANKED_METRICS)})")
+    catalog = catalog or load_catalog()
+    return catalog['models'].get(catalog['best'].get(metric))
+
+def model_for_schema(schema_hash, catalog=None):
+    catalog = catalog or load_catalog()
+    return catalog['models'].get(catalog['by_schema'].get(schema_hash))
+
+def resolve_model_dir(spec, catalog=None):
+    """Resolve 'latest', 'best[:metric]' or 'schema:<hash>' to a model directory; paths pass through"""
+    if spec == 'latest':
+        entry = latest_model(catalog)
+    elif spec == 'best' or spec.startswith('best:'):
+        entry = best_model(spec.split(':', 1)[1] if ':' in spec else 'r2_cv', catalog)
+    elif spec.startswith('schema:'):
+        entry = model_for_schema(spec.split(':', 1)[1], catalog)
+    else:
+        return Path(spec)
+    
+    if entry is None:
+        raise FileNotFoundError(f"No model in catalog for '{spec}'")
+    return artifact_path(entry)
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    
+    if '--rebuild' in args:
+        args.remove('--rebuild')
+        catalog = rebuild_catalog()
+        print(f"✅ Rebuilt catalog with {len(catalog['models'])} model(s)")
+    else:
+        catalog = load_catalog()
+    
+    if not args:
+        print(f"📚 {len(catalog['models'])} model(s) in catalog")
+        print(f"   Latest: {catalog['latest']}")
+        for metric, model_id in catalog['best'].items():
+            print(f"   Best by {metric}: {model_id}")
+        sys.exit(0)
+    
+    query = args[0]
+    if query == 'best':
+        entry = best_model(args[1] if len(args) > 1 else 'r2_cv', catalog)
+    elif query == 'schema':
+        entry = model_for_schema(args[1], catalog)
+    else:
+        entry = latest_model(catalog)
+    
+    print(json.dumps(entry, indent=2))
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Model Metadata Schema
+Versioned, validated model-metadata.json format shared by all trainers
+
+Every trainer writes metadata through write_metadata(), and serving, logging
+and the model catalog read it through read_metadata(), which also upgrades
+the older per-trainer layouts (r2_cv_mean, model_type/training_date,
+training_size, top_features) so no reader silently falls back to zeros.
+"""
+
+import hashlib
+import json
+import math
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from atomic_io import atomic_write_json
+
+SCHEMA_VERSION = 2
+METADATA_FILE = 'model-metadata.json'
+
+REQUIRED_METRICS = ['r2_train', 'r2_test', 'r2_cv', 'mae', 'rmse']
+
+def feature_schema_hash(feature_names):
+    """Stable hash of the ordered feature names a model expects"""
+    if not feature_names:
+        return None
+    return hashlib.sha256(json.dumps(list(feature_names)).encode()).hexdigest()[:16]
+
+class MetadataError(ValueError):
+    """Raised when model metadata does not match the schema"""
+
+class PhaseTimer:
+    """Collects wall-clock seconds per training phase"""
+    
+    def __init__(self):
+        self.seconds = {}
+    
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] = self.seconds.get(name, 0.0) + time.perf_counter() - start
+    
+    def as_timing(self, train_size=None):
+        """Timing block for the metadata, including training throughput"""
+        timing = {f'{name}_seconds': round(value, 4) for name, value in self.seconds.items()}
+        timing['total_seconds'] = round(sum(self.seconds.values()), 4)
+        if train_size and self.seconds.get('train'):
+            timing['samples_per_second'] = round(train_size / self.seconds['train'], 2)
+        return timing
+
+def build_metadata(algorithm, version, metrics, feature_names, dataset_size,
+                   train_size=None, test_size=None, feature_importance=None,
+                   hyperparameters=None, timing=None, trained_at=None):
+    """Build (and validate) schema v2 metadata"""
+    feature_names = [str(name) for name in feature_names]
+    
+    metadata = {
+        'schema_version': SCHEMA_VERSION,
+        'algorithm': algorithm,
+        'version': version,
+        'trainedAt': (trained_at or datetime.now()).isoformat(),
+        'metrics': {name: float(value) for name, value in metrics.items() if value is not None},
+        'training_data': {
+            'size': int(dataset_size),
+            'train_size': int(train_size) if train_size is not None else None,
+            'test_size': int(test_size) if test_size is not None else None,
+            'feature_count': len(feature_names),
+        },
+        'feature_names': feature_names,
+        'feature_schema_hash': feature_schema_hash(feature_names),
+        'feature_importance': [[name, float(value)] for name, value in (feature_importance or [])],
+        'hyperparameters': hyperparameters or {},
+        'timing': timing or {},
+    }
+    
+    validate_metadata(metadata)
+    return metadata
+
+def validate_metadata(metadata):
+    """Raise MetadataError listing every way `metadata` violates the schema"""
+    problems = []
+    
+    if metadata.get('schema_version') != SCHEMA_VERSION:
+        problems.append(f"schema_version must be {SCHEMA_VERSION}")
+    for key in ['algorithm', 'trainedAt']:
+        if not metadata.get(key):
+            problems.append(f"missing {key}")
+    
+    metrics = metadata.get('metrics', {})
+    for name in REQUIRED_METRICS:
+        value = metrics.get(name)
+        if not isinstance(value, (int, float)) or not math.isfinite(value):
+            problems.append(f"metrics.{name} must be a finite number (got {value!r})")
+    
+    training_data = metadata.get('training_data', {})
+    if not isinstance(training_data.get('size'), int) or training_data['size'] <= 0:
+        problems.append("training_data.size must be a positive integer")
+    
+    feature_names = metadata.get('feature_names')
+    if not feature_names:
+        problems.append("feature_names must be a non-empty list")
+    elif training_data.get('feature_count') != len(feature_names):
+        problems.append("training_data.feature_count does not match feature_names")
+    elif metadata.get('feature_schema_hash') != feature_schema_hash(feature_names):
+        problems.append("feature_schema_hash does not match feature_names")
+    
+    if problems:
+        raise MetadataError('Invalid model metadata: ' + '; '.join(problems))
+
+def parse_timestamp(value):
+    """ISO timestamp from ISO strings or the %Y-%m-%dT%H-%M-%S directory format"""
+    if not value:
+        return None
+    for fmt in (None, '%Y-%m-%dT%H-%M-%S'):
+        try:
+            parsed = datetime.fromisoformat(value) if fmt is None else datetime.strptime(value, fmt)
+            return parsed.isoformat()
+        except (TypeError, ValueError):
+            continue
+    return None
+
+def upgrade_metadata(raw, model_dir=None):
+    """Normalize any metadata layout to schema v2 field names (without validating)
+
+    Legacy files keep whatever they lack (e.g. feature names) as empty values.
+    """
+    if raw.get('schema_version') == SCHEMA_VERSION:
+        return raw
+    
+    metrics = dict(raw.get('metrics', {}))
+    if 'r2_cv' not in metrics and 'r2_cv_mean' in metrics:
+        metrics['r2_cv'] = metrics.pop('r2_cv_mean')
+    
+    feature_names = raw.get('feature_names') or []
+    feature_count = len(feature_names) or raw.get('features') or raw.get('training_data', {}).get('feature_count')
+    # Legacy improved-trainer files carry a hardcoded training_size of 500, not
+    # the real count, so their size is unknown
+    size = raw.get('training_data', {}).get('size')
+    
+    trained_at = parse_timestamp(raw.get('trainedAt') or raw.get('trained_at') or raw.get('training_date'))
+    if trained_at is None and model_dir is not None:
+        trained_at = parse_timestamp(Path(model_dir).name[-19:])
+    
+    return {
+        'schema_version': raw.get('schema_version', 1),
+        'algorithm': raw.get('algorithm') or raw.get('model_type') or 'xgboost',
+        'version': raw.get('version'),
+        'trainedAt': trained_at,
+        'metrics': metrics,
+        'training_data': {
+            'size': size,
+            'train_size': raw.get('training_data', {}).get('train_size'),
+            'test_size': raw.get('training_data', {}).get('test_size'),
+            'feature_count': feature_count,
+        },
+        'feature_names': feature_names,
+        'feature_schema_hash': feature_schema_hash(feature_names),
+        'feature_importance': raw.get('feature_importance') or raw.get('top_features') or [],
+        'hyperparameters': raw.get('hyperparameters', {}),
+        'timing': raw.get('timing', {}),
+    }
+
+# (path, mtime_ns, size) -> upgraded metadata; serving and logging re-read the
+# same file many times per process
+_metadata_cache = {}
+
+def read_metadata(model_dir_or_file):
+    """Read model metadata (schema v2 field names) from a model dir or metadata file"""
+    path = Path(model_dir_or_file)
+    if path.is_dir():
+        path = path / METADATA_FILE
+    
+    stat = path.stat()
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    cached = _metadata_cache.get(key)
+    if cached is not None:
+        return cached
+    
+    with open(path, 'rb') as f:
+        metadata = upgrade_metadata(json.loads(f.read()), path.parent)
+    
+    _metadata_cache[key] = metadata
+    return metadata
+
+def write_metadata(model_dir, metadata):
+    """Validate and atomically write metadata into a model directory"""
+    validate_metadata(metadata)
+    return atomic_write_json(Path(model_dir) / METADATA_FILE, metadata)
@@ -6,15 +6,25 @@ Called by Node.js to make predictions
 
 import json
 import sys
-import xgboost as xgb
-import numpy as np
-from pathlib import Path
+
+from model_catalog import resolve_model_dir
+from model_metadata import METADATA_FILE, read_metadata
+
+# xgboost and numpy are imported lazily inside the functions that need them:
+# this script is spawned once per prediction by predict-xgboost.js, so usage
+# errors and malformed features should fail before paying their import cost.
 
 def load_model_and_metadata(model_dir):
-    """Load XGBoost model and metadata"""
-    model_dir = Path(model_dir)
+    """Load XGBoost model and metadata
+    
+    model_dir may also be 'latest', 'best[:metric]' or 'schema:<hash>',
+    resolved through the model catalog.
+    """
+    import xgboost as xgb
+    
+    model_dir = resolve_model_dir(str(model_dir))
     model_path = model_dir / 'model.json'
-    metadata_path = model_dir / 'model-metadata.json'
+    metadata_path = model_dir / METADATA_FILE
     
     if not model_path.exists():
         raise FileNotFoundError(f"Model file not found: {model_path}")
@@ -23,16 +33,17 @@ def load_model_and_metadata(model_dir):
     model = xgb.Booster()
     model.load_model(str(model_path))
     
-    # Load metadata
+    # Load metadata (normalized to the shared schema)
     metadata = {}
     if metadata_path.exists():
-        with open(metadata_path, 'r') as f:
-            metadata = json.load(f)
+        metadata = read_metadata(metadata_path)
     
     return model, metadata
 
 def normalize_features(features, metadata):
     """Normalize features using stored normalization params"""
+    import numpy as np
+    
     # For now, we'll use the feature names from metadata
     # In production, you'd want to store normalization params
     feature_names = metadata.get('feature_names', [])
@@ -45,9 +56,11 @@ def normalize_features(features, metadata):
 def predict(features_json, model_dir):
     """Make prediction"""
     try:
-        # Parse features
+        # Parse features before importing xgboost so bad input fails fast
         features = json.loads(features_json)
         
+        import xgboost as xgb
+        
         # Load model
         model, metadata = load_model_and_metadata(model_dir)
         
@@ -67,7 +80,7 @@ def predict(features_json, model_dir):
 
 if __name__ == '__main__':
     if len(sys.argv) < 3:
-        print(json.dumps({'error': 'Usage: python3 predict_xgboost.py <model-dir> <features-json>'}))
+        print(json.dumps({'error': 'Usage: python3 predict_xgboost.py <model-dir|latest|best> <features-json>'}))
         sys.exit(1)
     
     model_dir = sys.argv[1]
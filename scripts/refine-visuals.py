@@ -6,8 +6,14 @@ Generate multiple passes to perfect brand consistency
 
 import asyncio
 import os
+import time
 from pathlib import Path
-from playwright.async_api import async_playwright
+from atomic_io import atomic_write_bytes
+from render_cache import RenderCache, group_by_key, link_output, render_key
+from render_pool import DEFAULT_CONCURRENCY, parse_concurrency, pool_or_launch
+from render_readiness import REPORT as READINESS, wait_until_ready
+from virtual_origin import SHARED_ORIGIN as ORIGIN
+from visual_manifest import load_assets
 import json
 
 BASE_DIR = Path(__file__).parent.parent
@@ -38,130 +44,102 @@ BRAND_COLORS = {
     }
 }
 
-# Visual assets to refine
-VISUAL_ASSETS = [
-    {
-        "name": "governance-layer",
-        "html": "governance-layer-infographic.html",
-        "output": "governance-layer-architecture.png",
-        "width": 1600,
-        "height": 1000,
-        "brand": "beast_mode",
-        "focus": ["shield glow", "particle flow", "diamond output"]
-    },
-    {
-        "name": "mullet-strategy",
-        "html": "mullet-strategy-infographic.html",
-        "output": "mullet-strategy-dual-brand.png",
-        "width": 1600,
-        "height": 1200,
-        "brand": "both",
-        "focus": ["lightning bolt", "color contrast", "split balance"]
-    },
-    {
-        "name": "before-after",
-        "html": "before-after-infographic.html",
-        "output": "before-after-transformation.png",
-        "width": 1800,
-        "height": 1000,
-        "brand": "beast_mode",
-        "focus": ["diff styling", "glitch effects", "bridge arrow"]
-    },
-    {
-        "name": "overnight-cycle",
-        "html": "overnight-cycle-infographic.html",
-        "output": "overnight-refactoring-cycle.png",
-        "width": 1400,
-        "height": 1200,
-        "brand": "beast_mode",
-        "focus": ["clock glow", "segment colors", "center clock"]
-    },
-    {
-        "name": "tech-stack",
-        "html": "tech-stack-infographic.html",
-        "output": "market-positioning-map.png",
-        "width": 1600,
-        "height": 1000,
-        "brand": "both",
-        "focus": ["layer glow", "governance prominence", "stack balance"]
-    },
-    {
-        "name": "three-walls",
-        "html": "three-walls-infographic.html",
-        "output": "three-walls-solution-map.png",
-        "width": 1800,
-        "height": 1200,
-        "brand": "beast_mode",
-        "focus": ["wall icons", "solution bridges", "status badges"]
-    },
-    {
-        "name": "english-source-code",
-        "html": "english-source-code-infographic.html",
-        "output": "english-as-source-code-workflow.png",
-        "width": 1800,
-        "height": 1000,
-        "brand": "beast_mode",
-        "focus": ["story flow", "step cards", "connecting line"]
-    }
-]
+def pass_output_path(asset, pass_num):
+    return REFINEMENT_DIR / f"{asset['name']}-pass-{pass_num:02d}.png"
+
+def render_params(source):
+    return {"width": source["width"], "height": source["height"], "full_page": True, "type": "png"}
 
 async def generate_refinement_pass(page, asset, pass_num):
     """Generate a refinement pass"""
-    html_file = HTML_DIR / asset["html"]
-    output_file = REFINEMENT_DIR / f"{asset['name']}-pass-{pass_num:02d}.png"
-    
-    if not html_file.exists():
-        print(f"⚠️  {asset['html']} not found")
-        return False
+    source = asset["source"]
+    output_file = pass_output_path(asset, pass_num)
     
     try:
-        file_url = html_file.as_uri()
-        await page.goto(file_url, wait_until="networkidle")
-        await page.set_viewport_size({"width": asset["width"], "height": asset["height"]})
-        await asyncio.sleep(1.5)  # Wait for animations
+        await page.goto(ORIGIN.url_for(source["html_path"]), wait_until="networkidle")
+        await page.set_viewport_size({"width": source["width"], "height": source["height"]})
+        waited = await wait_until_ready(page)  # was 1.5s + 0.5s of fixed sleeps
         
-        await page.screenshot(
-            path=str(output_file),
-            full_page=True,
-            type="png"
-        )
+        # Written by rename so passes hardlinked to this file keep their image
+        atomic_write_bytes(output_file, await page.screenshot(full_page=True, type="png"))
         
-        print(f"✅ Pass {pass_num:02d}: {output_file.name}")
+        print(f"✅ {asset['name']} pass {pass_num:02d}: {output_file.name} {READINESS.record(output_file.name, waited, fixed_delay=2.0)}")
         return True
     except Exception as e:
-        print(f"❌ Pass {pass_num:02d} failed: {e}")
+        print(f"❌ {asset['name']} pass {pass_num:02d} failed: {e}")
         return False
 
-async def refine_all_visuals(num_passes=10):
-    """Generate multiple refinement passes for all visuals"""
+async def render_pass_job(page, job):
+    """Render one (asset, pass) job; returns render seconds, or None on failure"""
+    asset, pass_num = job
+    start = time.perf_counter()
+    if not await generate_refinement_pass(page, asset, pass_num):
+        return None
+    return time.perf_counter() - start
+
+async def refine_all_visuals(num_passes=10, force=False, concurrency=DEFAULT_CONCURRENCY, pool=None, assets=None):
+    """Generate multiple refinement passes for all visuals (on `pool` if one is shared)"""
     print("🎨 BEAST MODE Visual Refinement System\n")
     print(f"Generating {num_passes} passes for each visual...\n")
     
     results = {}
     
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
+    # Passes whose HTML, CSS and viewport are unchanged are reused as-is, so a
+    # CSS edit only re-renders the assets that depend on that stylesheet
+    cache = RenderCache()
+    keys = {}
+    stale = []
+    for asset in assets or load_assets():
+        results[asset['name']] = {
+            "success": 0,
+            "total": num_passes,
+            "passes": [False] * num_passes
+        }
+        
+        source = asset["source"]
+        if source is None:
+            print(f"⚠️  {asset['html']} not found")
+            continue
+        
+        keys[asset['name']] = render_key(source["html_path"], render_params(source), depends=source["depends"])
+        for pass_num in range(1, num_passes + 1):
+            if not force and cache.is_fresh(pass_output_path(asset, pass_num), keys[asset['name']][0]):
+                results[asset['name']]["passes"][pass_num - 1] = True
+            else:
+                stale.append((asset, pass_num))
+    
+    if stale:
+        for asset in {asset['name']: asset for asset, _ in stale}.values():
+            print(f"Refining: {asset['name']} (focus: {', '.join(asset['focus'])})")
+        print()
+        
+        # Passes with byte-identical inputs render identically: capture the
+        # first of each group and hardlink the rest to it
+        groups = list(group_by_key(stale, lambda job: keys[job[0]['name']][0]).values())
+        captures = [group[0] for group in groups]
+        print(f"📸 {len(captures)} capture(s) for {len(stale)} pass(es)\n")
         
-        for asset in VISUAL_ASSETS:
-            print(f"\n{'='*60}")
-            print(f"Refining: {asset['name']}")
-            print(f"Focus areas: {', '.join(asset['focus'])}")
-            print(f"{'='*60}\n")
-            
-            asset_results = []
-            for pass_num in range(1, num_passes + 1):
-                success = await generate_refinement_pass(page, asset, pass_num)
-                asset_results.append(success)
-                await asyncio.sleep(0.5)  # Small delay between passes
-            
-            results[asset['name']] = {
-                "success": sum(asset_results),
-                "total": num_passes,
-                "passes": asset_results
-            }
+        async with pool_or_launch(pool, size=min(concurrency, len(captures)), setup=ORIGIN.install) as pages:
+            outcomes = await pages.run(render_pass_job, captures)
         
-        await browser.close()
+        for group, seconds in zip(groups, outcomes):
+            if seconds is None:
+                continue
+            captured = pass_output_path(*group[0])
+            for asset, pass_num in group:
+                output_file = pass_output_path(asset, pass_num)
+                if output_file != captured:
+                    link_output(captured, output_file)
+                results[asset['name']]["passes"][pass_num - 1] = True
+                key, inputs = keys[asset['name']]
+                cache.record(output_file, key, asset["source"]["html_path"], inputs,
+                             render_params(asset["source"]), seconds)
+    else:
+        print("♻️  All refinement passes up to date - Chromium not launched")
+    
+    cache.save()
+    for result in results.values():
+        result["success"] = sum(result["passes"])
     
     # Summary
     print("\n" + "="*60)
@@ -172,6 +150,8 @@ async def refine_all_visuals(num_passes=10):
         success_rate = (result["success"] / result["total"]) * 100
         print(f"{asset_name}: {result['success']}/{result['total']} passes ({success_rate:.0f}%)")
     
+    READINESS.print_summary()
+    print(cache.summary())
     print(f"\n📁 Refinement passes saved to: {REFINEMENT_DIR}")
     print("\n💡 Next steps:")
     print("   1. Review all passes for each visual")
@@ -181,6 +161,12 @@ async def refine_all_visuals(num_passes=10):
 
 if __name__ == "__main__":
     import sys
-    num_passes = int(sys.argv[1]) if len(sys.argv) > 1 else 10
-    asyncio.run(refine_all_visuals(num_passes))
+    args = [arg for arg in sys.argv[1:] if arg != "--force"]
+    try:
+        concurrency = parse_concurrency(args)
+        num_passes = int(args[0]) if args else 10
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    asyncio.run(refine_all_visuals(num_passes, force="--force" in sys.argv, concurrency=concurrency))
 
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+BEAST MODE - Render Orchestrator
+Runs the visual pipeline stages in one process on one warm Chromium
+
+Stages share a single browser, one pool of browser contexts and one load of
+visuals/assets.json, so running refine → render → compare back to back pays
+browser startup once instead of once per script.
+
+Stages:
+  refine   in-memory brand refinement passes (iterative-refinement.py)
+  passes   source-HTML refinement passes (refine-visuals.py)
+  render   final assets (generate-visuals.py)
+  compare  pass diffs and summary (image_diff.py; needs numpy and Pillow)
+
+Usage: python3 scripts/render-orchestrator.py [--stages refine,render,compare] [--passes N]
+       [--concurrency N] [--force] [--until-stable] [--mermaid]
+"""
+
+import asyncio
+import sys
+import time
+
+from playwright.async_api import async_playwright
+from image_diff import HAS_IMAGING, diff_refinements
+from render_pool import PagePool, parse_concurrency
+from script_loader import load_script
+from virtual_origin import SHARED_ORIGIN
+from visual_manifest import load_assets
+
+iterative = load_script("iterative-refinement.py")
+refine_visuals = load_script("refine-visuals.py")
+generate_visuals = load_script("generate-visuals.py")
+
+STAGES = ["refine", "passes", "render", "compare"]
+DEFAULT_STAGES = ["refine", "render", "compare"]
+
+def parse_args(args):
+    concurrency = parse_concurrency(args)
+    stages = DEFAULT_STAGES
+    if "--stages" in args:
+        stages = args[args.index("--stages") + 1].split(",")
+        unknown = [stage for stage in stages if stage not in STAGES]
+        if unknown:
+            raise ValueError(f"Unknown stage(s): {', '.join(unknown)} (choose from {', '.join(STAGES)})")
+    num_passes = int(args[args.index("--passes") + 1]) if "--passes" in args else 10
+    return stages, num_passes, concurrency
+
+async def run_stage(stage, pool, assets, num_passes, concurrency, args):
+    force = "--force" in args
+    if stage == "refine":
+        await iterative.iterative_refinement(num_passes, force=force, concurrency=concurrency,
+                                             until_stable="--until-stable" in args, pool=pool, assets=assets)
+    elif stage == "passes":
+        await refine_visuals.refine_all_visuals(num_passes, force=force, concurrency=concurrency, pool=pool, assets=assets)
+    elif stage == "render":
+        await generate_visuals.generate_all_visuals(concurrency, force=force, mermaid="--mermaid" in args,
+                                                    outputs=generate_visuals.parse_outputs(args), pool=pool, assets=assets)
+    elif stage == "compare":
+        if not HAS_IMAGING:
+            print("⚠️  compare skipped: needs numpy and Pillow")
+            return
+        diff_refinements(assets=assets)
+
+async def orchestrate(stages, num_passes, concurrency, args):
+    print("🎬 BEAST MODE Render Orchestrator\n")
+    print(f"Stages: {' → '.join(stages)}\n")
+    
+    assets = load_assets()
+    timings = {}
+    
+    async with async_playwright() as p:
+        start = time.perf_counter()
+        browser = await p.chromium.launch(headless=True)
+        timings["launch"] = time.perf_counter() - start
+        
+        # Every stage navigates through the shared virtual origin, so its file cache stays warm
+        async with PagePool(browser, size=concurrency, setup=SHARED_ORIGIN.install) as pool:
+            for stage in stages:
+                print("\n" + "="*60)
+                print(f"▶️  {stage}")
+                print("="*60 + "\n")
+                start = time.perf_counter()
+                await run_stage(stage, pool, assets, num_passes, concurrency, args)
+                timings[stage] = time.perf_counter() - start
+        
+        await browser.close()
+    
+    print("\n" + "="*60)
+    print("🎬 Orchestration Summary")
+    print("="*60)
+    for name, seconds in timings.items():
+        print(f"   {name:<8} {seconds:>7.2f}s")
+    print(f"   {'total':<8} {sum(timings.values()):>7.2f}s (one browser launch)")
+    print(SHARED_ORIGIN.summary())
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    try:
+        stages, num_passes, concurrency = parse_args(args)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    asyncio.run(orchestrate(stages, num_passes, concurrency, args))
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+BEAST MODE - Render Cache
+Content-addressed cache of rendered screenshots, recorded in assets/render-manifest.json
+
+A render key hashes the HTML, every local file it references (stylesheets,
+images, fonts, and anything those stylesheets reference in turn) and the
+render parameters. When the key of an output matches the manifest and the
+file still exists, the screenshot is reused without launching Chromium.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+from atomic_io import atomic_write_json
+
+BASE_DIR = Path(__file__).parent.parent
+ASSETS_DIR = BASE_DIR / "assets"
+MANIFEST_PATH = ASSETS_DIR / "render-manifest.json"
+MANIFEST_VERSION = 1
+
+# Bump when capture behaviour changes (readiness waits, screenshot options)
+RENDER_VERSION = 1
+
+HTML_REFERENCE = re.compile(r"""(?:href|src)\s*=\s*["']([^"']+)["']""", re.IGNORECASE)
+CSS_REFERENCE = re.compile(r"""url\(\s*["']?([^"')]+)["']?\s*\)|@import\s+["']([^"']+)["']""", re.IGNORECASE)
+
+# path -> (mtime_ns, size, sha256); shared stylesheets are hashed once per run
+_file_digests = {}
+
+def file_digest(path):
+    stat = path.stat()
+    cached = _file_digests.get(path)
+    if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+    digest = hashlib.sha256(path.read_bytes()).hexdigest()
+    _file_digests[path] = (stat.st_mtime_ns, stat.st_size, digest)
+    return digest
+
+def local_reference(base_dir, ref):
+    """Resolve a relative URL against `base_dir`; None for remote/inline URLs"""
+    parts = urlsplit(ref.strip())
+    if parts.scheme or parts.netloc or not parts.path:
+        return None
+    return (base_dir / unquote(parts.path)).resolve()
+
+def referenced_files(text, base_dir, pattern):
+    for match in pattern.finditer(text):
+        ref = next(group for group in match.groups() if group)
+        path = local_reference(base_dir, ref)
+        if path is not None:
+            yield path
+
+def render_inputs(html_path, html_text=None):
+    """Local files an HTML document depends on (including nested CSS references)"""
+    html_path = Path(html_path).resolve()
+    if html_text is None:
+        html_text = html_path.read_text()
+    
+    inputs = []
+    pending = list(referenced_files(html_text, html_path.parent, HTML_REFERENCE))
+    while pending:
+        path = pending.pop()
+        if path in inputs:
+            continue
+        inputs.append(path)
+        if path.suffix == ".css" and path.is_file():
+            pending.extend(referenced_files(path.read_text(), path.parent, CSS_REFERENCE))
+    
+    return sorted(inputs)
+
+def relative_name(path):
+    try:
+        return str(Path(path).resolve().relative_to(BASE_DIR.resolve()))
+    except ValueError:
+        return str(path)
+
+def render_key(html_path, params, html_text=None, depends=()):
+    """Hash of the HTML, its local dependencies and the render parameters
+
+    Pass `html_text` when the document is rendered from memory rather than
+    from `html_path` (e.g. a refinement pass); references still resolve
+    relative to `html_path`. `depends` adds files the HTML does not link
+    directly (e.g. partials declared in visuals/assets.json).
+    """
+    html_path = Path(html_path)
+    html_bytes = html_path.read_bytes() if html_text is None else html_text.encode()
+    
+    digest = hashlib.sha256()
+    digest.update(json.dumps({"render_version": RENDER_VERSION, "params": params}, sort_keys=True).encode())
+    digest.update(hashlib.sha256(html_bytes).digest())
+    
+    inputs = render_inputs(html_path, html_bytes.decode("utf-8", errors="replace"))
+    inputs = sorted(set(inputs) | {Path(path).resolve() for path in depends})
+    for path in inputs:
+        digest.update(relative_name(path).encode())
+        digest.update(file_digest(path).encode() if path.is_file() else b"missing")
+    
+    return digest.hexdigest(), [relative_name(path) for path in inputs]
+
+def group_by_key(jobs, key_of):
+    """Group jobs by render key, keeping job order; each group needs only one capture"""
+    groups = {}
+    for job in jobs:
+        groups.setdefault(key_of(job), []).append(job)
+    return groups
+
+def link_output(source, target):
+    """Hardlink `target` to an already rendered `source` (copy where links are unsupported)
+
+    Renderers replace outputs by rename rather than writing in place, so a
+    later re-render of one linked output never changes the others.
+    """
+    source, target = Path(source), Path(target)
+    target.unlink(missing_ok=True)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
+
+class RenderCache:
+    """Manifest of rendered outputs keyed by output path"""
+    
+    def __init__(self, manifest_path=MANIFEST_PATH):
+        self.manifest_path = Path(manifest_path)
+        self.manifest = self.load()
+        self.hits = 0
+        self.misses = 0
+    
+    def load(self):
+        if self.manifest_path.exists():
+            try:
+                with open(self.manifest_path, "r") as f:
+                    manifest = json.load(f)
+                if manifest.get("version") == MANIFEST_VERSION:
+                    return manifest
+            except ValueError:
+                pass
+        return {"version": MANIFEST_VERSION, "outputs": {}}
+    
+    def is_fresh(self, output_path, key):
+        """Whether `output_path` exists and was rendered from inputs hashing to `key`"""
+        entry = self.manifest["outputs"].get(relative_name(output_path))
+        fresh = entry is not None and entry["key"] == key and Path(output_path).exists()
+        if fresh:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return fresh
+    
+    def record(self, output_path, key, source, inputs, params, render_seconds):
+        self.manifest["outputs"][relative_name(output_path)] = {
+            "key": key,
+            "source": relative_name(source),
+            "inputs": inputs,
+            "params": params,
+            "output_sha256": file_digest(Path(output_path).resolve()),
+            "render_seconds": round(render_seconds, 3),
+            "rendered_at": datetime.now().isoformat(),
+        }
+    
+    def save(self):
+        self.manifest["updated_at"] = datetime.now().isoformat()
+        atomic_write_json(self.manifest_path, self.manifest)
+    
+    def summary(self):
+        return f"♻️  Render cache: {self.hits} hit(s), {self.misses} miss(es)"
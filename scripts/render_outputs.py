@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+BEAST MODE - Render Outputs
+Derives size and format variants of an asset from the page it was rendered in
+
+Hi-DPI variants and the PDF are captured from the already loaded page by
+overriding the device scale factor, so nothing is navigated twice. WebP/AVIF
+encodings and thumbnails are made from the captured PNG in worker processes,
+off the browser's critical path. Encodings need Pillow; without it only the
+browser-made variants are produced.
+"""
+
+import asyncio
+import io
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from atomic_io import atomic_write_bytes
+from render_readiness import wait_until_ready
+
+try:
+    from PIL import Image
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
+
+DEFAULT_OUTPUTS = {
+    "scales": [2],
+    "formats": ["webp"],
+    "thumbnails": [480],
+    "pdf": False,
+}
+
+ENCODE_OPTIONS = {
+    "webp": {"quality": 90, "method": 6},
+    "avif": {"quality": 70},
+    "png": {"optimize": True},
+}
+
+def variant_path(output_path, suffix="", ext=None):
+    """`foo.png` -> `foo{suffix}.{ext}` next to it (e.g. foo@2x.png, foo.webp)"""
+    output_path = Path(output_path)
+    return output_path.with_name(f"{output_path.stem}{suffix}{'.' + ext if ext else output_path.suffix}")
+
+def planned_variants(output_path, outputs=DEFAULT_OUTPUTS):
+    """Every file the outputs spec derives from `output_path`"""
+    paths = [variant_path(output_path, f"@{scale}x") for scale in outputs["scales"]]
+    if HAS_PIL:
+        paths += [variant_path(output_path, ext=fmt) for fmt in outputs["formats"]]
+        paths += [variant_path(output_path, f"-thumb-{width}") for width in outputs["thumbnails"]]
+    if outputs["pdf"]:
+        paths.append(variant_path(output_path, ext="pdf"))
+    return paths
+
+async def capture_scales(page, output_path, width, height, scales):
+    """Screenshot the loaded page at each device scale factor; returns the written paths"""
+    cdp = await page.context.new_cdp_session(page)
+    written = []
+    try:
+        for scale in scales:
+            await cdp.send("Emulation.setDeviceMetricsOverride", {
+                "width": width,
+                "height": height,
+                "deviceScaleFactor": scale,
+                "mobile": False,
+            })
+            await wait_until_ready(page)
+            path = variant_path(output_path, f"@{scale}x")
+            atomic_write_bytes(path, await page.screenshot(full_page=True, type="png"))
+            written.append(path)
+    finally:
+        await cdp.send("Emulation.clearDeviceMetricsOverride")
+        await cdp.detach()
+    return written
+
+async def capture_pdf(page, output_path, width, height):
+    path = variant_path(output_path, ext="pdf")
+    atomic_write_bytes(path, await page.pdf(width=f"{width}px", height=f"{height}px", print_background=True))
+    return path
+
+def encode_variant(source_path, target_path, fmt, max_width=None):
+    """Re-encode `source_path` as `fmt`, optionally downscaled to `max_width` (runs in a worker)"""
+    with Image.open(source_path) as image:
+        if max_width and image.width > max_width:
+            image = image.resize((max_width, round(image.height * max_width / image.width)), Image.LANCZOS)
+        if fmt in ("webp", "avif") and image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA")
+        buffer = io.BytesIO()
+        image.save(buffer, format=fmt.upper(), **ENCODE_OPTIONS.get(fmt, {}))
+    atomic_write_bytes(target_path, buffer.getvalue())
+    return str(target_path)
+
+class VariantEncoder:
+    """Process pool that turns captured PNGs into encoded variants in the background"""
+    
+    def __init__(self, outputs=DEFAULT_OUTPUTS, workers=None):
+        self.outputs = outputs
+        # spawn, not fork: the pool starts lazily, after Playwright's driver and
+        # event-loop threads exist in this process, and a fork would copy them
+        context = multiprocessing.get_context("spawn")
+        self.executor = ProcessPoolExecutor(max_workers=workers, mp_context=context) if HAS_PIL else None
+        self.pending = []
+    
+    def submit(self, output_path):
+        """Queue the encodings of a freshly written PNG; returns immediately"""
+        if self.executor is None:
+            return
+        loop = asyncio.get_running_loop()
+        jobs = [(variant_path(output_path, ext=fmt), fmt, None) for fmt in self.outputs["formats"]]
+        jobs += [(variant_path(output_path, f"-thumb-{width}"), "png", width) for width in self.outputs["thumbnails"]]
+        for target, fmt, max_width in jobs:
+            future = loop.run_in_executor(self.executor, encode_variant, str(output_path), str(target), fmt, max_width)
+            self.pending.append((target, future))
+    
+    async def wait(self):
+        """Wait for queued encodings; returns (written paths, {path: error})"""
+        written, failed = [], {}
+        for target, future in self.pending:
+            try:
+                written.append(Path(await future))
+            except Exception as e:
+                failed[target] = e
+        self.pending = []
+        return written, failed
+    
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+
+async def capture_variants(page, output_path, width, height, outputs=DEFAULT_OUTPUTS, encoder=None):
+    """Browser-side variants of the page `output_path` was just captured from, then queue encodings"""
+    written = await capture_scales(page, output_path, width, height, outputs["scales"])
+    if outputs["pdf"]:
+        written.append(await capture_pdf(page, output_path, width, height))
+    if encoder is not None:
+        encoder.submit(output_path)
+    return written
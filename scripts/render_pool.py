@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+BEAST MODE - Render Page Pool
+Bounded pool of Playwright pages (one browser context each) for concurrent rendering
+"""
+
+import asyncio
+import os
+from contextlib import asynccontextmanager
+
+from playwright.async_api import async_playwright
+
+DEFAULT_CONCURRENCY = min(4, os.cpu_count() or 1)
+
+def parse_concurrency(args, default=DEFAULT_CONCURRENCY):
+    """Read `--concurrency N` from an argument list (removing it), else `default`"""
+    if "--concurrency" not in args:
+        return default
+    
+    index = args.index("--concurrency")
+    try:
+        value = int(args[index + 1])
+    except (IndexError, ValueError):
+        raise ValueError("--concurrency expects a positive integer")
+    if value < 1:
+        raise ValueError("--concurrency expects a positive integer")
+    
+    del args[index:index + 2]
+    return value
+
+class PagePool:
+    """Hands out at most `size` pages at a time, each in its own browser context
+
+    `setup`, if given, is awaited with each new context (e.g. to install routes).
+    """
+    
+    def __init__(self, browser, size=DEFAULT_CONCURRENCY, setup=None, **context_options):
+        self.browser = browser
+        self.size = max(1, size)
+        self.setup = setup
+        self.context_options = context_options
+        self.contexts = []
+        self.idle = asyncio.Queue()
+    
+    async def start(self):
+        # Contexts are isolated (cookies, cache, viewport), so concurrent
+        # renders cannot leak state into each other
+        for _ in range(self.size):
+            context = await self.browser.new_context(**self.context_options)
+            self.contexts.append(context)
+            if self.setup is not None:
+                await self.setup(context)
+            self.idle.put_nowait(await context.new_page())
+        return self
+    
+    async def close(self):
+        for context in self.contexts:
+            await context.close()
+        self.contexts = []
+    
+    async def __aenter__(self):
+        return await self.start()
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    @asynccontextmanager
+    async def page(self):
+        """Borrow an idle page for the duration of the block"""
+        page = await self.idle.get()
+        try:
+            yield page
+        finally:
+            self.idle.put_nowait(page)
+    
+    async def run(self, render, jobs):
+        """Run `await render(page, job)` for every job; results keep job order"""
+        async def run_job(job):
+            async with self.page() as page:
+                return await render(page, job)
+        
+        return await asyncio.gather(*(run_job(job) for job in jobs))
+
+@asynccontextmanager
+async def pool_or_launch(pool=None, size=DEFAULT_CONCURRENCY, setup=None):
+    """Yield the caller's shared `pool`, or a pool on a Chromium launched for this block"""
+    if pool is not None:
+        yield pool
+        return
+    
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        try:
+            async with PagePool(browser, size=size, setup=setup) as launched:
+                yield launched
+        finally:
+            await browser.close()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+BEAST MODE - Render Readiness
+Waits for concrete page signals instead of fixed sleeps before a screenshot
+
+A page is ready once web fonts have loaded, any Mermaid render promise has
+resolved, every animation is finished or paused at a deterministic frame, and
+the layout is unchanged across consecutive animation frames.
+"""
+
+import time
+
+# Infinite animations are paused at this point of their timeline so that
+# repeated captures of the same page are pixel-identical
+FREEZE_AT_MS = 0
+STABLE_FRAMES = 2
+MAX_FRAMES = 120
+DEFAULT_TIMEOUT_MS = 10000
+
+# Mermaid pages set window.mermaidRendered once `mermaid.run()` resolves
+MERMAID_RENDERED = "() => window.mermaidRendered === true"
+
+READY_SCRIPT = """
+async ({ freezeAtMs, stableFrames, maxFrames }) => {
+    await document.fonts.ready;
+
+    for (const animation of document.getAnimations()) {
+        const timing = animation.effect ? animation.effect.getComputedTiming() : null;
+        if (timing && Number.isFinite(timing.endTime)) {
+            animation.finish();
+        } else {
+            animation.pause();
+            animation.currentTime = freezeAtMs;
+        }
+    }
+
+    const nextFrame = () => new Promise(resolve => requestAnimationFrame(() => resolve()));
+    const layout = () => {
+        const root = document.documentElement;
+        const box = root.getBoundingClientRect();
+        return [box.width, box.height, root.scrollWidth, root.scrollHeight].join(",");
+    };
+
+    let previous = layout();
+    let stable = 0;
+    for (let frame = 0; frame < maxFrames && stable < stableFrames; frame++) {
+        await nextFrame();
+        const current = layout();
+        stable = current === previous ? stable + 1 : 0;
+        previous = current;
+    }
+    return stable >= stableFrames;
+}
+"""
+
+async def wait_until_ready(page, mermaid=False, timeout=DEFAULT_TIMEOUT_MS):
+    """Wait until `page` is ready to capture; returns the seconds spent waiting"""
+    start = time.perf_counter()
+    
+    if mermaid:
+        await page.wait_for_function(MERMAID_RENDERED, timeout=timeout)
+    
+    await page.evaluate(READY_SCRIPT, {
+        "freezeAtMs": FREEZE_AT_MS,
+        "stableFrames": STABLE_FRAMES,
+        "maxFrames": MAX_FRAMES,
+    })
+    
+    return time.perf_counter() - start
+
+class ReadinessReport:
+    """Per-asset wait times compared with the fixed sleeps they replace"""
+    
+    def __init__(self):
+        self.assets = []
+    
+    def record(self, name, waited, fixed_delay):
+        saved = fixed_delay - waited
+        self.assets.append({"name": name, "waited": waited, "fixed_delay": fixed_delay, "saved": saved})
+        return f"⏱️  Ready in {waited:.2f}s (saved {saved:.2f}s vs fixed {fixed_delay:.1f}s wait)"
+    
+    def print_summary(self):
+        if not self.assets:
+            return
+        waited = sum(asset["waited"] for asset in self.assets)
+        saved = sum(asset["saved"] for asset in self.assets)
+        print(f"\n⏱️  Readiness waits: {waited:.1f}s across {len(self.assets)} capture(s), saved {saved:.1f}s")
+
+REPORT = ReadinessReport()
@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+BEAST MODE - Script Loader
+Imports hyphenated scripts (e.g. brand-refinement-system.py) as modules
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).parent
+
+def load_script(filename):
+    """Import scripts/<filename> once and return the module"""
+    name = Path(filename).stem.replace("-", "_")
+    if name in sys.modules:
+        return sys.modules[name]
+    
+    spec = importlib.util.spec_from_file_location(name, SCRIPTS_DIR / filename)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[name]
+        raise
+    return module
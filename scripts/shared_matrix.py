@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Shared Feature Matrix
+Write a feature matrix once and let worker processes attach to it without copying
+
+A SharedMatrix lives in multiprocessing.shared_memory, or in a memory-mapped
+.npy file when shared memory is unavailable. Only its handle (a small dict)
+is pickled to workers - CV folds, hyperparameter trials, batch scoring - which
+map the same pages read-only instead of unpickling their own copy. Anything a
+worker builds from the view (an xgb.DMatrix, a fancy-indexed subset) is still
+a private copy, so build it once per worker and slice that.
+
+    with SharedMatrix.create(X) as shared:          # parent: one copy
+        executor.submit(work, shared.handle)
+
+    with SharedMatrix.attach(handle) as shared:     # worker: view of the same pages
+        model.predict(xgb.DMatrix(shared.array))
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+# numpy is imported in the methods: the trainers import this module at load time
+# and defer numpy themselves (see benchmark-import-time.py).
+
+try:
+    from multiprocessing import shared_memory
+    HAS_SHARED_MEMORY = True
+except ImportError:
+    HAS_SHARED_MEMORY = False
+
+SPILL_DIR = Path(__file__).parent.parent / '.beast-mode' / 'cache' / 'shared-matrices'
+
+class SharedMatrix:
+    """An array in shared memory (or a memory-mapped .npy) plus the handle workers attach with
+    
+    The creating process owns the storage and releases it on close(); attached
+    copies only unmap. Views sliced from `array` must be dropped before close().
+    """
+    
+    def __init__(self, handle, array, segment=None, owner=False):
+        self.handle = handle
+        self.array = array
+        self.segment = segment
+        self.owner = owner
+    
+    @classmethod
+    def empty(cls, shape, dtype='float32', use_shared_memory=HAS_SHARED_MEMORY):
+        """Allocate a zeroed matrix to be filled in place (e.g. vectorized straight into it)"""
+        import numpy as np
+        
+        dtype = np.dtype(dtype)
+        shape = tuple(int(size) for size in shape)
+        if use_shared_memory:
+            nbytes = int(np.prod(shape)) * dtype.itemsize
+            # Zero-length segments are not allowed
+            segment = shared_memory.SharedMemory(create=True, size=max(nbytes, 1))
+            array = np.ndarray(shape, dtype=dtype, buffer=segment.buf)
+            array.fill(0)
+            handle = {'kind': 'shm', 'location': segment.name, 'shape': shape, 'dtype': dtype.str}
+        else:
+            SPILL_DIR.mkdir(parents=True, exist_ok=True)
+            fd, location = tempfile.mkstemp(dir=str(SPILL_DIR), suffix='.npy')
+            os.close(fd)
+            segment = None
+            array = np.lib.format.open_memmap(location, mode='w+', dtype=dtype, shape=shape)
+            handle = {'kind': 'npy', 'location': location, 'shape': shape, 'dtype': dtype.str}
+        return cls(handle, array, segment, owner=True)
+    
+    @classmethod
+    def create(cls, data, dtype=None, use_shared_memory=HAS_SHARED_MEMORY):
+        """Copy an array (or DataFrame/Series values) into a new shared matrix"""
+        import numpy as np
+        
+        data = np.asarray(data, dtype=dtype)
+        shared = cls.empty(data.shape, data.dtype, use_shared_memory)
+        shared.array[...] = data
+        return shared
+    
+    @classmethod
+    def attach(cls, handle):
+        """Read-only view of a matrix created in another process"""
+        import numpy as np
+        
+        if handle['kind'] == 'shm':
+            segment = shared_memory.SharedMemory(name=handle['location'])
+            array = np.ndarray(handle['shape'], dtype=handle['dtype'], buffer=segment.buf)
+        else:
+            segment = None
+            array = np.load(handle['location'], mmap_mode='r')
+        array.flags.writeable = False
+        return cls(handle, array, segment)
+    
+    @property
+    def nbytes(self):
+        return self.array.nbytes if self.array is not None else 0
+    
+    def close(self):
+        """Unmap this process's view; the owner also frees the storage"""
+        if self.array is None:
+            return
+        self.array = None
+        if self.segment is not None:
+            self.segment.close()
+        if self.owner:
+            if self.segment is not None:
+                self.segment.unlink()
+            elif os.path.exists(self.handle['location']):
+                os.unlink(self.handle['location'])
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
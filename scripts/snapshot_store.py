@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+BEAST MODE - Refinement Snapshot Store
+Content-addressed history of refined visuals, replacing one-time .html.backup copies
+
+Each version of a file is stored once as a compressed blob named by its
+SHA-256, so unchanged runs and identical files cost nothing. Every source has
+a small JSON history index of (blob, label, time) entries, written
+atomically. Because intermediate passes are deterministic, only the version
+before and after each run is kept; any pass can be replayed from there.
+
+Usage: python3 scripts/snapshot_store.py history <file>
+       python3 scripts/snapshot_store.py diff <file> [FROM] [TO]
+       python3 scripts/snapshot_store.py rollback <file> [ENTRY]
+       python3 scripts/snapshot_store.py replay <file> <PASS> [--write]
+"""
+
+import difflib
+import hashlib
+import json
+import sys
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+from atomic_io import atomic_write_bytes, atomic_write_json, atomic_write_text
+
+BASE_DIR = Path(__file__).parent.parent
+STORE_DIR = BASE_DIR / ".beast-mode" / "refinement-snapshots"
+INDEX_VERSION = 1
+
+def relative_key(path):
+    """Stable name for a source file: its path relative to the repository"""
+    path = Path(path).resolve()
+    try:
+        return path.relative_to(BASE_DIR.resolve()).as_posix()
+    except ValueError:
+        return path.as_posix().lstrip("/")
+
+class SnapshotStore:
+    """Deduplicated blobs under `root`/blobs plus one history index per source file"""
+    
+    def __init__(self, root=STORE_DIR):
+        self.root = Path(root)
+        self.blob_dir = self.root / "blobs"
+        self.index_dir = self.root / "index"
+    
+    def blob_path(self, sha):
+        return self.blob_dir / sha[:2] / f"{sha[2:]}.z"
+    
+    def index_path(self, path):
+        return self.index_dir / f"{relative_key(path).replace('/', '__')}.json"
+    
+    def put(self, text):
+        """Store `text` once; returns its SHA-256"""
+        data = text.encode()
+        sha = hashlib.sha256(data).hexdigest()
+        blob = self.blob_path(sha)
+        if not blob.exists():
+            atomic_write_bytes(blob, zlib.compress(data, 6))
+        return sha
+    
+    def get(self, sha):
+        return zlib.decompress(self.blob_path(sha).read_bytes()).decode()
+    
+    def history(self, path):
+        """History entries of `path`, oldest first, seeded from a legacy .backup on first use"""
+        index = self.index_path(path)
+        if index.exists():
+            with open(index, "r") as f:
+                return json.load(f)["entries"]
+        
+        backup = Path(f"{path}.backup")
+        if backup.exists():
+            return [self.entry(self.put(backup.read_text()), "original (.backup)", backup.stat().st_mtime)]
+        return []
+    
+    def entry(self, sha, label, timestamp=None):
+        moment = datetime.fromtimestamp(timestamp) if timestamp else datetime.now()
+        return {"sha": sha, "label": label, "time": moment.isoformat()}
+    
+    def record(self, path, text, label):
+        """Append `text` to the history of `path` unless it equals the latest entry; returns the SHA"""
+        entries = self.history(path)
+        sha = self.put(text)
+        if not entries or entries[-1]["sha"] != sha:
+            entries.append(self.entry(sha, label))
+            atomic_write_json(self.index_path(path), {
+                "version": INDEX_VERSION,
+                "file": relative_key(path),
+                "entries": entries,
+            })
+        return sha
+    
+    def resolve(self, path, ref):
+        """Entry of `path` by index (negative from the end) or SHA prefix"""
+        entries = self.history(path)
+        if not entries:
+            raise KeyError(f"No snapshots of {relative_key(path)}")
+        try:
+            number = int(ref)
+        except ValueError:
+            matches = [entry for entry in entries if entry["sha"].startswith(ref)]
+            if len(matches) != 1:
+                raise KeyError(f"{ref!r} matches {len(matches)} snapshot(s) of {relative_key(path)}")
+            return matches[0]
+        if not -len(entries) <= number < len(entries):
+            raise KeyError(f"No snapshot {number} of {relative_key(path)} ({len(entries)} recorded)")
+        return entries[number]
+    
+    def diff(self, path, from_ref=-2, to_ref=-1):
+        """Unified diff between two snapshots of `path`"""
+        old, new = self.resolve(path, from_ref), self.resolve(path, to_ref)
+        return "".join(difflib.unified_diff(
+            self.get(old["sha"]).splitlines(keepends=True),
+            self.get(new["sha"]).splitlines(keepends=True),
+            fromfile=f"{relative_key(path)}@{old['sha'][:10]} ({old['label']})",
+            tofile=f"{relative_key(path)}@{new['sha'][:10]} ({new['label']})",
+        ))
+    
+    def rollback(self, path, ref=0):
+        """Restore `path` to a snapshot; the current content is recorded first so this can be undone"""
+        target = self.resolve(path, ref)
+        path = Path(path)
+        if path.exists():
+            self.record(path, path.read_text(), "before rollback")
+        atomic_write_text(path, self.get(target["sha"]))
+        self.record(path, self.get(target["sha"]), f"rollback to {target['sha'][:10]}")
+        return target
+    
+    def replay(self, path, pass_num, base_ref=0):
+        """Content of `path` after `pass_num` refinement passes applied to a snapshot (the original by default)"""
+        # Imported here: brand-refinement-system imports this module
+        from script_loader import load_script
+        brand_refinement = load_script("brand-refinement-system.py")
+        
+        content = self.get(self.resolve(path, base_ref)["sha"])
+        is_css = Path(path).suffix == ".css"
+        for _, content in brand_refinement.iter_refinement_passes(
+            content, brand_refinement.REFINEMENT_PASSES, pass_num, is_css=is_css
+        ):
+            pass
+        return content
+
+def print_history(store, path):
+    entries = store.history(path)
+    print(f"🗂️  {relative_key(path)}: {len(entries)} snapshot(s)\n")
+    for number, entry in enumerate(entries):
+        print(f"  {number:>3}  {entry['sha'][:10]}  {entry['time'][:19]}  {entry['label']}")
+
+def main(args):
+    if len(args) < 2 or args[0] not in ("history", "diff", "rollback", "replay"):
+        print(__doc__.strip().split("\n\n")[-1])
+        sys.exit(1)
+    
+    command, path = args[0], Path(args[1])
+    store = SnapshotStore()
+    try:
+        if command == "history":
+            print_history(store, path)
+        elif command == "diff":
+            refs = args[2:4] or [-2, -1]
+            print(store.diff(path, *refs) or "No differences")
+        elif command == "rollback":
+            target = store.rollback(path, args[2] if len(args) > 2 else 0)
+            print(f"⏪ {relative_key(path)} restored to {target['sha'][:10]} ({target['label']})")
+        elif command == "replay":
+            try:
+                pass_num = int(args[2])
+            except (IndexError, ValueError):
+                print(f"❌ replay needs a pass number, e.g. replay {relative_key(path)} 3")
+                sys.exit(1)
+            content = store.replay(path, pass_num)
+            if "--write" in args:
+                store.record(path, path.read_text(), "before replay")
+                atomic_write_text(path, content)
+                store.record(path, content, f"replay to pass {pass_num}")
+                print(f"🔁 {relative_key(path)} replayed to pass {pass_num}")
+            else:
+                sys.stdout.write(content)
+    except KeyError as e:
+        print(f"❌ {e.args[0]}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
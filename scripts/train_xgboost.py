@@ -11,14 +11,18 @@ import os
 import sys
 from pathlib import Path
 from datetime import datetime
-import numpy as np
-import xgboost as xgb
-from sklearn.model_selection import train_test_split, cross_val_score, KFold
-from sklearn.metrics import r2_score, mean_absolute_error, mean_squared_error
+
+# ML imports are deferred (see benchmark-import-time.py): tune-xgboost-hyperparameters.js
+# imports this module for its functions, and missing training data fails before any load.
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from model_catalog import register_model
+from model_metadata import PhaseTimer, build_metadata, read_metadata, write_metadata
+
+MODEL_VERSION = 'v1.0.0'
+
 def load_training_data(use_real_only=False):
     """Load training data from exported JSON file or local files"""
     # Try real-only file first if requested
@@ -85,6 +89,8 @@ def normalize_features(repo):
 
 def calculate_hybrid_quality(repo):
     """Calculate hybrid quality score (simplified)"""
+    import numpy as np
+    
     f = repo.get('features', {})
     stars = f.get('stars', 0)
     
@@ -102,6 +108,8 @@ def calculate_hybrid_quality(repo):
 
 def prepare_training_data(repos):
     """Prepare training data with features and labels"""
+    import numpy as np
+    
     print("\n📊 Preparing quality labels...\n")
     
     training_data = []
@@ -144,8 +152,15 @@ def prepare_training_data(repos):
     
     return X, y, feature_array, training_data
 
-def train_xgboost_model(X, y, feature_names):
+def train_xgboost_model(X, y, feature_names, timer=None):
     """Train XGBoost model"""
+    import numpy as np
+    import xgboost as xgb
+    from sklearn.model_selection import train_test_split, KFold
+    from sklearn.metrics import r2_score, mean_absolute_error, mean_squared_error
+    
+    timer = timer or PhaseTimer()
+    
     print('🚀 Training XGBoost Model...\n')
     print(f"   Training samples: {len(X)}")
     print(f"   Features: {len(feature_names)}")
@@ -183,14 +198,15 @@ def train_xgboost_model(X, y, feature_names):
     
     # Train model
     print('🔄 Training...\n')
-    model = xgb.train(
-        params,
-        dtrain,
-        num_boost_round=params['n_estimators'],
-        evals=[(dtrain, 'train'), (dtest, 'test')],
-        early_stopping_rounds=10,
-        verbose_eval=False  # Reduce output for cleaner logs
-    )
+    with timer.phase('train'):
+        model = xgb.train(
+            params,
+            dtrain,
+            num_boost_round=params['n_estimators'],
+            evals=[(dtrain, 'train'), (dtest, 'test')],
+            early_stopping_rounds=10,
+            verbose_eval=False  # Reduce output for cleaner logs
+        )
     
     # Evaluate
     y_pred_train = model.predict(dtrain)
@@ -205,25 +221,26 @@ def train_xgboost_model(X, y, feature_names):
     print('\n🔄 Running 5-fold cross-validation...')
     kfold = KFold(n_splits=5, shuffle=True, random_state=42)
     cv_scores = []
-    for train_idx, val_idx in kfold.split(X):
-        X_cv_train, X_cv_val = X[train_idx], X[val_idx]
-        y_cv_train, y_cv_val = y[train_idx], y[val_idx]
-        
-        dtrain_cv = xgb.DMatrix(X_cv_train, label=y_cv_train)
-        dval_cv = xgb.DMatrix(X_cv_val, label=y_cv_val)
-        
-        model_cv = xgb.train(
-            params,
-            dtrain_cv,
-            num_boost_round=params['n_estimators'],
-            early_stopping_rounds=10,
-            evals=[(dval_cv, 'val')],
-            verbose_eval=False
-        )
-        
-        y_pred_cv = model_cv.predict(dval_cv)
-        r2_cv = r2_score(y_cv_val, y_pred_cv)
-        cv_scores.append(r2_cv)
+    with timer.phase('cv'):
+        for train_idx, val_idx in kfold.split(X):
+            X_cv_train, X_cv_val = X[train_idx], X[val_idx]
+            y_cv_train, y_cv_val = y[train_idx], y[val_idx]
+            
+            dtrain_cv = xgb.DMatrix(X_cv_train, label=y_cv_train)
+            dval_cv = xgb.DMatrix(X_cv_val, label=y_cv_val)
+            
+            model_cv = xgb.train(
+                params,
+                dtrain_cv,
+                num_boost_round=params['n_estimators'],
+                early_stopping_rounds=10,
+                evals=[(dval_cv, 'val')],
+                verbose_eval=False
+            )
+            
+            y_pred_cv = model_cv.predict(dval_cv)
+            r2_cv = r2_score(y_cv_val, y_pred_cv)
+            cv_scores.append(r2_cv)
     
     cv_mean = np.mean(cv_scores)
     cv_std = np.std(cv_scores)
@@ -240,13 +257,20 @@ def train_xgboost_model(X, y, feature_names):
             'r2_train': r2_train,
             'r2_test': r2_test,
             'r2': r2_test,  # Use test R² as primary metric
-            'r2_cv_mean': cv_mean,
+            'r2_cv': cv_mean,
             'r2_cv_std': cv_std,
             'mae': mae_test,
             'rmse': rmse_test
         },
         'feature_names': feature_names,
-        'feature_importance': feature_importance
+        'feature_importance': feature_importance,
+        'training_data': {
+            'size': len(X),
+            'train_size': len(X_train),
+            'test_size': len(X_test)
+        },
+        'hyperparameters': params,
+        'timer': timer
     }
 
 def save_model(trained_model, output_dir):
@@ -258,18 +282,25 @@ def save_model(trained_model, output_dir):
     model_path = output_dir / 'model.json'
     trained_model['model'].save_model(str(model_path))
     
-    # Save metadata
-    metadata = {
-        'algorithm': 'xgboost',
-        'metrics': trained_model['metrics'],
-        'feature_names': trained_model['feature_names'],
-        'feature_importance': trained_model['feature_importance'][:20],  # Top 20
-        'trainedAt': datetime.now().isoformat(),
-    }
+    # Save metadata (shared, validated schema)
+    training_data = trained_model['training_data']
+    metadata = build_metadata(
+        algorithm='xgboost',
+        version=MODEL_VERSION,
+        metrics=trained_model['metrics'],
+        feature_names=trained_model['feature_names'],
+        dataset_size=training_data['size'],
+        train_size=training_data['train_size'],
+        test_size=training_data['test_size'],
+        feature_importance=trained_model['feature_importance'][:20],  # Top 20
+        hyperparameters=trained_model['hyperparameters'],
+        timing=trained_model['timer'].as_timing(training_data['train_size'])
+    )
     
-    metadata_path = output_dir / 'model-metadata.json'
-    with open(metadata_path, 'w') as f:
-        json.dump(metadata, f, indent=2)
+    metadata_path = write_metadata(output_dir, metadata)
+    
+    # Index the model so serving/logging never scan the models directory
+    register_model(output_dir, metadata, trained_model['feature_names'])
     
     return model_path, metadata_path
 
@@ -278,12 +309,16 @@ def main():
     print('=' * 60)
     
     try:
+        timer = PhaseTimer()
+        
         # Load data
-        repos = load_training_data()
-        X, y, feature_names, training_data = prepare_training_data(repos)
+        with timer.phase('load'):
+            repos = load_training_data()
+        with timer.phase('prepare'):
+            X, y, feature_names, training_data = prepare_training_data(repos)
         
         # Train model
-        trained_model = train_xgboost_model(X, y, feature_names)
+        trained_model = train_xgboost_model(X, y, feature_names, timer=timer)
         
         # Display results
         print('📊 Model Performance:\n')
@@ -294,9 +329,9 @@ def main():
         
         print(f"   R² (train): {metrics['r2_train']:.3f}")
         print(f"   R² (test):  {metrics['r2']:.3f} {r2_icon}")
-        if 'r2_cv_mean' in metrics:
-            cv_icon = '✅' if metrics['r2_cv_mean'] > 0.5 else '⚠️' if metrics['r2_cv_mean'] > 0.1 else '❌'
-            print(f"   R² (CV):    {metrics['r2_cv_mean']:.3f} (+/- {metrics['r2_cv_std']:.3f}) {cv_icon}")
+        if 'r2_cv' in metrics:
+            cv_icon = '✅' if metrics['r2_cv'] > 0.5 else '⚠️' if metrics['r2_cv'] > 0.1 else '❌'
+            print(f"   R² (CV):    {metrics['r2_cv']:.3f} (+/- {metrics['r2_cv_std']:.3f}) {cv_icon}")
         print(f"   MAE:        {metrics['mae']:.3f} {mae_icon}")
         print(f"   RMSE:       {metrics['rmse']:.3f} {rmse_icon}\n")
         
@@ -332,14 +367,13 @@ def main():
         print('=' * 60)
         print('✅ Retraining complete!\n')
         
-        # Auto-log results to database
+        # Auto-log results to database (in-process, no extra interpreter)
         try:
-            import subprocess
-            log_script = Path(__file__).parent / 'auto-log-training-results.py'
-            if log_script.exists():
-                print('📊 Logging training results to database...')
-                subprocess.run(['python3', str(log_script)], check=False)
-                print()
+            from training_results_sink import log_training_results
+            print('📊 Logging training results to database...')
+            log_training_results(read_metadata(metadata_path), model_dir)
+            print('✅ Training results logged')
+            print()
         except Exception as e:
             print(f'⚠️  Could not log results to database: {e}')
             print()
@@ -9,15 +9,17 @@ import os
 import sys
 from pathlib import Path
 from datetime import datetime
-import numpy as np
-import xgboost as xgb
-from sklearn.model_selection import train_test_split, KFold
-from sklearn.metrics import r2_score, mean_absolute_error, mean_squared_error
-from sklearn.preprocessing import StandardScaler, RobustScaler
-import pandas as pd
+
+# ML imports are deferred (see benchmark-import-time.py): batch_predict_xgboost.py
+# imports engineer_repo_features from here, which needs only math.
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from model_catalog import register_model
+from model_metadata import PhaseTimer, build_metadata, write_metadata
+
+MODEL_VERSION = 'improved-v1.0.0'
+
 def load_training_data():
     """Load training data"""
     exported_file = Path(__file__).parent.parent / '.beast-mode' / 'training-data' / 'all-repos-for-python.json'
@@ -33,6 +35,8 @@ def load_training_data():
 
 def remove_constant_features(df):
     """Remove features with no variance"""
+    import numpy as np
+    
     constant_features = []
     for col in df.columns:
         if col in ['repo', 'quality_score', 'prediction_id', 'source', 'synthetic']:
@@ -50,6 +54,8 @@ def remove_constant_features(df):
 
 def engineer_features(df):
     """Create new features through engineering"""
+    import numpy as np
+    
     print("🔧 Engineering features...")
     
     original_count = len(df.columns)
@@ -107,8 +113,64 @@ def engineer_features(df):
     
     return df
 
+# Columns engineer_features() can add, in the order it adds them
+ENGINEERED_FEATURES = [
+    'stars_log', 'forks_log', 'fileCount_log', 'codeFileCount_log', 'openIssues_log',
+    'stars_forks_ratio', 'stars_per_file', 'code_ratio', 'tests_and_ci', 'docs_complete',
+    'is_recently_active', 'is_very_active', 'engagement_rate', 'size_category', 'popularity_category',
+]
+
+def engineer_repo_features(features):
+    """The columns engineer_features() adds, computed for one repo's raw features
+    
+    Lets a model trained here score repos one at a time (batch_predict_xgboost.py).
+    A column whose inputs the repo lacks is left out, as it would be NaN.
+    """
+    import math
+    
+    def number(name):
+        value = features.get(name)
+        return float(value) if isinstance(value, (bool, int, float)) else None
+    
+    stars, forks = number('stars'), number('forks')
+    file_count, code_file_count = number('fileCount'), number('codeFileCount')
+    open_issues, days_since_push = number('openIssues'), number('daysSincePush')
+    engineered = {}
+    
+    for feat, value in [('stars', stars), ('forks', forks), ('fileCount', file_count),
+                        ('codeFileCount', code_file_count), ('openIssues', open_issues)]:
+        if value is not None and value > -1:
+            engineered[f'{feat}_log'] = math.log1p(value)
+    
+    if stars is not None and forks is not None:
+        engineered['stars_forks_ratio'] = stars / (forks + 1)
+    if stars is not None and file_count is not None:
+        engineered['stars_per_file'] = stars / (file_count + 1)
+    if code_file_count is not None and file_count is not None:
+        engineered['code_ratio'] = code_file_count / (file_count + 1)
+    
+    if number('hasTests') is not None and number('hasCI') is not None:
+        engineered['tests_and_ci'] = number('hasTests') * number('hasCI')
+    if number('hasReadme') is not None and number('hasLicense') is not None:
+        engineered['docs_complete'] = number('hasReadme') * number('hasLicense')
+    
+    days = 999 if days_since_push is None else days_since_push
+    engineered['is_recently_active'] = int(days <= 30)
+    engineered['is_very_active'] = int(days <= 7)
+    
+    if open_issues is not None and stars is not None:
+        engineered['engagement_rate'] = open_issues / (stars + 1)
+    
+    engineered['size_category'] = sum(file_count > limit for limit in (100, 1000, 10000)) if file_count is not None else 0
+    engineered['popularity_category'] = sum(stars > limit for limit in (100, 1000, 10000)) if stars is not None else 0
+    
+    return engineered
+
 def prepare_training_data(repos):
     """Prepare training data with improved feature handling"""
+    import numpy as np
+    import pandas as pd
+    
     print("\n📊 Preparing training data...\n")
     
     # Convert to DataFrame
@@ -166,8 +228,15 @@ def prepare_training_data(repos):
     
     return X, y, feature_cols, df
 
-def train_xgboost_model(X, y, feature_names, options={}):
+def train_xgboost_model(X, y, feature_names, options={}, timer=None):
     """Train XGBoost with improved hyperparameters"""
+    import numpy as np
+    import xgboost as xgb
+    from sklearn.model_selection import train_test_split, KFold
+    from sklearn.metrics import r2_score, mean_absolute_error, mean_squared_error
+    
+    timer = timer or PhaseTimer()
+    
     print("\n🚀 Training Improved XGBoost Model...\n")
     
     # Split data
@@ -207,14 +276,15 @@ def train_xgboost_model(X, y, feature_names, options={}):
     
     # Train model
     print('🔄 Training...\n')
-    model = xgb.train(
-        params,
-        dtrain,
-        num_boost_round=params['n_estimators'],
-        evals=[(dtrain, 'train'), (dtest, 'test')],
-        early_stopping_rounds=20,  # More patience
-        verbose_eval=25  # Show progress every 25 rounds
-    )
+    with timer.phase('train'):
+        model = xgb.train(
+            params,
+            dtrain,
+            num_boost_round=params['n_estimators'],
+            evals=[(dtrain, 'train'), (dtest, 'test')],
+            early_stopping_rounds=20,  # More patience
+            verbose_eval=25  # Show progress every 25 rounds
+        )
     
     # Evaluate
     y_pred_train = model.predict(dtrain)
@@ -229,25 +299,26 @@ def train_xgboost_model(X, y, feature_names, options={}):
     print('\n🔄 Running 5-fold cross-validation...')
     kfold = KFold(n_splits=5, shuffle=True, random_state=42)
     cv_scores = []
-    for train_idx, val_idx in kfold.split(X):
-        X_cv_train, X_cv_val = X[train_idx], X[val_idx]
-        y_cv_train, y_cv_val = y[train_idx], y[val_idx]
-        
-        dtrain_cv = xgb.DMatrix(X_cv_train, label=y_cv_train)
-        dval_cv = xgb.DMatrix(X_cv_val, label=y_cv_val)
-        
-        model_cv = xgb.train(
-            params,
-            dtrain_cv,
-            num_boost_round=params['n_estimators'],
-            early_stopping_rounds=20,
-            evals=[(dval_cv, 'val')],
-            verbose_eval=False
-        )
-        
-        y_pred_cv = model_cv.predict(dval_cv)
-        r2_cv = r2_score(y_cv_val, y_pred_cv)
-        cv_scores.append(r2_cv)
+    with timer.phase('cv'):
+        for train_idx, val_idx in kfold.split(X):
+            X_cv_train, X_cv_val = X[train_idx], X[val_idx]
+            y_cv_train, y_cv_val = y[train_idx], y[val_idx]
+            
+            dtrain_cv = xgb.DMatrix(X_cv_train, label=y_cv_train)
+            dval_cv = xgb.DMatrix(X_cv_val, label=y_cv_val)
+            
+            model_cv = xgb.train(
+                params,
+                dtrain_cv,
+                num_boost_round=params['n_estimators'],
+                early_stopping_rounds=20,
+                evals=[(dval_cv, 'val')],
+                verbose_eval=False
+            )
+            
+            y_pred_cv = model_cv.predict(dval_cv)
+            r2_cv = r2_score(y_cv_val, y_pred_cv)
+            cv_scores.append(r2_cv)
     
     cv_mean = np.mean(cv_scores)
     cv_std = np.std(cv_scores)
@@ -264,13 +335,20 @@ def train_xgboost_model(X, y, feature_names, options={}):
             'r2_train': r2_train,
             'r2_test': r2_test,
             'r2': r2_test,
-            'r2_cv_mean': cv_mean,
+            'r2_cv': cv_mean,
             'r2_cv_std': cv_std,
             'mae': mae_test,
             'rmse': rmse_test
         },
         'feature_names': feature_names,
-        'feature_importance': feature_importance
+        'feature_importance': feature_importance,
+        'training_data': {
+            'size': len(X),
+            'train_size': len(X_train),
+            'test_size': len(X_test)
+        },
+        'hyperparameters': params,
+        'timer': timer
     }
 
 def save_model(trained_model, output_dir):
@@ -286,27 +364,25 @@ def save_model(trained_model, output_dir):
     model_path = model_dir / 'model.json'
     trained_model['model'].save_model(str(model_path))
     
-    # Save metadata
-    metadata = {
-        'model_type': 'xgboost',
-        'version': 'improved-v1.0.0',
-        'training_date': timestamp,
-        'training_size': 500,
-        'features': len(trained_model['feature_names']),
-        'metrics': trained_model['metrics'],
-        'top_features': trained_model['feature_importance'][:20],
-        'hyperparameters': {
-            'max_depth': 3,
-            'learning_rate': 0.05,
-            'n_estimators': 200,
-            'reg_alpha': 0.2,
-            'reg_lambda': 2.0
-        }
-    }
+    # Save metadata (shared, validated schema)
+    training_data = trained_model['training_data']
+    metadata = build_metadata(
+        algorithm='xgboost',
+        version=MODEL_VERSION,
+        metrics=trained_model['metrics'],
+        feature_names=trained_model['feature_names'],
+        dataset_size=training_data['size'],
+        train_size=training_data['train_size'],
+        test_size=training_data['test_size'],
+        feature_importance=trained_model['feature_importance'][:20],
+        hyperparameters=trained_model['hyperparameters'],
+        timing=trained_model['timer'].as_timing(training_data['train_size'])
+    )
+    
+    write_metadata(model_dir, metadata)
     
-    metadata_path = model_dir / 'model-metadata.json'
-    with open(metadata_path, 'w') as f:
-        json.dump(metadata, f, indent=2)
+    # Index the model so serving/logging never scan the models directory
+    register_model(model_dir, metadata, trained_model['feature_names'])
     
     return model_dir
 
@@ -316,10 +392,13 @@ def main():
     print("=" * 70)
     print()
     
-    repos = load_training_data()
-    X, y, feature_names, df = prepare_training_data(repos)
+    timer = PhaseTimer()
+    with timer.phase('load'):
+        repos = load_training_data()
+    with timer.phase('prepare'):
+        X, y, feature_names, df = prepare_training_data(repos)
     
-    result = train_xgboost_model(X, y, feature_names)
+    result = train_xgboost_model(X, y, feature_names, timer=timer)
     
     print("\n" + "=" * 70)
     print("📊 Model Performance:")
@@ -327,7 +406,7 @@ def main():
     print()
     print(f"   R² (train): {result['metrics']['r2_train']:.3f}")
     print(f"   R² (test):  {result['metrics']['r2_test']:.3f} {'✅' if result['metrics']['r2_test'] > 0 else '❌'}")
-    print(f"   R² (CV):    {result['metrics']['r2_cv_mean']:.3f} (+/- {result['metrics']['r2_cv_std']:.3f}) {'✅' if result['metrics']['r2_cv_mean'] > 0 else '❌'}")
+    print(f"   R² (CV):    {result['metrics']['r2_cv']:.3f} (+/- {result['metrics']['r2_cv_std']:.3f}) {'✅' if result['metrics']['r2_cv'] > 0 else '❌'}")
     print(f"   MAE:        {result['metrics']['mae']:.4f} {'✅' if result['metrics']['mae'] < 0.1 else '⚠️'}")
     print(f"   RMSE:       {result['metrics']['rmse']:.4f} {'✅' if result['metrics']['rmse'] < 0.15 else '⚠️'}")
     print()
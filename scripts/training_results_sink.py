@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Training Results Sink
+Writes model training results straight from Python to a local store (SQLite or
+JSONL) and optionally to Supabase over HTTP, batching records per write
+
+Replaces spawning `node scripts/log-training-results.js` once per result.
+"""
+
+import json
+import os
+import sqlite3
+import urllib.request
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from model_catalog import artifact_path, load_catalog
+from model_metadata import read_metadata, upgrade_metadata
+
+BASE_DIR = Path(__file__).parent.parent
+MODELS_DIR = BASE_DIR / '.beast-mode' / 'models'
+RESULTS_DIR = BASE_DIR / '.beast-mode' / 'data'
+SQLITE_PATH = RESULTS_DIR / 'training-results.sqlite'
+JSONL_PATH = RESULTS_DIR / 'training-results.jsonl'
+HTTP_SENT_PATH = RESULTS_DIR / 'training-results-http-sent.txt'
+ENV_FILE = BASE_DIR / 'website' / '.env.local'
+
+# Same metric rows log-training-results.js inserts into ml_performance_metrics
+METRIC_UNITS = {
+    'r2_train': 'score',
+    'r2_test': 'score',
+    'r2_cv': 'score',
+    'mae': 'error',
+    'rmse': 'error',
+}
+
+RECORD_FIELDS = [
+    'model_id', 'model_type', 'version', 'training_date',
+    'r2_train', 'r2_test', 'r2_cv', 'mae', 'rmse',
+    'dataset_size', 'feature_count', 'model_dir', 'logged_at',
+]
+
+class SinkError(RuntimeError):
+    """Raised when one or more sinks failed to write their records"""
+
+def build_record(metadata, model_dir=None):
+    """Build a flat results record from model metadata (any schema version)"""
+    metadata = upgrade_metadata(metadata, model_dir)
+    metrics = metadata['metrics']
+    training_data = metadata['training_data']
+    model_dir = Path(model_dir) if model_dir else None
+    model_type = metadata['algorithm']
+    logged_at = datetime.now().isoformat()
+    
+    def metric(name):
+        # numpy scalars (e.g. float32 metrics) are not JSON/SQLite serializable;
+        # a metric a legacy file lacks stays None rather than a silent 0.0
+        value = metrics.get(name)
+        return float(value) if value is not None else None
+    
+    return {
+        'model_id': model_dir.name if model_dir else metadata['version'] or f'{model_type}-{logged_at}',
+        'model_type': model_type,
+        'version': metadata['version'],
+        'training_date': metadata['trainedAt'],
+        'r2_train': metric('r2_train'),
+        'r2_test': metric('r2_test'),
+        'r2_cv': metric('r2_cv'),
+        'mae': metric('mae'),
+        'rmse': metric('rmse'),
+        'dataset_size': int(training_data['size']) if training_data['size'] else None,
+        'feature_count': int(training_data['feature_count']) if training_data['feature_count'] else None,
+        'model_dir': str(model_dir) if model_dir else None,
+        'logged_at': logged_at,
+    }
+
+class ResultsSink(ABC):
+    """Buffers records and writes them in batches"""
+    
+    name = 'sink'
+    
+    def __init__(self, batch_size=100):
+        self.batch_size = batch_size
+        self.buffer = []
+        self.written = 0
+    
+    def add(self, record):
+        self.buffer.append(record)
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+    
+    def flush(self):
+        if not self.buffer:
+            return
+        batch, self.buffer = self.buffer, []
+        self.write_batch(batch)
+        self.written += len(batch)
+    
+    @abstractmethod
+    def write_batch(self, records):
+        """Write one batch of records"""
+    
+    def close(self):
+        self.flush()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+class SqliteSink(ResultsSink):
+    """One row per model in a local SQLite table (re-logging a model replaces its row)"""
+    
+    name = 'sqlite'
+    
+    def __init__(self, path=SQLITE_PATH, batch_size=100):
+        super().__init__(batch_size)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS training_results (
+                model_id TEXT PRIMARY KEY,
+                model_type TEXT,
+                version TEXT,
+                training_date TEXT,
+                r2_train REAL,
+                r2_test REAL,
+                r2_cv REAL,
+                mae REAL,
+                rmse REAL,
+                dataset_size INTEGER,
+                feature_count INTEGER,
+                model_dir TEXT,
+                logged_at TEXT
+            )
+        ''')
+    
+    def write_batch(self, records):
+        placeholders = ', '.join('?' for _ in RECORD_FIELDS)
+        rows = [tuple(r.get(field) for field in RECORD_FIELDS) for r in records]
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO training_results ({', '.join(RECORD_FIELDS)}) VALUES ({placeholders})",
+                rows
+            )
+    
+    def close(self):
+        super().close()
+        self.conn.close()
+
+class JsonlSink(ResultsSink):
+    """Append-only JSON Lines log (models already in the file are skipped)"""
+    
+    name = 'jsonl'
+    
+    def __init__(self, path=JSONL_PATH, batch_size=100):
+        super().__init__(batch_size)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.seen = None
+    
+    def load_seen(self):
+        seen = set()
+        if self.path.exists():
+            with open(self.path, 'r') as f:
+                for line in f:
+                    try:
+                        seen.add(json.loads(line).get('model_id'))
+                    except ValueError:
+                        continue
+        return seen
+    
+    def write_batch(self, records):
+        if self.seen is None:
+            self.seen = self.load_seen()
+        
+        with open(self.path, 'a') as f:
+            for record in records:
+                if record['model_id'] in self.seen:
+                    continue
+                self.seen.add(record['model_id'])
+                f.write(json.dumps(record) + '\n')
+
+def load_supabase_credentials():
+    """Supabase URL/key from the environment, falling back to website/.env.local"""
+    url = os.environ.get('NEXT_PUBLIC_SUPABASE_URL')
+    key = os.environ.get('SUPABASE_SERVICE_ROLE_KEY')
+    
+    if (not url or not key) and ENV_FILE.exists():
+        env = {}
+        for line in ENV_FILE.read_text().splitlines():
+            line = line.strip()
+            if not line or line.startswith('#') or '=' not in line:
+                continue
+            name, value = line.split('=', 1)
+            env[name.strip()] = value.strip().strip('"').strip("'")
+        url = url or env.get('NEXT_PUBLIC_SUPABASE_URL')
+        key = key or env.get('SUPABASE_SERVICE_ROLE_KEY')
+    
+    return url, key
+
+class HttpSink(ResultsSink):
+    """Inserts ml_performance_metrics rows through the Supabase REST API
+    
+    The table has no natural key to upsert on, so training runs already sent
+    (model_id and training date) are remembered in a local marker file and
+    skipped: re-running a backfill does not duplicate rows.
+    """
+    
+    name = 'http'
+    
+    def __init__(self, url=None, key=None, batch_size=100, timeout=30, sent_path=HTTP_SENT_PATH):
+        super().__init__(batch_size)
+        if not url or not key:
+            url, key = load_supabase_credentials()
+        if not url or not key:
+            raise ValueError('Missing Supabase credentials (NEXT_PUBLIC_SUPABASE_URL / SUPABASE_SERVICE_ROLE_KEY)')
+        self.endpoint = f"{url.rstrip('/')}/rest/v1/ml_performance_metrics"
+        self.key = key
+        self.timeout = timeout
+        self.sent_path = Path(sent_path)
+        self.sent = None
+    
+    @staticmethod
+    def run_key(record):
+        return f"{record['model_id']}@{record['training_date']}"
+    
+    def load_sent(self):
+        if not self.sent_path.exists():
+            return set()
+        return set(self.sent_path.read_text().split())
+    
+    def metric_rows(self, record):
+        now = datetime.now()
+        period_start = (now - timedelta(days=1)).isoformat()
+        metadata = {
+            'model_type': record['model_type'],
+            'model_version': record['version'],
+            'dataset_size': record['dataset_size'],
+            'feature_count': record['feature_count'],
+            'training_date': record['training_date'] or now.isoformat(),
+            'model_id': record['model_id'],
+        }
+        return [
+            {
+                'service_name': 'beast-mode',
+                'metric_name': metric,
+                'metric_value': record[metric],
+                'metric_unit': unit,
+                'period_start': period_start,
+                'period_end': now.isoformat(),
+                'metadata': metadata,
+            }
+            for metric, unit in METRIC_UNITS.items()
+            if record.get(metric) is not None
+        ]
+    
+    def write_batch(self, records):
+        if self.sent is None:
+            self.sent = self.load_sent()
+        
+        runs = {}
+        for record in records:
+            run = self.run_key(record)
+            if run not in self.sent:
+                runs.setdefault(run, record)
+        rows = [row for record in runs.values() for row in self.metric_rows(record)]
+        if not rows:
+            return
+        
+        request = urllib.request.Request(
+            self.endpoint,
+            data=json.dumps(rows).encode(),
+            method='POST',
+            headers={
+                'apikey': self.key,
+                'Authorization': f'Bearer {self.key}',
+                'Content-Type': 'application/json',
+                'Prefer': 'return=minimal',
+            }
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+        
+        # Marked only once the insert succeeded, so a failed batch is sent again
+        self.sent_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.sent_path, 'a') as f:
+            f.writelines(f'{run}\n' for run in runs)
+        self.sent.update(runs)
+
+class MultiSink(ResultsSink):
+    """Fans each batch out to several sinks
+    
+    A failing sink does not stop the others (the local copy is still written);
+    its errors are collected and raised as one SinkError from close().
+    """
+    
+    name = 'multi'
+    
+    def __init__(self, sinks, batch_size=100):
+        super().__init__(batch_size)
+        self.sinks = sinks
+        self.failures = []
+    
+    def write_batch(self, records):
+        for sink in self.sinks:
+            sink.buffer.extend(records)
+            try:
+                sink.flush()
+            except Exception as e:
+                sink.buffer = []
+                self.failures.append(f"{sink.name}: {e}")
+                print(f"⚠️  {sink.name} sink failed: {e}")
+    
+    def close(self):
+        super().close()
+        for sink in self.sinks:
+            try:
+                sink.close()
+            except Exception as e:
+                self.failures.append(f"{sink.name}: {e}")
+        if self.failures:
+            raise SinkError(f"{len(self.failures)} sink write(s) failed: {'; '.join(self.failures)}")
+
+SINKS = {
+    'sqlite': SqliteSink,
+    'jsonl': JsonlSink,
+    'http': HttpSink,
+}
+
+def default_sink_spec():
+    """BEAST_MODE_RESULTS_SINK, else SQLite plus Supabase when credentials exist"""
+    spec = os.environ.get('BEAST_MODE_RESULTS_SINK')
+    if spec:
+        return spec
+    url, key = load_supabase_credentials()
+    return 'sqlite,http' if url and key else 'sqlite'
+
+def open_sink(spec=None, batch_size=100):
+    """Open a sink from a comma-separated spec such as 'sqlite,http'"""
+    names = [n.strip() for n in (spec or default_sink_spec()).split(',') if n.strip()]
+    unknown = [n for n in names if n not in SINKS]
+    if unknown:
+        raise ValueError(f"Unknown results sink(s): {', '.join(unknown)} (expected {', '.join(SINKS)})")
+    
+    sinks = [SINKS[name](batch_size=batch_size) for name in names]
+    return sinks[0] if len(sinks) == 1 else MultiSink(sinks, batch_size=batch_size)
+
+def iter_model_dirs(models_dir=MODELS_DIR):
+    """Yield (model_dir, metadata) for every model in the model catalog"""
+    catalog = load_catalog(models_dir)
+    
+    for entry in catalog['models'].values():
+        model_dir = artifact_path(entry, 'model_dir', models_dir)
+        try:
+            yield model_dir, read_metadata(model_dir)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Skipping {entry['id']}: {e}")
+
+def backfill(sink, models_dir=MODELS_DIR):
+    """Log every cataloged model in one pass; returns the number of records"""
+    count = 0
+    for model_dir, metadata in iter_model_dirs(models_dir):
+        sink.add(build_record(metadata, model_dir))
+        count += 1
+    sink.flush()
+    return count
+
+def log_training_results(metadata, model_dir=None, spec=None):
+    """Log a single training run in-process"""
+    with open_sink(spec) as sink:
+        record = build_record(metadata, model_dir)
+        sink.add(record)
+    return record
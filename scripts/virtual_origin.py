@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+BEAST MODE - Virtual Origin
+Serves the repository and in-memory HTML to Playwright pages under a fake origin
+
+Requests are answered by route interception, so there is no server thread or
+port and parallel pages are served concurrently. Files are read once and
+kept in memory (revalidated by mtime and size), so the shared CSS, fonts and
+images cost one disk read per run however many pages use them.
+
+A refined document is registered at the URL its source file would have, so
+relative stylesheet, image and font references resolve as they would on
+disk. Nothing is written next to the source, and concurrent renders of
+different passes of the same file each get their own URL.
+"""
+
+import asyncio
+import itertools
+import mimetypes
+from contextlib import contextmanager
+from pathlib import Path
+from urllib.parse import quote, unquote, urlsplit
+
+BASE_DIR = Path(__file__).parent.parent
+ORIGIN = "http://visuals.beast-mode.local"
+
+class VirtualOrigin:
+    """Routes `origin/...` requests to registered documents, else to files under `base_dir`"""
+    
+    def __init__(self, base_dir=BASE_DIR, origin=ORIGIN):
+        self.base_dir = Path(base_dir).resolve()
+        self.origin = origin.rstrip("/")
+        self.documents = {}
+        # path -> bytes served in place of the file on disk (e.g. refined CSS)
+        self.overrides = {}
+        self.counter = itertools.count(1)
+        # path -> (mtime_ns, size, body); loading maps path -> in-flight read
+        self.files = {}
+        self.loading = {}
+        self.hits = 0
+        self.misses = 0
+    
+    def url_for(self, path):
+        """URL of `path` (which must live under `base_dir`) at the virtual origin"""
+        relative = Path(path).resolve().relative_to(self.base_dir)
+        return f"{self.origin}/{quote(relative.as_posix())}"
+    
+    def path_for(self, url):
+        """File under `base_dir` that `url` maps to, or None outside the origin/base_dir"""
+        if not url.startswith(self.origin + "/"):
+            return None
+        path = (self.base_dir / unquote(urlsplit(url).path).lstrip("/")).resolve()
+        if path != self.base_dir and self.base_dir not in path.parents:
+            return None
+        return path
+    
+    def register_document(self, path, html):
+        """Serve `html` as if it were `path`; returns the URL to navigate to"""
+        url = f"{self.url_for(path)}?render={next(self.counter)}"
+        self.documents[url] = html
+        return url
+    
+    def release(self, url):
+        self.documents.pop(url, None)
+    
+    @contextmanager
+    def document(self, path, html):
+        """Register `html` for the duration of the block"""
+        url = self.register_document(path, html)
+        try:
+            yield url
+        finally:
+            self.release(url)
+    
+    def override(self, path, text):
+        """Serve `text` for `path` (at its normal URL) until cleared"""
+        self.overrides[Path(path).resolve()] = text.encode()
+    
+    def clear_override(self, path):
+        self.overrides.pop(Path(path).resolve(), None)
+    
+    async def install(self, target):
+        """Route the origin on a Playwright page or browser context"""
+        await target.route(f"{self.origin}/**", self.handle)
+    
+    async def handle(self, route):
+        url = route.request.url
+        if url in self.documents:
+            await route.fulfill(status=200, content_type="text/html; charset=utf-8", body=self.documents[url])
+            return
+        
+        path = self.path_for(url)
+        if path in self.overrides:
+            body = self.overrides[path]
+        else:
+            body = await self.read(path) if path is not None else None
+        if body is None:
+            await route.fulfill(status=404, body="")
+            return
+        content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        await route.fulfill(status=200, content_type=content_type, body=body)
+    
+    async def read(self, path):
+        """Contents of `path` from memory while unchanged on disk; None if it is not a file"""
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        if not path.is_file():
+            return None
+        
+        cached = self.files.get(path)
+        if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            self.hits += 1
+            return cached[2]
+        
+        # Pages requesting the same stylesheet at once share a single read
+        if path in self.loading:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self.loading[path] = asyncio.ensure_future(asyncio.to_thread(path.read_bytes))
+        try:
+            body = await self.loading[path]
+        finally:
+            self.loading.pop(path, None)
+        self.files[path] = (stat.st_mtime_ns, stat.st_size, body)
+        return body
+    
+    def summary(self):
+        return f"🗂️  Virtual origin: {self.hits} file(s) from memory, {self.misses} read from disk"
+
+# One instance for every renderer, so a warm browser shares one file cache
+SHARED_ORIGIN = VirtualOrigin()
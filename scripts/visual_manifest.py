@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+BEAST MODE - Visual Asset Manifest
+Loads visuals/assets.json, the single list of rendered assets shared by all renderers
+
+Each asset declares its HTML source, output image, viewport, optional
+fallback source, and the CSS/partials it depends on. Declared dependencies
+are merged with the local files the HTML actually references, so
+`affected_assets()` can map a changed file to just the assets that use it.
+
+Usage: python3 scripts/visual_manifest.py [changed-file ...]
+"""
+
+import json
+import sys
+from pathlib import Path
+
+from render_cache import render_inputs
+
+BASE_DIR = Path(__file__).parent.parent
+VISUALS_DIR = BASE_DIR / "visuals"
+HTML_DIR = VISUALS_DIR / "html"
+ASSETS_DIR = BASE_DIR / "assets"
+MANIFEST_PATH = VISUALS_DIR / "assets.json"
+MANIFEST_VERSION = 1
+
+def resolve_source(spec, html_dir=HTML_DIR):
+    """HTML path, viewport and dependency paths for an asset (or fallback) entry"""
+    html_path = html_dir / spec["html"]
+    depends = {(VISUALS_DIR / dep).resolve() for dep in spec.get("depends", [])}
+    if html_path.exists():
+        depends.update(render_inputs(html_path))
+    return {
+        "html_path": html_path,
+        "width": spec["width"],
+        "height": spec["height"],
+        "depends": sorted(depends),
+    }
+
+def load_assets(manifest_path=MANIFEST_PATH):
+    """Assets from the manifest; `source` is the first existing HTML (primary, then fallback) or None"""
+    with open(manifest_path, "r") as f:
+        manifest = json.load(f)
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError(f"Unsupported visual manifest version: {manifest.get('version')}")
+    
+    assets = []
+    for spec in manifest["assets"]:
+        asset = dict(spec)
+        asset["output_path"] = ASSETS_DIR / spec["output"]
+        asset["source"] = None
+        for candidate in [spec, spec.get("fallback")]:
+            if candidate and (HTML_DIR / candidate["html"]).exists():
+                asset["source"] = resolve_source(candidate)
+                break
+        assets.append(asset)
+    
+    return assets
+
+def dependency_graph(assets):
+    """Map each dependency path to the names of the assets that use it"""
+    graph = {}
+    for asset in assets:
+        if asset["source"] is None:
+            continue
+        for path in [asset["source"]["html_path"].resolve()] + asset["source"]["depends"]:
+            graph.setdefault(path, []).append(asset["name"])
+    return graph
+
+def affected_assets(assets, changed_paths):
+    """Assets whose HTML or dependencies include any of `changed_paths`"""
+    changed = {Path(path).resolve() for path in changed_paths}
+    return [
+        asset for asset in assets
+        if asset["source"] is not None
+        and changed & set([asset["source"]["html_path"].resolve()] + asset["source"]["depends"])
+    ]
+
+if __name__ == "__main__":
+    assets = load_assets()
+    
+    if len(sys.argv) > 1:
+        affected = affected_assets(assets, sys.argv[1:])
+        print(f"🎯 {len(affected)} asset(s) affected:")
+        for asset in affected:
+            print(f"   - {asset['name']} ({asset['output']})")
+        sys.exit(0)
+    
+    print(f"📋 {len(assets)} asset(s) in {MANIFEST_PATH.relative_to(BASE_DIR)}\n")
+    for path, names in sorted(dependency_graph(assets).items()):
+        print(f"{path.relative_to(BASE_DIR.resolve())}")
+        for name in names:
+            print(f"   → {name}")
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+BEAST MODE - Visual Watch Mode
+Re-renders only the assets affected by an edit, in a warm browser, as you save
+
+Watches visuals/html and visuals/css (watchdog if installed, else polling),
+waits for a burst of saves to settle, then applies the brand refinement
+passes in memory and re-renders just the affected assets. Sources are never
+rewritten; previews go to assets/previews so committed assets and the render
+cache are untouched.
+
+Usage: python3 scripts/watch-visuals.py [--concurrency N] [--no-refine] [--poll]
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+from playwright.async_api import async_playwright
+from atomic_io import atomic_write_bytes
+from render_pool import PagePool, parse_concurrency
+from render_readiness import wait_until_ready
+from script_loader import load_script
+from virtual_origin import SHARED_ORIGIN as ORIGIN
+from visual_manifest import affected_assets, load_assets
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+    HAS_WATCHDOG = True
+except ImportError:
+    HAS_WATCHDOG = False
+
+brand_refinement = load_script("brand-refinement-system.py")
+
+BASE_DIR = Path(__file__).parent.parent
+VISUALS_DIR = BASE_DIR / "visuals"
+WATCH_DIRS = [VISUALS_DIR / "html", VISUALS_DIR / "css"]
+PREVIEW_DIR = BASE_DIR / "assets" / "previews"
+WATCHED_SUFFIXES = {".html", ".css"}
+
+# Editors save in bursts (temp file, rename, touch); wait for this much quiet
+DEBOUNCE_SECONDS = 0.25
+POLL_INTERVAL = 0.5
+
+def is_watched(path):
+    path = Path(path)
+    return path.suffix in WATCHED_SUFFIXES and not path.name.startswith(".")
+
+def snapshot(dirs=WATCH_DIRS):
+    """{path: (mtime_ns, size)} of every watched file"""
+    state = {}
+    for directory in dirs:
+        for path in directory.iterdir():
+            if is_watched(path) and path.is_file():
+                stat = path.stat()
+                state[path.resolve()] = (stat.st_mtime_ns, stat.st_size)
+    return state
+
+async def poll_changes(queue, dirs=WATCH_DIRS, interval=POLL_INTERVAL):
+    """Fallback watcher: compare mtimes/sizes every `interval` seconds"""
+    previous = snapshot(dirs)
+    while True:
+        await asyncio.sleep(interval)
+        current = snapshot(dirs)
+        for path in previous.keys() | current.keys():
+            if previous.get(path) != current.get(path):
+                queue.put_nowait(path)
+        previous = current
+
+def start_observer(queue, loop, dirs=WATCH_DIRS):
+    """inotify/FSEvents watcher feeding `queue` from watchdog's thread"""
+    class Handler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            if event.is_directory:
+                return
+            for path in [event.src_path, getattr(event, "dest_path", None)]:
+                if path and is_watched(path):
+                    loop.call_soon_threadsafe(queue.put_nowait, Path(path).resolve())
+    
+    observer = Observer()
+    for directory in dirs:
+        observer.schedule(Handler(), str(directory), recursive=False)
+    observer.start()
+    return observer
+
+async def next_batch(queue, quiet=DEBOUNCE_SECONDS):
+    """Wait for a change, then collect more until `quiet` seconds pass without one"""
+    changed = {await queue.get()}
+    while True:
+        try:
+            changed.add(await asyncio.wait_for(queue.get(), quiet))
+        except asyncio.TimeoutError:
+            return changed
+
+def refine_stylesheets(paths, refine=True):
+    """Serve the refined version of each stylesheet from memory (the file is left as saved)"""
+    for path in paths:
+        if not refine or not path.exists():
+            ORIGIN.clear_override(path)
+            continue
+        css = path.read_text()
+        ORIGIN.override(path, brand_refinement.refine_document(css, brand_refinement.REFINEMENT_PASSES, is_css=True))
+
+def preview_path(asset):
+    return PREVIEW_DIR / asset["output"]
+
+async def render_preview(page, asset, refine=True):
+    """Render one asset from its (refined, in-memory) HTML; returns seconds, or None on failure"""
+    source = asset["source"]
+    start = time.perf_counter()
+    try:
+        html = source["html_path"].read_text()
+        if refine:
+            html = brand_refinement.refine_document(html, brand_refinement.REFINEMENT_PASSES)
+        with ORIGIN.document(source["html_path"], html) as url:
+            await page.goto(url, wait_until="networkidle")
+        await page.set_viewport_size({"width": source["width"], "height": source["height"]})
+        await wait_until_ready(page)
+        atomic_write_bytes(preview_path(asset), await page.screenshot(full_page=True, type="png"))
+    except Exception as e:
+        print(f"   ❌ {asset['name']}: {e}")
+        return None
+    return time.perf_counter() - start
+
+async def watch(concurrency, refine=True, poll=False):
+    print("👀 BEAST MODE Visual Watch Mode\n")
+    queue = asyncio.Queue()
+    loop = asyncio.get_running_loop()
+    
+    stylesheets = sorted((VISUALS_DIR / "css").glob("*.css"))
+    refine_stylesheets(stylesheets, refine)
+    
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        async with PagePool(browser, size=concurrency, setup=ORIGIN.install) as pool:
+            if HAS_WATCHDOG and not poll:
+                observer = start_observer(queue, loop)
+                poller = None
+                print("Watching with watchdog")
+            else:
+                observer = None
+                poller = asyncio.ensure_future(poll_changes(queue))
+                print(f"Watching by polling every {POLL_INTERVAL}s" + ("" if HAS_WATCHDOG else " (pip install watchdog for native events)"))
+            for directory in WATCH_DIRS:
+                print(f"   - {directory.relative_to(BASE_DIR)}")
+            print(f"Refinement: {'in memory' if refine else 'off'}; previews → {PREVIEW_DIR.relative_to(BASE_DIR)}")
+            print("Ctrl+C to stop\n")
+            
+            try:
+                while True:
+                    changed = await next_batch(queue)
+                    start = time.perf_counter()
+                    refine_stylesheets([path for path in changed if path.suffix == ".css"], refine)
+                    
+                    # Reloaded each time so new dependencies in the edited HTML are picked up
+                    affected = affected_assets(load_assets(), changed)
+                    names = ", ".join(sorted(path.name for path in changed))
+                    if not affected:
+                        print(f"✏️  {names}: no assets affected")
+                        continue
+                    
+                    outcomes = await pool.run(lambda page, asset: render_preview(page, asset, refine), affected)
+                    rendered = [asset["name"] for asset, seconds in zip(affected, outcomes) if seconds is not None]
+                    print(f"✏️  {names} → {len(rendered)}/{len(affected)} asset(s) in "
+                          f"{time.perf_counter() - start:.2f}s: {', '.join(rendered)}")
+            finally:
+                if observer is not None:
+                    observer.stop()
+                    observer.join()
+                if poller is not None:
+                    poller.cancel()
+        
+        await browser.close()
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    try:
+        concurrency = parse_concurrency(args)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    try:
+        asyncio.run(watch(concurrency, refine="--no-refine" not in args, poll="--poll" in args))
+    except KeyboardInterrupt:
+        print("\n👋 Watch mode stopped")